@@ -2,7 +2,7 @@ from functools import wraps
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
 
-from .utils import is_moderator
+from .utils import is_admin, is_moderator
 
 
 def moderator_required(view_func):
@@ -14,3 +14,14 @@ def moderator_required(view_func):
         return view_func(request, *args, **kwargs)
 
     return _wrapped
+
+
+def admin_required(view_func):
+    @login_required
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if not is_admin(request.user):
+            return HttpResponseForbidden("Admin access required.")
+        return view_func(request, *args, **kwargs)
+
+    return _wrapped
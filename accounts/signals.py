@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from .models import Profile
+from .utils import invalidate_roles
 
 User = get_user_model()
 
@@ -9,3 +11,27 @@ User = get_user_model()
 def create_profile_for_new_user(sender, instance, created, **kwargs):
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+# ---------- role cache invalidation ----------
+
+@receiver(post_save, sender=User, dispatch_uid="accounts.invalidate_roles_on_save")
+def invalidate_roles_on_user_save(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_roles([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid="accounts.invalidate_roles_on_groups")
+def invalidate_roles_on_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # group.user_set.clear(): pk_set is empty, so collect members before they go
+        invalidate_roles(instance.user_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        invalidate_roles((pk_set or []) if reverse else [instance.pk])
+
+
+@receiver(pre_save, sender=Group, dispatch_uid="accounts.invalidate_roles_on_group_rename")
+@receiver(pre_delete, sender=Group, dispatch_uid="accounts.invalidate_roles_on_group_delete")
+def invalidate_roles_on_group_change(sender, instance, **kwargs):
+    if instance.pk:
+        invalidate_roles(instance.user_set.values_list("pk", flat=True))
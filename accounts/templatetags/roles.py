@@ -1,15 +1,17 @@
 from django import template
 
+from accounts.utils import resolve_roles
+
 register = template.Library()
 
 @register.filter(name="is_moderator_user")
 def is_moderator_user(user):
-    return user.is_authenticated and user.groups.filter(name="Moderator").exists()
+    return resolve_roles(user).is_moderator
 
 @register.filter(name="is_artisan_user")
 def is_artisan_user(user):
-    return user.is_authenticated and getattr(user, "role", None) == "ARTISAN"
+    return resolve_roles(user).is_artisan
 
 @register.filter(name="is_customer_user")
 def is_customer_user(user):
-    return user.is_authenticated and getattr(user, "role", None) == "CUSTOMER"
+    return resolve_roles(user).is_customer
@@ -1,12 +1,14 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
+
+from core.ratelimit import login_ratelimit
 from .views import register, dashboard
 
 app_name = "accounts"
 
 urlpatterns = [
     path("register/", register, name="register"),
-    path("login/", auth_views.LoginView.as_view(template_name="accounts/login.html"), name="login"),
+    path("login/", login_ratelimit(auth_views.LoginView.as_view(template_name="accounts/login.html")), name="login"),
     # path("logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("logout/", auth_views.LogoutView.as_view(next_page="accounts:login"), name="logout"),
 
@@ -1,13 +1,89 @@
+"""
+Role checks.
+
+resolve_roles() answers "what is this user allowed to do" once per request:
+the result is memoized on the user object (request.user lives for exactly one
+request), and the only part that needs a query, Moderator group membership,
+is also kept in the cache for ROLE_CACHE_TTL seconds. accounts.signals drops
+that cache entry whenever the user's groups change.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+
+MODERATOR_GROUP = "Moderator"
+ROLE_CACHE_TTL = 60
+
+
+@dataclass(frozen=True)
+class ResolvedRoles:
+    role: Optional[str] = None
+    is_staff: bool = False
+    is_superuser: bool = False
+    in_moderator_group: bool = False
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.role is not None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.is_superuser or self.is_staff
+
+    @property
+    def is_moderator(self) -> bool:
+        return self.is_admin or self.in_moderator_group
+
+    @property
+    def is_artisan(self) -> bool:
+        return self.role == "ARTISAN"
+
+    @property
+    def is_customer(self) -> bool:
+        return self.role == "CUSTOMER"
+
+
+ANONYMOUS_ROLES = ResolvedRoles()
+
+
+def moderator_cache_key(user_id) -> str:
+    return f"accounts:moderator:{user_id}"
+
+
+def invalidate_roles(user_ids) -> None:
+    cache.delete_many([moderator_cache_key(uid) for uid in user_ids])
+
+
+def resolve_roles(user) -> ResolvedRoles:
+    if not user or not user.is_authenticated:
+        return ANONYMOUS_ROLES
+    roles = getattr(user, "_resolved_roles", None)
+    if roles is not None:
+        return roles
+
+    key = moderator_cache_key(user.pk)
+    in_group = cache.get(key)
+    if in_group is None:
+        in_group = user.groups.filter(name=MODERATOR_GROUP).exists()
+        cache.set(key, in_group, ROLE_CACHE_TTL)
+
+    roles = ResolvedRoles(
+        role=getattr(user, "role", "") or "",
+        is_staff=user.is_staff,
+        is_superuser=user.is_superuser,
+        in_moderator_group=in_group,
+    )
+    user._resolved_roles = roles
+    return roles
+
+
 def is_moderator(user) -> bool:
     """
     True if user is authenticated and is in Moderator group OR is staff/superuser.
     """
-    if not user or not user.is_authenticated:
-        return False
-    return user.is_superuser or user.is_staff or user.groups.filter(name="Moderator").exists()
+    return resolve_roles(user).is_moderator
 
 
 def is_admin(user) -> bool:
-    if not user or not user.is_authenticated:
-        return False
-    return user.is_superuser or user.is_staff
+    return resolve_roles(user).is_admin
@@ -4,6 +4,8 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.shortcuts import render, redirect
 from django.urls import reverse
 
+from core.ratelimit import login_ratelimit
+
 from .forms import RegisterForm
 from .models import User
 
@@ -29,6 +31,7 @@ def signup_view(request):
     return register(request)
 
 
+@login_ratelimit
 def login_view(request):
     if request.user.is_authenticated:
         return redirect("accounts:dashboard")
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artisans', '0002_rating_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artisangalleryimage',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='artisanprofile',
+            name='cover_photo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='artisanprofile',
+            name='profile_photo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
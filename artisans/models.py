@@ -18,10 +18,13 @@ class ArtisanProfile(models.Model):
 
     profile_photo = models.ImageField(upload_to="artisans/profile_photos/", blank=True, null=True)
     cover_photo = models.ImageField(upload_to="artisans/cover_photos/", blank=True, null=True)
+    profile_photo_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
+    cover_photo_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     # ratings (we’ll update later from product reviews)
     rating_avg = models.FloatField(default=0.0)
     rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)  # running total, see reviews.services
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -33,6 +36,7 @@ class ArtisanProfile(models.Model):
 class ArtisanGalleryImage(models.Model):
     artisan = models.ForeignKey(ArtisanProfile, on_delete=models.CASCADE, related_name="gallery_images")
     image = models.ImageField(upload_to="artisans/gallery/")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
     caption = models.CharField(max_length=180, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -1,4 +1,15 @@
 from django.contrib import admin
-from .models import CulturalEvent
+from .models import CulturalEvent, LunarAnchor, LunarAnchorDate
 
 admin.site.register(CulturalEvent)
+
+
+class LunarAnchorDateInline(admin.TabularInline):
+    model = LunarAnchorDate
+    extra = 3
+    ordering = ("-year",)
+
+
+@admin.register(LunarAnchor)
+class LunarAnchorAdmin(admin.ModelAdmin):
+    inlines = [LunarAnchorDateInline]
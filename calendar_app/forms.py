@@ -1,12 +1,40 @@
 from django import forms
 from .models import CulturalEvent
+from .recurrence import MAX_LUNAR_OFFSET
 
 
 class CulturalEventForm(forms.ModelForm):
     class Meta:
         model = CulturalEvent
-        fields = ["title", "description", "category", "date", "location"]
+        fields = [
+            "title", "description", "category", "date", "location",
+            "recurrence", "recurrence_until", "lunar_anchor", "lunar_offset_days",
+        ]
+        labels = {"date": "Date (first occurrence, for repeating events)"}
         widgets = {
             "description": forms.Textarea(attrs={"rows": 4}),
             "date": forms.DateInput(attrs={"type": "date"}),
+            "recurrence_until": forms.DateInput(attrs={"type": "date"}),
         }
+
+    def clean(self):
+        cleaned = super().clean()
+        recurrence = cleaned.get("recurrence")
+        first = cleaned.get("date")
+        until = cleaned.get("recurrence_until")
+        offset = cleaned.get("lunar_offset_days") or 0
+
+        if recurrence == CulturalEvent.Recurrence.LUNAR:
+            if not cleaned.get("lunar_anchor"):
+                self.add_error("lunar_anchor", "Choose the lunar date this festival follows.")
+            if abs(offset) > MAX_LUNAR_OFFSET:
+                self.add_error("lunar_offset_days", f"Keep the offset within {MAX_LUNAR_OFFSET} days.")
+        else:
+            cleaned["lunar_anchor"] = None
+            cleaned["lunar_offset_days"] = 0
+
+        if not recurrence:
+            cleaned["recurrence_until"] = None
+        elif until and first and until < first:
+            self.add_error("recurrence_until", "The series cannot end before its first date.")
+        return cleaned
@@ -0,0 +1,92 @@
+"""
+Month grids for the cultural calendar.
+
+A month is read with a half-open range on CulturalEvent.date
+(first <= date < first of next month), which the (date, category) index
+answers directly; date__year / date__month would wrap the column in a
+function and scan the table.
+
+Recurring series are expanded for the month by calendar_app.recurrence.
+
+The finished grid (weeks of day cells with their events) is cached per
+(year, month, category) under the current series version and that month's
+version, both read from CacheVersion in one query so every worker agrees.
+calendar_app.signals moves the version of exactly the month(s) a one-off event
+was in before and after a save, and on delete; a change to a series moves the
+series version instead.
+"""
+import calendar as pycal
+import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.utils.dateparse import parse_date
+
+from .models import CulturalEvent
+from .recurrence import SERIES_VERSION, bump_cache_versions, cache_versions, occurrences
+
+MONTH_GRID_TTL = 60 * 60  # only frees memory: a retired key is never read again
+FIRST_WEEKDAY = pycal.MONDAY
+
+_calendar = pycal.Calendar(firstweekday=FIRST_WEEKDAY)
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime.date, datetime.date]:
+    """[first day, first day of the next month)"""
+    first = datetime.date(year, month, 1)
+    if month == 12:
+        return first, datetime.date(year + 1, 1, 1)
+    return first, datetime.date(year, month + 1, 1)
+
+
+def month_version_name(year: int, month: int) -> str:
+    return f"month:{year}-{month:02d}"  # CacheVersion.name
+
+
+def month_cache_key(year: int, month: int, category: str = "") -> str:
+    name = month_version_name(year, month)
+    versions = cache_versions(SERIES_VERSION, name)
+    return f"calendar:month:{versions[SERIES_VERSION]}.{versions[name]}:{year}-{month:02d}:{category or 'all'}"
+
+
+def build_month_grid(year: int, month: int, category: str = "") -> List[List[dict]]:
+    first, after = month_bounds(year, month)
+    events_by_day = {}
+    for occ in occurrences(first, after, category):
+        events_by_day.setdefault(occ.date, []).append(
+            {
+                "id": occ.event.pk,
+                "title": occ.event.title,
+                "category_label": CulturalEvent.Category(occ.event.category).label,
+                "recurring": occ.is_recurring,
+            }
+        )
+
+    return [
+        [
+            {"date": day, "in_month": day.month == month, "events": events_by_day.get(day, [])}
+            for day in week
+        ]
+        for week in _calendar.monthdatescalendar(year, month)
+    ]
+
+
+def month_grid(year: int, month: int, category: str = "") -> List[List[dict]]:
+    return cache.get_or_set(
+        month_cache_key(year, month, category),
+        lambda: build_month_grid(year, month, category),
+        MONTH_GRID_TTL,
+    )
+
+
+def invalidate_months(entries: Iterable[Tuple[Optional[datetime.date], Optional[str]]]) -> None:
+    """Retires, in every worker, the cached grids (any category) of the given (date, category) slots' months."""
+    names = set()
+    for day, _category in entries:
+        if isinstance(day, str):
+            day = parse_date(day)  # set as a string and not yet reloaded
+        if day is None:
+            continue
+        names.add(month_version_name(day.year, day.month))
+    if names:
+        bump_cache_versions(*sorted(names))
@@ -0,0 +1,140 @@
+"""
+iCalendar (.ics) subscription feeds.
+
+A feed covers an upcoming window (from a week ago to a year ahead), recurring
+series expanded like the list view, and is streamed one VEVENT at a time.
+
+Calendar apps poll these URLs, so the views sit behind Django's condition()
+decorator: feed_last_modified() is the newest of MAX(updated_at) (one read off
+the end of calendar_event_updated_idx), the last delete or lunar table change
+(stamped in the FeedChange row by calendar_app.signals, which a MAX() cannot
+see) and today's midnight, when the window itself moves. An unchanged feed answers 304
+without expanding anything.
+"""
+import datetime
+import hashlib
+from typing import Iterable, Iterator, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import CulturalEvent, FeedChange
+from .recurrence import Occurrence, occurrences
+
+FEED_PAST_DAYS = 7
+FEED_AHEAD_DAYS = 365
+
+PRODID = "-//Tribal Community//Cultural Calendar//EN"
+
+
+def feed_window(today: Optional[datetime.date] = None):
+    today = today or timezone.localdate()
+    return today - datetime.timedelta(days=FEED_PAST_DAYS), today + datetime.timedelta(days=FEED_AHEAD_DAYS)
+
+
+def touch_feeds() -> None:
+    """Records a change MAX(updated_at) cannot show (a delete, a lunar date)."""
+    now = timezone.now()
+    if FeedChange.objects.filter(pk=1).update(changed_at=now):
+        return
+    try:
+        with transaction.atomic():
+            FeedChange.objects.create(pk=1, changed_at=now)
+    except IntegrityError:
+        # another worker created the row first
+        FeedChange.objects.filter(pk=1).update(changed_at=now)
+
+
+def feed_last_modified() -> datetime.datetime:
+    midnight = timezone.make_aware(datetime.datetime.combine(timezone.localdate(), datetime.time.min))
+    stamps = [
+        midnight,
+        CulturalEvent.objects.aggregate(newest=Max("updated_at"))["newest"],
+        FeedChange.objects.filter(pk=1).values_list("changed_at", flat=True).first(),
+    ]
+    return max(s for s in stamps if s is not None)
+
+
+def feed_etag(last_modified: datetime.datetime, category: str = "") -> str:
+    raw = f"{last_modified.isoformat()}:{category or 'all'}"
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+# ---------- writing ----------
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """RFC 5545 3.1: lines of at most 75 octets, continuations start with a space."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1  # never split a UTF-8 sequence
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74  # the leading space counts
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(value: datetime.datetime) -> str:
+    return value.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def vevent_lines(occ: Occurrence, host: str, base_url: str) -> Iterator[str]:
+    event = occ.event
+    yield "BEGIN:VEVENT"
+    # one UID per occurrence: the series is expanded here, not sent as an RRULE
+    # (lunar dates have no RRULE form)
+    yield f"UID:event-{event.pk}-{occ.date:%Y%m%d}@{host}"
+    yield f"DTSTAMP:{_utc(event.updated_at)}"
+    yield f"DTSTART;VALUE=DATE:{occ.date:%Y%m%d}"
+    yield f"DTEND;VALUE=DATE:{occ.date + datetime.timedelta(days=1):%Y%m%d}"
+    yield f"SUMMARY:{_escape(event.title)}"
+    if event.description:
+        yield f"DESCRIPTION:{_escape(event.description)}"
+    if event.location:
+        yield f"LOCATION:{_escape(event.location)}"
+    yield f"CATEGORIES:{_escape(event.get_category_display())}"
+    yield f"URL:{base_url}/calendar/{event.pk}/"
+    yield "END:VEVENT"
+
+
+def ics_chunks(name: str, items: Iterable[Occurrence], host: str, base_url: str) -> Iterator[str]:
+    """The feed as text chunks: the header, then one chunk per event."""
+    yield "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+            "X-PUBLISHED-TTL:PT1H",
+        )
+    )
+    for occ in items:
+        yield "".join(_fold(line) for line in vevent_lines(occ, host, base_url))
+    yield "END:VCALENDAR\r\n"
+
+
+def feed_chunks(category: str, host: str, base_url: str) -> Iterator[str]:
+    start, end = feed_window()
+    name = "Cultural Calendar"
+    if category:
+        name += f" – {CulturalEvent.Category(category).label}"
+
+    def items():
+        # runs when the response starts streaming, not in the view
+        yield from occurrences(start, end, category)
+
+    return ics_chunks(name, items(), host, base_url)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from calendar_app.recurrence import collapse_annual_duplicates
+
+
+class Command(BaseCommand):
+    help = "Fold festivals re-entered every year (same title, category and day) into one yearly recurring event."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="List the groups without changing anything.")
+
+    def handle(self, *args, **options):
+        runs = collapse_annual_duplicates(dry_run=options["dry_run"])
+        for run in runs:
+            self.stdout.write(f"{run[0].title}: {run[0].date.year}-{run[-1].date.year} ({len(run)} rows)")
+        verb = "Would collapse" if options["dry_run"] else "Collapsed"
+        removed = sum(len(run) - 1 for run in runs)
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(runs)} series, {removed} duplicate row(s)."))
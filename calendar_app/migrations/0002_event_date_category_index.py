@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='culturalevent',
+            index=models.Index(fields=['date', 'category'], name='calendar_event_date_cat_idx'),
+        ),
+    ]
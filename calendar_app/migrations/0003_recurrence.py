@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0002_event_date_category_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LunarAnchor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LunarAnchorDate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('date', models.DateField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='culturalevent',
+            name='lunar_offset_days',
+            field=models.SmallIntegerField(default=0, help_text='Days after (or before, if negative) the lunar date.'),
+        ),
+        migrations.AddField(
+            model_name='culturalevent',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Does not repeat'), ('YEARLY', 'Every year on this date'), ('YEARLY_WEEKDAY', 'Every year on this weekday of the month (e.g. 2nd Monday of March)'), ('LUNAR', 'Every year, from the lunar date table')], default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='culturalevent',
+            name='recurrence_until',
+            field=models.DateField(blank=True, help_text='Last day of the series (empty: no end).', null=True),
+        ),
+        migrations.AddField(
+            model_name='culturalevent',
+            name='lunar_anchor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='events', to='calendar_app.lunaranchor'),
+        ),
+        migrations.AddIndex(
+            model_name='culturalevent',
+            index=models.Index(fields=['recurrence', 'date'], name='calendar_event_series_idx'),
+        ),
+        migrations.AddField(
+            model_name='lunaranchordate',
+            name='anchor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dates', to='calendar_app.lunaranchor'),
+        ),
+        migrations.AddConstraint(
+            model_name='lunaranchordate',
+            constraint=models.UniqueConstraint(fields=('anchor', 'year'), name='unique_lunar_anchor_year'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    CulturalEvent = apps.get_model("calendar_app", "CulturalEvent")
+    CulturalEvent.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0003_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="culturalevent",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="culturalevent",
+            index=models.Index(fields=["updated_at"], name="calendar_event_updated_idx"),
+        ),
+    ]
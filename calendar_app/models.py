@@ -2,7 +2,30 @@ from django.db import models
 
 # Create your models here.
 from django.conf import settings
-from django.db import models
+
+
+class LunarAnchor(models.Model):
+    """
+    A point of the lunar calendar (e.g. "Kartik Amavasya") whose Gregorian date
+    moves every year. Its dates are entered per year in LunarAnchorDate;
+    lunar-recurring events sit a fixed number of days from it.
+    """
+    name = models.CharField(max_length=120, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class LunarAnchorDate(models.Model):
+    anchor = models.ForeignKey(LunarAnchor, on_delete=models.CASCADE, related_name="dates")
+    year = models.PositiveSmallIntegerField()
+    date = models.DateField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["anchor", "year"], name="unique_lunar_anchor_year")]
+
+    def __str__(self) -> str:
+        return f"{self.anchor} {self.year}: {self.date}"
 
 
 class CulturalEvent(models.Model):
@@ -17,13 +40,66 @@ class CulturalEvent(models.Model):
 
     category = models.CharField(max_length=20, choices=Category.choices)
 
+    class Recurrence(models.TextChoices):
+        NONE = "", "Does not repeat"
+        YEARLY = "YEARLY", "Every year on this date"
+        YEARLY_WEEKDAY = "YEARLY_WEEKDAY", "Every year on this weekday of the month (e.g. 2nd Monday of March)"
+        LUNAR = "LUNAR", "Every year, from the lunar date table"
+
     # Keep simple for MVP (you can add time later)
+    # For a recurring event this is the first occurrence; see calendar_app/recurrence.py
     date = models.DateField()
+    recurrence = models.CharField(max_length=20, choices=Recurrence.choices, blank=True, default=Recurrence.NONE)
+    recurrence_until = models.DateField(null=True, blank=True, help_text="Last day of the series (empty: no end).")
+    lunar_anchor = models.ForeignKey(LunarAnchor, on_delete=models.PROTECT, null=True, blank=True, related_name="events")
+    lunar_offset_days = models.SmallIntegerField(default=0, help_text="Days after (or before, if negative) the lunar date.")
     location = models.CharField(max_length=120, blank=True)
 
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # month grid: WHERE date >= first AND date < next_first [AND category = ...]
+            models.Index(fields=["date", "category"], name="calendar_event_date_cat_idx"),
+            # the few recurring series: WHERE recurrence != '' AND date < window end;
+            # also the list pages' WHERE recurrence = '' AND (date, id) > cursor
+            # ORDER BY date, id (id rides along as the rowid)
+            models.Index(fields=["recurrence", "date"], name="calendar_event_series_idx"),
+            # .ics feed validators: MAX(updated_at) from the end of this index
+            models.Index(fields=["updated_at"], name="calendar_event_updated_idx"),
+        ]
+
+    @property
+    def is_recurring(self) -> bool:
+        return bool(self.recurrence)
 
     def __str__(self) -> str:
         return f"{self.title} ({self.date})"
+
+
+class FeedChange(models.Model):
+    """
+    Single row (pk=1): when the .ics feeds last changed in a way MAX(updated_at)
+    cannot show (an event deleted, a lunar date edited). Stored in the database
+    so every worker derives the same Last-Modified / ETag.
+    """
+    changed_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"Feeds changed at {self.changed_at}"
+
+
+class CacheVersion(models.Model):
+    """
+    A version that calendar cache keys embed (e.g. the series version, see
+    calendar_app.recurrence). Kept in the database so that a bump retires the
+    cached entries in every worker's LocMemCache at once.
+    """
+    name = models.CharField(max_length=40, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.version}"
@@ -0,0 +1,374 @@
+"""
+Recurring cultural events.
+
+An annual festival is stored once: CulturalEvent.date is its first occurrence
+and `recurrence` says how later years are found:
+
+  * YEARLY          same month and day (29 Feb falls on 28 Feb in other years)
+  * YEARLY_WEEKDAY  same weekday and week of the month as the first date
+                    (a 5th weekday is read as the month's last one)
+  * LUNAR           LunarAnchorDate of that year + lunar_offset_days; years
+                    missing from the table have no occurrence yet
+
+Nothing is materialised. occurrences() reads one-off events for a window with
+the date index and expands only the series years the window touches. Each
+series year (all series' occurrences in one Gregorian year) is cached under a
+series version kept in the database (CacheVersion), so every worker sees the
+same one; any change to a recurring event or to the lunar table moves the
+version (bump_series_version(), from calendar_app.signals, after commit),
+which retires every cached year and month grid at once.
+"""
+import calendar as pycal
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils.dateparse import parse_date
+
+from core.pagination import KeysetPage, decode_values, encode_cursor
+
+from .models import CacheVersion, CulturalEvent, LunarAnchorDate
+
+SERIES_VERSION = "series"  # CacheVersion.name
+SERIES_YEAR_TTL = 60 * 60
+MAX_LUNAR_OFFSET = 180  # keeps every occurrence within a year of its table date
+# list pages expand series this far around today; one-off events are unbounded
+SERIES_AHEAD_YEARS = 2
+SERIES_ARCHIVE_YEARS = 10
+
+Recurrence = CulturalEvent.Recurrence
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    date: datetime.date
+    event: CulturalEvent
+
+    @property
+    def is_recurring(self) -> bool:
+        return self.event.is_recurring
+
+
+# ---------- rules ----------
+
+def _yearly(first: datetime.date, year: int) -> datetime.date:
+    if first.month == 2 and first.day == 29 and not pycal.isleap(year):
+        return datetime.date(year, 2, 28)
+    return first.replace(year=year)
+
+
+def _yearly_weekday(first: datetime.date, year: int) -> datetime.date:
+    week = (first.day - 1) // 7  # 0..4
+    days_in_month = pycal.monthrange(year, first.month)[1]
+    if week == 4:
+        last = datetime.date(year, first.month, days_in_month)
+        return last - datetime.timedelta(days=(last.weekday() - first.weekday()) % 7)
+    start = datetime.date(year, first.month, 1)
+    return start + datetime.timedelta(days=(first.weekday() - start.weekday()) % 7 + 7 * week)
+
+
+def occurrence_in(event: CulturalEvent, year: int, lunar: Dict[int, datetime.date]) -> Optional[datetime.date]:
+    """
+    The occurrence of `event`'s rule for `year` (the first date for the
+    starting year), or None. `lunar` maps anchor id -> that year's date.
+    """
+    if year == event.date.year:
+        return event.date
+    if year < event.date.year or not event.recurrence:
+        return None
+    if event.recurrence == Recurrence.YEARLY:
+        day = _yearly(event.date, year)
+    elif event.recurrence == Recurrence.YEARLY_WEEKDAY:
+        day = _yearly_weekday(event.date, year)
+    elif event.recurrence == Recurrence.LUNAR:
+        anchor = lunar.get(event.lunar_anchor_id)
+        day = anchor + datetime.timedelta(days=event.lunar_offset_days) if anchor else None
+    else:
+        day = None
+    if day is None or day < event.date or (event.recurrence_until and day > event.recurrence_until):
+        return None
+    return day
+
+
+def _lunar_dates(year: int, anchor_ids=None) -> Dict[int, datetime.date]:
+    qs = LunarAnchorDate.objects.filter(year=year)
+    if anchor_ids is not None:
+        qs = qs.filter(anchor_id__in=anchor_ids)
+    return dict(qs.values_list("anchor_id", "date"))
+
+
+# ---------- series cache ----------
+
+def cache_versions(*names: str) -> Dict[str, int]:
+    """The current version of each named cache (0 before its first bump), in one query."""
+    found = dict(CacheVersion.objects.filter(name__in=names).values_list("name", "version"))
+    return {name: found.get(name, 0) for name in names}
+
+
+def bump_cache_versions(*names: str) -> None:
+    # time-based so a version is never reused, even if the row is lost;
+    # never lower than the last one plus one, whatever this worker's clock says
+    now = time.time_ns()
+    for name in names:
+        if CacheVersion.objects.filter(name=name).update(version=Greatest(F("version") + 1, Value(now))):
+            continue
+        try:
+            with transaction.atomic():
+                CacheVersion.objects.create(name=name, version=now)
+        except IntegrityError:
+            # another worker created the row first
+            CacheVersion.objects.filter(name=name).update(version=Greatest(F("version") + 1, Value(now)))
+
+
+def series_version() -> int:
+    return cache_versions(SERIES_VERSION)[SERIES_VERSION]
+
+
+def bump_series_version() -> None:
+    bump_cache_versions(SERIES_VERSION)
+
+
+def build_series_year(year: int) -> List[Occurrence]:
+    """Occurrences of every recurring series in one rule year (two queries)."""
+    series = list(
+        CulturalEvent.objects.exclude(recurrence=Recurrence.NONE)
+        .filter(date__lte=datetime.date(year, 12, 31))
+        .filter(
+            Q(recurrence_until__isnull=True)
+            | Q(recurrence_until__gte=datetime.date(max(year - 1, datetime.MINYEAR), 1, 1))
+        )
+    )
+    lunar_ids = {e.lunar_anchor_id for e in series if e.recurrence == Recurrence.LUNAR}
+    lunar = _lunar_dates(year, lunar_ids) if lunar_ids else {}
+    found = []
+    for event in series:
+        day = occurrence_in(event, year, lunar)
+        if day:
+            found.append(Occurrence(day, event))
+    return found
+
+
+def series_year(year: int, version: Optional[int] = None) -> List[Occurrence]:
+    """`version`: a series_version() the caller already read (saves a query per year)."""
+    if version is None:
+        version = series_version()
+    return cache.get_or_set(
+        f"calendar:series:{version}:{year}",
+        lambda: build_series_year(year),
+        SERIES_YEAR_TTL,
+    )
+
+
+# ---------- windows ----------
+
+def occurrences(start: datetime.date, end: datetime.date, category: str = "") -> List[Occurrence]:
+    """Every occurrence with start <= date < end, ordered by (date, event id)."""
+    qs = CulturalEvent.objects.filter(recurrence=Recurrence.NONE, date__gte=start, date__lt=end)
+    if category:
+        qs = qs.filter(category=category)
+    found = [Occurrence(e.date, e) for e in qs.order_by("date", "id")]
+
+    # lunar offsets can carry an occurrence into the neighbouring year
+    version = series_version()
+    for year in range(max(start.year - 1, datetime.MINYEAR), min(end.year + 1, datetime.MAXYEAR) + 1):
+        for occ in series_year(year, version):
+            if start <= occ.date < end and (not category or occ.event.category == category):
+                found.append(occ)
+    found.sort(key=lambda o: (o.date, o.event.pk))
+    return found
+
+
+# ---------- list pages ----------
+
+def _series_between(first: datetime.date, last: datetime.date, category: str) -> List[Occurrence]:
+    """Series occurrences with first <= date <= last."""
+    found = []
+    version = series_version()
+    for year in range(max(first.year - 1, datetime.MINYEAR), min(last.year + 1, datetime.MAXYEAR) + 1):
+        for occ in series_year(year, version):
+            if first <= occ.date <= last and (not category or occ.event.category == category):
+                found.append(occ)
+    return found
+
+
+def _scan(key, ascending: bool, limit: int, start, end, category: str) -> List[Occurrence]:
+    """
+    Up to `limit` occurrences strictly after `key` (date, id) in the given
+    direction, inside start <= date < end (either bound may be None).
+
+    One-off events come from a (date, id) index range scan. Series are then
+    expanded only as far as that scan reached: once it returned limit rows,
+    nothing past its last date can make the page.
+    """
+    qs = CulturalEvent.objects.filter(recurrence=Recurrence.NONE)
+    if start:
+        qs = qs.filter(date__gte=start)
+    if end:
+        qs = qs.filter(date__lt=end)
+    if category:
+        qs = qs.filter(category=category)
+    if key:
+        day, pk = key
+        if ascending:
+            qs = qs.filter(Q(date__gt=day) | Q(date=day, id__gt=pk), date__gte=day)
+        else:
+            qs = qs.filter(Q(date__lt=day) | Q(date=day, id__lt=pk), date__lte=day)
+    ordering = ("date", "id") if ascending else ("-date", "-id")
+    found = [Occurrence(e.date, e) for e in qs.order_by(*ordering)[:limit]]
+
+    today = datetime.date.today()
+    lo = max(start or datetime.date.min, today.replace(year=today.year - SERIES_ARCHIVE_YEARS, day=1))
+    hi = min(end - datetime.timedelta(days=1) if end else datetime.date.max, today.replace(year=today.year + SERIES_AHEAD_YEARS, day=1))
+    if ascending:
+        lo = max(lo, key[0]) if key else lo
+        hi = min(hi, found[-1].date) if len(found) == limit else hi
+    else:
+        hi = min(hi, key[0]) if key else hi
+        lo = max(lo, found[-1].date) if len(found) == limit else lo
+    if lo <= hi:
+        for occ in _series_between(lo, hi, category):
+            occ_key = (occ.date, occ.event.pk)
+            if not key or (occ_key > key if ascending else occ_key < key):
+                found.append(occ)
+
+    found.sort(key=lambda o: (o.date, o.event.pk), reverse=not ascending)
+    return found[:limit]
+
+
+def _decode_key(token: str):
+    values = decode_values(token, 2)
+    if values is None:
+        return None
+    try:
+        day = parse_date(values[0]) if isinstance(values[0], str) else None
+    except ValueError:
+        day = None
+    if day is None or not isinstance(values[1], int):
+        return None
+    return day, values[1]
+
+
+def occurrence_page(
+    start=None, end=None, category: str = "", ascending: bool = True,
+    after: str = "", before: str = "", per_page: int = 20,
+) -> KeysetPage:
+    """
+    Keyset page of occurrences in [start, end), ordered by (date, event id)
+    (descending with ascending=False), with the cursors of
+    core.pagination.paginate_keyset: `after` / `before` are the keys of the
+    last / first row of the neighbouring page.
+    """
+    def cursor(occ: Occurrence) -> str:
+        return encode_cursor([occ.date, occ.event.pk])
+
+    before_key = _decode_key(before)
+    if before_key is not None:
+        rows = _scan(before_key, not ascending, per_page + 1, start, end, category)
+        more_before = len(rows) > per_page
+        rows = rows[:per_page]
+        rows.reverse()
+        if rows:
+            return KeysetPage(
+                object_list=rows,
+                next_cursor=cursor(rows[-1]),
+                prev_cursor=cursor(rows[0]) if more_before else None,
+            )
+
+    after_key = _decode_key(after) if before_key is None else None
+    rows = _scan(after_key, ascending, per_page + 1, start, end, category)
+    more_after = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=cursor(rows[-1]) if more_after else None,
+        prev_cursor=cursor(rows[0]) if (after_key is not None and rows) else None,
+    )
+
+
+def upcoming(event: CulturalEvent, after: datetime.date, count: int = 5) -> List[datetime.date]:
+    """The next `count` occurrences of one event on or after `after`."""
+    if not event.recurrence:
+        return [event.date] if event.date >= after else []
+    first_year = max(after.year, event.date.year)
+    last_year = first_year + count + 1
+    if event.recurrence_until:
+        last_year = min(last_year, event.recurrence_until.year + 1)
+    by_year: Dict[int, Dict[int, datetime.date]] = {}
+    if event.recurrence == Recurrence.LUNAR:
+        for anchor_id, year, day in LunarAnchorDate.objects.filter(
+            anchor_id=event.lunar_anchor_id, year__range=(first_year - 1, last_year)
+        ).values_list("anchor_id", "year", "date"):
+            by_year.setdefault(year, {})[anchor_id] = day
+    dates = []
+    for year in range(first_year - 1, last_year + 1):
+        day = occurrence_in(event, year, by_year.get(year, {}))
+        if day and day >= after:
+            dates.append(day)
+    return sorted(dates)[:count]
+
+
+def describe(event: CulturalEvent) -> str:
+    """Human-readable rule, e.g. "Every year on the last Sunday of October"."""
+    if event.recurrence == Recurrence.YEARLY:
+        text = f"Every year on {event.date.day} {pycal.month_name[event.date.month]}"
+    elif event.recurrence == Recurrence.YEARLY_WEEKDAY:
+        week = (event.date.day - 1) // 7
+        nth = ("first", "second", "third", "fourth", "last")[week]
+        text = f"Every year on the {nth} {pycal.day_name[event.date.weekday()]} of {pycal.month_name[event.date.month]}"
+    elif event.recurrence == Recurrence.LUNAR:
+        offset = event.lunar_offset_days
+        if offset:
+            text = f"Every year, {abs(offset)} day{'s' if abs(offset) != 1 else ''} {'after' if offset > 0 else 'before'} {event.lunar_anchor}"
+        else:
+            text = f"Every year on {event.lunar_anchor}"
+    else:
+        return ""
+    if event.recurrence_until:
+        text += f", until {event.recurrence_until}"
+    return text
+
+
+# ---------- clean-up ----------
+
+def collapse_annual_duplicates(dry_run: bool = False) -> List[List[CulturalEvent]]:
+    """
+    Folds one-off events re-entered every year (same title, category, month
+    and day, in consecutive years) into one YEARLY series kept on the first
+    row; the newest row's description and location win. A run that stopped
+    before this year ends on its last date. Returns the groups (first row
+    first) that were, or with dry_run would be, collapsed.
+    """
+    groups: Dict[tuple, List[CulturalEvent]] = {}
+    for event in CulturalEvent.objects.filter(recurrence=Recurrence.NONE).order_by("date", "id"):
+        key = (event.title.strip().lower(), event.category, event.date.month, event.date.day)
+        groups.setdefault(key, []).append(event)
+
+    runs = []
+    this_year = datetime.date.today().year
+    for rows in groups.values():
+        run = [rows[0]]
+        for event in rows[1:] + [None]:
+            if event is not None and event.date.year == run[-1].date.year + 1:
+                run.append(event)
+                continue
+            if len(run) > 1:
+                runs.append(run)
+            run = [event]
+
+    if dry_run:
+        return runs
+    for run in runs:
+        first, newest = run[0], run[-1]
+        with transaction.atomic():
+            first.recurrence = Recurrence.YEARLY
+            first.recurrence_until = newest.date if newest.date.year < this_year else None
+            first.description = newest.description or first.description
+            first.location = newest.location or first.location
+            first.save()
+            CulturalEvent.objects.filter(pk__in=[e.pk for e in run[1:]]).delete()
+    return runs
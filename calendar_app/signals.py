@@ -0,0 +1,49 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .grid import invalidate_months
+from .ics import touch_feeds
+from .models import CulturalEvent, LunarAnchorDate
+from .recurrence import bump_series_version
+
+
+@receiver(pre_save, sender=CulturalEvent)
+def remember_event_slot(sender, instance: CulturalEvent, **kwargs):
+    instance._old_slot = None
+    if instance.pk:
+        instance._old_slot = (
+            CulturalEvent.objects.filter(pk=instance.pk).values_list("date", "category", "recurrence").first()
+        )
+
+
+@receiver(post_save, sender=CulturalEvent)
+def on_event_save(sender, instance: CulturalEvent, **kwargs):
+    old = getattr(instance, "_old_slot", None)
+    # after commit, so a concurrent read cannot re-cache the pre-commit month
+    if instance.recurrence or (old and old[2]):
+        # a series shows up in every year; retire all cached years and months
+        transaction.on_commit(bump_series_version)
+        return
+    slots = [(instance.date, instance.category)]
+    if old:
+        slots.append(old[:2])
+    transaction.on_commit(partial(invalidate_months, slots))
+
+
+@receiver(post_delete, sender=CulturalEvent)
+def on_event_delete(sender, instance: CulturalEvent, **kwargs):
+    transaction.on_commit(touch_feeds)
+    if instance.recurrence:
+        transaction.on_commit(bump_series_version)
+    else:
+        transaction.on_commit(partial(invalidate_months, [(instance.date, instance.category)]))
+
+
+@receiver(post_save, sender=LunarAnchorDate)
+@receiver(post_delete, sender=LunarAnchorDate)
+def on_lunar_date_change(sender, instance: LunarAnchorDate, **kwargs):
+    transaction.on_commit(bump_series_version)
+    transaction.on_commit(touch_feeds)
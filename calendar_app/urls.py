@@ -1,12 +1,21 @@
 from django.urls import path
-from .views import calendar_month_view, calendar_list_view, event_detail_view, event_create_view
+from .views import (
+    calendar_archive_view,
+    calendar_feed_view,
+    calendar_list_view,
+    calendar_month_view,
+    event_create_view,
+    event_detail_view,
+)
 
 app_name = "calendar_app"
 
 urlpatterns = [
     path("", calendar_month_view, name="month"),
     path("list/", calendar_list_view, name="list"),
+    path("archive/", calendar_archive_view, name="archive"),
     path("create/", event_create_view, name="create"),
     path("<int:event_id>/", event_detail_view, name="detail"),
-    
+    path("feed.ics", calendar_feed_view, name="feed"),
+    path("feed/<slug:category>.ics", calendar_feed_view, name="category_feed"),
 ]
@@ -5,11 +5,18 @@ import calendar as pycal
 import datetime
 
 from django.contrib import messages
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition
 
 from accounts.decorators import moderator_required
 from .forms import CulturalEventForm
+from .grid import month_grid
+from .ics import feed_chunks, feed_etag, feed_last_modified
 from .models import CulturalEvent
+from .recurrence import describe, occurrence_page, upcoming
+
+LIST_PAGE_SIZE = 20
 
 
 def _prev_month(year: int, month: int):
@@ -24,36 +31,27 @@ def _next_month(year: int, month: int):
     return year, month + 1
 
 
+def _int_param(request, name: str, default: int, lo: int, hi: int) -> int:
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if lo <= value <= hi else default
+
+
 def calendar_month_view(request):
     # default to current month
     today = datetime.date.today()
-    year = int(request.GET.get("year", today.year))
-    month = int(request.GET.get("month", today.month))
+    # one year of margin on each side keeps prev/next month links valid dates
+    year = _int_param(request, "year", today.year, datetime.MINYEAR + 1, datetime.MAXYEAR - 1)
+    month = _int_param(request, "month", today.month, 1, 12)
 
-    # fetch events for this month
-    events_qs = (
-        CulturalEvent.objects.filter(date__year=year, date__month=month)
-        .order_by("date", "id")
-    )
+    cat = request.GET.get("cat", "")
+    if cat not in CulturalEvent.Category.values:
+        cat = ""
 
-    # map date -> list[events]
-    events_by_day = {}
-    for e in events_qs:
-        events_by_day.setdefault(e.date, []).append(e)
-
-    cal = pycal.Calendar(firstweekday=0)  # Monday=0 if you want, but Python uses 0=Monday? Actually 0=Monday in calendar module.
-    # NOTE: In Python calendar, firstweekday=0 means Monday.
-    weeks = []
-    for week in cal.monthdatescalendar(year, month):
-        row = []
-        for day in week:
-            row.append({
-                "date": day,
-                "in_month": (day.month == month),
-                "events": events_by_day.get(day, []),
-                "is_today": (day == today),
-            })
-        weeks.append(row)
+    # cached per (year, month, category); see calendar_app/grid.py
+    weeks = month_grid(year, month, cat)
 
     prev_y, prev_m = _prev_month(year, month)
     next_y, next_m = _next_month(year, month)
@@ -63,6 +61,9 @@ def calendar_month_view(request):
         "month": month,
         "month_name": pycal.month_name[month],
         "weeks": weeks,
+        "today": today,
+        "categories": CulturalEvent.Category.choices,
+        "selected_cat": cat,
         "prev_year": prev_y,
         "prev_month": prev_m,
         "next_year": next_y,
@@ -71,25 +72,46 @@ def calendar_month_view(request):
     return render(request, "community/calendar_app/month.html", context)
 
 
-def calendar_list_view(request):
-    # Simple list view of upcoming events
-    qs = CulturalEvent.objects.order_by("date", "id")
-
+def _occurrence_list(request, archive: bool):
     cat = request.GET.get("cat", "")
-    if cat in {c for c, _ in CulturalEvent.Category.choices}:
-        qs = qs.filter(category=cat)
-
+    if cat not in CulturalEvent.Category.values:
+        cat = ""
+    today = datetime.date.today()
+    page = occurrence_page(
+        start=None if archive else today,
+        end=today if archive else None,
+        category=cat,
+        ascending=not archive,  # archive: most recent first
+        after=request.GET.get("after", ""),
+        before=request.GET.get("before", ""),
+        per_page=LIST_PAGE_SIZE,
+    )
     context = {
-        "events": qs,
+        "page": page,
+        "archive": archive,
         "categories": CulturalEvent.Category.choices,
         "selected_cat": cat,
     }
     return render(request, "community/calendar_app/list.html", context)
 
 
+def calendar_list_view(request):
+    # Upcoming occurrences, keyset-paged; recurring series expanded per page
+    return _occurrence_list(request, archive=False)
+
+
+def calendar_archive_view(request):
+    return _occurrence_list(request, archive=True)
+
+
 def event_detail_view(request, event_id: int):
-    event = get_object_or_404(CulturalEvent, id=event_id)
-    return render(request, "community/calendar_app/detail.html", {"event": event})
+    event = get_object_or_404(CulturalEvent.objects.select_related("lunar_anchor"), id=event_id)
+    context = {
+        "event": event,
+        "rule": describe(event),
+        "next_dates": upcoming(event, datetime.date.today()) if event.is_recurring else [],
+    }
+    return render(request, "community/calendar_app/detail.html", context)
 
 
 @moderator_required
@@ -106,3 +128,41 @@ def event_create_view(request):
         form = CulturalEventForm()
 
     return render(request, "community/calendar_app/create.html", {"form": form})
+
+
+def _feed_category(category):
+    if category is None:
+        return ""
+    category = category.upper()
+    if category not in CulturalEvent.Category.values:
+        raise Http404("Unknown category")
+    return category
+
+
+def _feed_stamp(request):
+    # condition() asks for both validators; read MAX(updated_at) once
+    if not hasattr(request, "_feed_stamp"):
+        request._feed_stamp = feed_last_modified()
+    return request._feed_stamp
+
+
+def _feed_etag(request, category=None):
+    return feed_etag(_feed_stamp(request), _feed_category(category))
+
+
+def _feed_last_modified(request, category=None):
+    return _feed_stamp(request)
+
+
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def calendar_feed_view(request, category=None):
+    """Subscribable .ics feed, all events or one category (GET /calendar/feed/festival.ics)."""
+    category = _feed_category(category)
+    base_url = f"{request.scheme}://{request.get_host()}"
+    response = StreamingHttpResponse(
+        feed_chunks(category, request.get_host().split(":")[0], base_url),
+        content_type="text/calendar; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'inline; filename="{(category or "calendar").lower()}.ics"'
+    response["Cache-Control"] = "no-cache"  # always revalidate; unchanged feeds answer 304
+    return response
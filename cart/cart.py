@@ -68,13 +68,22 @@ def items(session) -> List[Tuple[Product, int, Decimal]]:
     return out
 
 
-def totals(session) -> Tuple[Decimal, int]:
+def summary(session) -> Tuple[List[Tuple[Product, int, Decimal]], Decimal, int]:
     """
-    Returns (subtotal, total_qty)
+    Returns (items, subtotal, total_qty) from a single product query.
     """
+    cart_items = items(session)
     subtotal = Decimal("0.00")
     total_qty = 0
-    for _, qty, line_total in items(session):
+    for _, qty, line_total in cart_items:
         subtotal += line_total
         total_qty += qty
+    return cart_items, subtotal, total_qty
+
+
+def totals(session) -> Tuple[Decimal, int]:
+    """
+    Returns (subtotal, total_qty)
+    """
+    _, subtotal, total_qty = summary(session)
     return subtotal, total_qty
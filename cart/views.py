@@ -3,16 +3,17 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_POST
 
 from catalog.models import Product
-from .cart import add, remove, set_qty, items, totals
+from core.ratelimit import cart_ratelimit
+from .cart import add, remove, set_qty, summary
 
 
 def cart_detail(request):
-    cart_items = items(request.session)
-    subtotal, total_qty = totals(request.session)
+    cart_items, subtotal, total_qty = summary(request.session)
     return render(request, "mart/cart/cart_detail.html", {"cart_items": cart_items, "subtotal": subtotal, "total_qty": total_qty})
 
 
 @require_POST
+@cart_ratelimit
 def cart_add(request, product_id: int):
     product = get_object_or_404(Product, pk=product_id, is_active=True)
     qty = int(request.POST.get("qty", 1))
@@ -22,6 +23,7 @@ def cart_add(request, product_id: int):
 
 
 @require_POST
+@cart_ratelimit
 def cart_remove(request, product_id: int):
     remove(request.session, product_id)
     messages.info(request, "Removed item from cart.")
@@ -29,6 +31,7 @@ def cart_remove(request, product_id: int):
 
 
 @require_POST
+@cart_ratelimit
 def cart_update(request, product_id: int):
     qty = int(request.POST.get("qty", 1))
     set_qty(request.session, product_id, qty)
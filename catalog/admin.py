@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Category, Product, ProductImage
+from .models import Category, Product, ProductImage, ProductImportJob
 
 admin.site.register(Category)
 admin.site.register(Product)
 admin.site.register(ProductImage)
+admin.site.register(ProductImportJob)
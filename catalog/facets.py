@@ -0,0 +1,236 @@
+"""
+Faceted product search.
+
+Every active product sits in exactly one facet cell: (category, price bucket,
+rating band). ProductFacet keeps a running count per cell, updated by
+catalog.signals whenever a product is created, edited, re-rated or deleted, so
+browse/filter facets are summed from a few dozen rows instead of a GROUP BY
+over Product. Free-text searches count facets over their matching rows only,
+with one GROUP BY on the cell expressions.
+"""
+from collections import Counter
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Category, Product, ProductFacet
+
+Cell = Tuple[int, int, int]  # (category_key, price_bucket, rating_band)
+
+PRICE_BUCKETS = [
+    (Decimal("0"), Decimal("500"), "Under ₹500"),
+    (Decimal("500"), Decimal("1000"), "₹500 – ₹1,000"),
+    (Decimal("1000"), Decimal("2500"), "₹1,000 – ₹2,500"),
+    (Decimal("2500"), Decimal("5000"), "₹2,500 – ₹5,000"),
+    (Decimal("5000"), None, "₹5,000 & above"),
+]
+
+# filter values are "k stars & up"; stored bands are exclusive (4 covers 4.0-5.0)
+RATING_FILTERS = [(4, "4★ & up"), (3, "3★ & up"), (2, "2★ & up"), (1, "1★ & up")]
+
+CATEGORIES_CACHE_KEY = "catalog:categories"
+
+
+# ---------- categories ----------
+
+def cached_categories() -> list:
+    """All categories ordered by name; invalidated by catalog.signals on any change."""
+    return cache.get_or_set(CATEGORIES_CACHE_KEY, lambda: list(Category.objects.order_by("name")), None)
+
+
+def invalidate_categories() -> None:
+    cache.delete(CATEGORIES_CACHE_KEY)
+
+
+# ---------- cells ----------
+
+def price_bucket(price) -> int:
+    price = price or Decimal("0")
+    for idx, (lo, hi, _) in enumerate(PRICE_BUCKETS):
+        if price >= lo and (hi is None or price < hi):
+            return idx
+    return 0
+
+
+def rating_band(rating_avg, rating_count) -> int:
+    if not rating_count:
+        return 0
+    return max(1, min(int(rating_avg or 0), 4))
+
+
+def facet_cell(category_id, price, is_active, rating_avg, rating_count) -> Optional[Cell]:
+    if not is_active:
+        return None
+    return (category_id or 0, price_bucket(price), rating_band(rating_avg, rating_count))
+
+
+def product_cell(product: Product) -> Optional[Cell]:
+    return facet_cell(product.category_id, product.price, product.is_active, product.rating_avg, product.rating_count)
+
+
+def bump_cell(cell: Optional[Cell], delta: int) -> None:
+    if cell is None or not delta:
+        return
+    key = {"category_key": cell[0], "price_bucket": cell[1], "rating_band": cell[2]}
+    qs = ProductFacet.objects.filter(**key)
+    if delta < 0:
+        qs = qs.filter(product_count__gte=-delta)
+    if qs.update(product_count=F("product_count") + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ProductFacet.objects.create(product_count=delta, **key)
+    except IntegrityError:
+        # another writer created the cell first
+        ProductFacet.objects.filter(**key).update(product_count=F("product_count") + delta)
+
+
+def move_product(old: Optional[Cell], new: Optional[Cell]) -> None:
+    if old == new:
+        return
+    bump_cell(old, -1)
+    bump_cell(new, 1)
+
+
+def merge_category_into_uncategorized(category_id: int) -> None:
+    """Category deleted: its products were SET_NULL in bulk, so move their cells to key 0."""
+    for cell in ProductFacet.objects.filter(category_key=category_id):
+        bump_cell((0, cell.price_bucket, cell.rating_band), cell.product_count)
+        cell.delete()
+
+
+def rebuild_facets() -> int:
+    """Full recount (reconciliation job). Returns the number of non-empty cells."""
+    counts = Counter()
+    rows = Product.objects.values_list("category_id", "price", "is_active", "rating_avg", "rating_count")
+    for row in rows.iterator(chunk_size=2000):
+        cell = facet_cell(*row)
+        if cell is not None:
+            counts[cell] += 1
+
+    with transaction.atomic():
+        ProductFacet.objects.all().delete()
+        ProductFacet.objects.bulk_create(
+            [
+                ProductFacet(category_key=c, price_bucket=p, rating_band=r, product_count=n)
+                for (c, p, r), n in counts.items()
+            ],
+            batch_size=500,
+        )
+    return len(counts)
+
+
+# ---------- querying ----------
+
+def parse_price(raw) -> Optional[int]:
+    try:
+        idx = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return idx if 0 <= idx < len(PRICE_BUCKETS) else None
+
+
+def parse_rating(raw) -> Optional[int]:
+    try:
+        k = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return k if k in {k for k, _ in RATING_FILTERS} else None
+
+
+def apply_price_rating(qs, price: Optional[int], rating: Optional[int]):
+    if price is not None:
+        lo, hi, _ = PRICE_BUCKETS[price]
+        qs = qs.filter(price__gte=lo)
+        if hi is not None:
+            qs = qs.filter(price__lt=hi)
+    if rating is not None:
+        qs = qs.filter(rating_count__gt=0, rating_avg__gte=rating)
+    return qs
+
+
+def _cube() -> Dict[Cell, int]:
+    rows = ProductFacet.objects.filter(product_count__gt=0).values_list(
+        "category_key", "price_bucket", "rating_band", "product_count"
+    )
+    return {(c, p, r): n for c, p, r, n in rows}
+
+
+def _price_bucket_sql() -> Case:
+    """price_bucket() as a SQL expression."""
+    whens = []
+    for idx, (lo, hi, _) in enumerate(PRICE_BUCKETS):
+        cond = Q(price__gte=lo) if hi is None else Q(price__gte=lo, price__lt=hi)
+        whens.append(When(cond, then=Value(idx)))
+    return Case(*whens, default=Value(0), output_field=IntegerField())
+
+
+def _rating_band_sql() -> Case:
+    """rating_band() as a SQL expression."""
+    rated = Q(rating_count__gt=0)
+    return Case(
+        *[When(rated & Q(rating_avg__gte=band), then=Value(band)) for band in (4, 3, 2)],
+        When(rated, then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _search_cube(qs) -> Dict[Cell, int]:
+    """Cell counts for the rows of a search queryset, as one GROUP BY (no rows reach Python)."""
+    rows = (
+        qs.filter(is_active=True)
+        .order_by()
+        .values(
+            cell_category=Coalesce("category_id", Value(0)),
+            cell_price=_price_bucket_sql(),
+            cell_rating=_rating_band_sql(),
+        )
+        .annotate(n=Count("id"))
+        .values_list("cell_category", "cell_price", "cell_rating", "n")
+    )
+    return {(c, p, r): n for c, p, r, n in rows}
+
+
+def facet_counts(category_id: Optional[int], price: Optional[int], rating: Optional[int], search_qs=None) -> dict:
+    """
+    Disjunctive facet counts: each facet is counted with every *other* active
+    filter applied, so picking a category still shows the sibling categories.
+
+    Without `search_qs` the counts come from ProductFacet; with a text search
+    pass the q-filtered (but not facet-filtered) queryset instead.
+    """
+    cube = _cube() if search_qs is None else _search_cube(search_qs)
+
+    def keep(cell: Cell, skip: str) -> bool:
+        c, p, r = cell
+        if skip != "category" and category_id is not None and c != category_id:
+            return False
+        if skip != "price" and price is not None and p != price:
+            return False
+        if skip != "rating" and rating is not None and r < rating:
+            return False
+        return True
+
+    by_category = Counter()
+    by_price = Counter()
+    by_band = Counter()
+    for cell, n in cube.items():
+        if keep(cell, "category"):
+            by_category[cell[0]] += n
+        if keep(cell, "price"):
+            by_price[cell[1]] += n
+        if keep(cell, "rating"):
+            by_band[cell[2]] += n
+
+    return {
+        "categories": [(c, by_category.get(c.id, 0)) for c in cached_categories()],
+        "prices": [(idx, label, by_price.get(idx, 0)) for idx, (_, _, label) in enumerate(PRICE_BUCKETS)],
+        "ratings": [
+            (k, label, sum(n for band, n in by_band.items() if band >= k)) for k, label in RATING_FILTERS
+        ],
+    }
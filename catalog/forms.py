@@ -37,3 +37,24 @@ class ProductImageForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         self.fields["image"].widget.attrs.update({"class": "form-control"})
         self.fields["caption"].widget.attrs.update({"class": "form-control"})
+
+
+class ProductImportForm(forms.Form):
+    MAX_UPLOAD_MB = 200
+
+    upload = forms.FileField(
+        label="CSV or ZIP file",
+        help_text="A .csv of products, or a .zip with one .csv and the images it names.",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["upload"].widget.attrs.update({"class": "form-control", "accept": ".csv,.zip"})
+
+    def clean_upload(self):
+        upload = self.cleaned_data["upload"]
+        if not upload.name.lower().endswith((".csv", ".zip")):
+            raise forms.ValidationError("Upload a .csv or .zip file.")
+        if upload.size > self.MAX_UPLOAD_MB * 1024 * 1024:
+            raise forms.ValidationError(f"Files up to {self.MAX_UPLOAD_MB} MB only.")
+        return upload
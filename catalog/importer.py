@@ -0,0 +1,355 @@
+"""
+Bulk catalog import for artisans (ProductImportJob).
+
+An artisan uploads a CSV, or a ZIP holding one CSV plus the images it names.
+`manage.py process_catalog_imports` claims queued jobs and streams the CSV in
+batches: each batch is validated row by row (bad rows are recorded with their
+line number and skipped), then written in one transaction with bulk_create for
+Product and ProductImage, the facet cells bumped by the batch's totals, and the
+job's `last_line` advanced. A worker that dies mid-file leaves the job RUNNING
+with a stale heartbeat; the next worker reclaims it and continues after
+`last_line`, so no row is imported twice.
+
+Every claim stores a fresh `claim_token`. Heartbeats and batch commits are
+UPDATEs conditional on (pk, claim_token, last_line): a worker that was too
+slow and got reclaimed matches no row, rolls its batch back and stops.
+
+bulk_create skips the catalog signals, so facets are kept here; new products
+start unrated, so there are no rating totals to maintain. Renditions are left
+to `manage.py build_image_renditions`.
+
+CSV columns: title, price (required), description, category (slug),
+is_made_to_order, production_time_days, is_active, main_image, images
+("a.jpg|b.jpg"); image paths are relative to the ZIP root.
+"""
+import csv
+import io
+import logging
+import posixpath
+import sys
+import time
+import uuid
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from PIL import Image
+
+from .facets import bump_cell, cached_categories, facet_cell
+from .models import Product, ProductImage, ProductImportJob
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+MAX_EXTRA_IMAGES = 8
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_ERRORS_KEPT = 500  # error_count keeps counting past this
+STALE_AFTER = timedelta(minutes=5)  # RUNNING job without a heartbeat this long is reclaimed
+HEARTBEAT_EVERY = 30  # seconds between heartbeats while a batch is being read
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+
+class ImportJobError(Exception):
+    """The upload as a whole cannot be imported."""
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+class JobLost(Exception):
+    """Another worker reclaimed the job; this one must stop without writing."""
+
+
+# ---------- reading ----------
+
+@contextmanager
+def open_upload(job: ProductImportJob):
+    """Yields (CSV text stream, ZipFile or None) for the job's upload."""
+    with job.upload.open("rb") as raw:
+        if not zipfile.is_zipfile(raw):
+            raw.seek(0)
+            yield io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""), None
+            return
+        raw.seek(0)
+        with zipfile.ZipFile(raw) as archive:
+            sheets = [
+                n for n in archive.namelist()
+                if n.lower().endswith(".csv") and not n.startswith("__MACOSX/")
+            ]
+            if len(sheets) != 1:
+                raise ImportJobError(f"The ZIP must contain exactly one .csv file (found {len(sheets)}).")
+            with archive.open(sheets[0]) as member:
+                yield io.TextIOWrapper(member, encoding="utf-8-sig", newline=""), archive
+
+
+def iter_rows(fh) -> Iterator[Tuple[int, dict]]:
+    """(line number, row) pairs with lower-cased, stripped column names."""
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    reader = csv.DictReader(fh)
+    if reader.fieldnames is None:
+        raise ImportJobError("The CSV file is empty.")
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames]
+    missing = {"title", "price"} - set(reader.fieldnames)
+    if missing:
+        raise ImportJobError(f"Missing column(s): {', '.join(sorted(missing))}.")
+    for row in reader:
+        if not any((v or "").strip() for v in row.values() if isinstance(v, str)):
+            continue  # blank line
+        yield reader.line_num, row
+
+
+# ---------- validation ----------
+
+_FORM_FIELDS = {
+    name: Product._meta.get_field(name).formfield()
+    for name in ("title", "description", "price", "production_time_days")
+}
+
+
+def _clean(name: str, raw) -> object:
+    try:
+        return _FORM_FIELDS[name].clean(raw)
+    except ValidationError as exc:
+        raise ImportRowError(f"{name}: {' '.join(exc.messages)}")
+
+
+def _flag(raw: str, name: str, default: bool) -> bool:
+    value = (raw or "").strip().lower()
+    if not value:
+        return default
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ImportRowError(f"{name}: expected yes/no, got {raw!r}")
+
+
+def _check_image(archive: Optional[zipfile.ZipFile], path: str) -> str:
+    if archive is None:
+        raise ImportRowError(f"image {path!r}: upload a ZIP to include images")
+    name = posixpath.normpath(path.strip().replace("\\", "/")).lstrip("/")
+    if posixpath.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+        raise ImportRowError(f"image {path!r}: not a supported image type")
+    try:
+        info = archive.getinfo(name)
+    except KeyError:
+        raise ImportRowError(f"image {path!r}: not found in the ZIP")
+    if info.file_size > MAX_IMAGE_BYTES:
+        raise ImportRowError(f"image {path!r}: larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+    try:
+        with archive.open(info) as fh, Image.open(fh) as im:
+            im.verify()  # same check as ImageField form validation
+    except Exception:
+        raise ImportRowError(f"image {path!r}: not a valid image")
+    return name
+
+
+def normalize(raw: dict, categories: Dict[str, int], archive: Optional[zipfile.ZipFile]) -> dict:
+    def get(key: str) -> str:
+        return (raw.get(key) or "").strip()
+
+    slug = get("category").lower()
+    category_id = None
+    if slug:
+        category_id = categories.get(slug)
+        if category_id is None:
+            raise ImportRowError(f"category: unknown slug {slug!r}")
+
+    days = get("production_time_days")
+    extra = [p for p in get("images").split("|") if p.strip()]
+    if len(extra) > MAX_EXTRA_IMAGES:
+        raise ImportRowError(f"images: more than {MAX_EXTRA_IMAGES}")
+
+    return {
+        "title": _clean("title", get("title")),
+        "description": _clean("description", raw.get("description") or ""),
+        "price": _clean("price", get("price")),
+        "category_id": category_id,
+        "is_made_to_order": _flag(get("is_made_to_order"), "is_made_to_order", True),
+        "production_time_days": _clean("production_time_days", days) if days else 7,
+        "is_active": _flag(get("is_active"), "is_active", True),
+        "main_image": _check_image(archive, get("main_image")) if get("main_image") else None,
+        "images": [_check_image(archive, p) for p in extra],
+    }
+
+
+# ---------- writing ----------
+
+class ProductImporter:
+    def __init__(self, job: ProductImportJob, batch_size: int = BATCH_SIZE, log: Callable[[str], None] = logger.info):
+        self.job = job
+        self.batch_size = batch_size
+        self.log = log
+        self._main_field = Product._meta.get_field("main_image")
+        self._extra_field = ProductImage._meta.get_field("image")
+
+    def _owned(self):
+        """The job row, if this worker still holds the claim and nobody moved last_line."""
+        job = self.job
+        return ProductImportJob.objects.filter(pk=job.pk, claim_token=job.claim_token, last_line=job.last_line)
+
+    def _heartbeat(self) -> None:
+        now = timezone.now()
+        if not self._owned().update(heartbeat_at=now):
+            raise JobLost(f"job {self.job.pk} was reclaimed by another worker")
+        self.job.heartbeat_at = now
+        self._last_beat = time.monotonic()
+
+    def run(self) -> ProductImportJob:
+        job = self.job
+        categories = {c.slug: c.id for c in cached_categories()}
+        self._last_beat = time.monotonic()
+        with open_upload(job) as (fh, archive):
+            rows: List[dict] = []
+            errors: List[dict] = []
+            line_no = job.last_line
+            for line_no, raw in iter_rows(fh):
+                if line_no <= job.last_line:
+                    continue  # committed by an earlier run
+                if time.monotonic() - self._last_beat >= HEARTBEAT_EVERY:
+                    self._heartbeat()  # image checks can make one batch slow
+                try:
+                    rows.append(normalize(raw, categories, archive))
+                except ImportRowError as exc:
+                    errors.append({"line": line_no, "error": str(exc)})
+                if len(rows) + len(errors) >= self.batch_size:
+                    self._flush(rows, errors, line_no, archive)
+                    rows, errors = [], []
+            if rows or errors or line_no > job.last_line:
+                self._flush(rows, errors, line_no, archive)
+        return job
+
+    def _save_image(self, field, archive: zipfile.ZipFile, name: str) -> str:
+        with archive.open(name) as fh:
+            data = fh.read()
+        target = field.generate_filename(None, posixpath.basename(name))
+        return field.storage.save(target, ContentFile(data), max_length=field.max_length)
+
+    def _flush(self, rows: List[dict], errors: List[dict], line_no: int, archive) -> None:
+        job = self.job
+        images = []
+        all_errors = (job.errors + errors)[:MAX_ERRORS_KEPT]
+        now = timezone.now()
+        with transaction.atomic():
+            # claim check first: a reclaimed worker writes nothing (not even image files)
+            owned = self._owned().update(
+                last_line=line_no,
+                created_count=F("created_count") + len(rows),
+                error_count=F("error_count") + len(errors),
+                errors=all_errors,
+                heartbeat_at=now,
+            )
+            if not owned:
+                raise JobLost(f"job {job.pk} was reclaimed by another worker")
+
+            products = Product.objects.bulk_create(
+                [
+                    Product(
+                        artisan_id=job.artisan_id,
+                        category_id=r["category_id"],
+                        title=r["title"],
+                        description=r["description"],
+                        price=r["price"],
+                        is_made_to_order=r["is_made_to_order"],
+                        production_time_days=r["production_time_days"],
+                        is_active=r["is_active"],
+                        main_image=self._save_image(self._main_field, archive, r["main_image"]) if r["main_image"] else None,
+                    )
+                    for r in rows
+                ],
+                batch_size=self.batch_size,
+            )
+            for product, r in zip(products, rows):
+                for name in r["images"]:
+                    images.append(ProductImage(product_id=product.pk, image=self._save_image(self._extra_field, archive, name)))
+            ProductImage.objects.bulk_create(images, batch_size=self.batch_size)
+
+            cells = Counter(facet_cell(p.category_id, p.price, p.is_active, 0.0, 0) for p in products)
+            for cell, n in cells.items():
+                bump_cell(cell, n)
+
+        job.last_line = line_no
+        job.created_count += len(products)
+        job.error_count += len(errors)
+        job.errors = all_errors
+        job.heartbeat_at = now
+        self._last_beat = time.monotonic()
+
+        self.log(
+            f"job {job.pk}: line {line_no}, +{len(products)} products, +{len(images)} images, "
+            f"{len(errors)} bad rows ({job.created_count} imported so far)"
+        )
+
+
+# ---------- job queue ----------
+
+def _claimable() -> Q:
+    stale = timezone.now() - STALE_AFTER
+    return Q(status=ProductImportJob.Status.PENDING) | Q(
+        status=ProductImportJob.Status.RUNNING, heartbeat_at__lt=stale
+    )
+
+
+def claim_next_job() -> Optional[ProductImportJob]:
+    """
+    Takes the oldest queued (or abandoned) job with a conditional UPDATE, so
+    two workers never run the same job.
+    """
+    for pk in ProductImportJob.objects.filter(_claimable()).order_by("id").values_list("pk", flat=True)[:5]:
+        now = timezone.now()
+        claimed = ProductImportJob.objects.filter(_claimable(), pk=pk).update(
+            status=ProductImportJob.Status.RUNNING,
+            heartbeat_at=now,
+            started_at=Coalesce(F("started_at"), now),
+            claim_token=uuid.uuid4().hex,
+        )
+        if claimed:
+            return ProductImportJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job: ProductImportJob, batch_size: int = BATCH_SIZE, log: Callable[[str], None] = logger.info) -> ProductImportJob:
+    """Imports the rest of a claimed job and records how it ended."""
+    try:
+        ProductImporter(job, batch_size=batch_size, log=log).run()
+        job.status = ProductImportJob.Status.DONE
+        job.last_error = ""
+    except JobLost as exc:
+        # the new owner carries on from the last committed batch
+        logger.warning("%s", exc)
+        log(f"{exc}; stopping")
+        return job
+    except (ImportJobError, zipfile.BadZipFile, UnicodeDecodeError, csv.Error) as exc:
+        job.status = ProductImportJob.Status.FAILED
+        job.last_error = str(exc)
+    except Exception as exc:  # keep the worker alive; committed batches stay, retry resumes
+        logger.exception("Catalog import job %s crashed", job.pk)
+        job.status = ProductImportJob.Status.FAILED
+        job.last_error = f"{type(exc).__name__}: {exc}"
+    job.finished_at = timezone.now()
+    finished = ProductImportJob.objects.filter(pk=job.pk, claim_token=job.claim_token).update(
+        status=job.status, last_error=job.last_error, finished_at=job.finished_at
+    )
+    if not finished:
+        logger.warning("job %s was reclaimed before it could be marked %s", job.pk, job.status)
+    return job
+
+
+def retry_failed(job_ids=None) -> int:
+    """Re-queues FAILED jobs; they resume after their last committed line."""
+    qs = ProductImportJob.objects.filter(status=ProductImportJob.Status.FAILED)
+    if job_ids:
+        qs = qs.filter(pk__in=job_ids)
+    return qs.update(status=ProductImportJob.Status.PENDING, finished_at=None)
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.importer import BATCH_SIZE, claim_next_job, retry_failed, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued artisan catalog imports (run once, or keep polling with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when the queue is empty.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep between polls with --loop.")
+        parser.add_argument(
+            "--retry-failed",
+            nargs="*",
+            type=int,
+            metavar="JOB_ID",
+            help="Re-queue failed jobs (all, or the given ids) first; they resume where they stopped.",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"] is not None:
+            n = retry_failed(options["retry_failed"])
+            self.stdout.write(f"Re-queued {n} failed job(s).")
+
+        done = imported = 0
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+            self.stdout.write(f"job {job.pk}: {job.original_name} (from line {job.last_line + 1})")
+            run_job(job, batch_size=options["batch_size"], log=self.stdout.write)
+            done += 1
+            imported += job.created_count
+            style = self.style.SUCCESS if job.status == job.Status.DONE else self.style.ERROR
+            self.stdout.write(
+                style(f"job {job.pk} {job.status}: {job.created_count} imported, {job.error_count} skipped {job.last_error}".rstrip())
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {done} job(s) run."))
+        if imported:
+            self.stdout.write("Run `manage.py build_image_renditions` to generate thumbnails for imported images.")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = "Recount the ProductFacet table (category x price bucket x rating band) from Product."
+
+    def handle(self, *args, **options):
+        cells = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {cells} facet cell(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog.recommendations import rebuild_co_purchases
+
+
+class Command(BaseCommand):
+    help = "Recompute the co-purchase index (\"customers also bought\") from paid orders."
+
+    def handle(self, *args, **options):
+        pairs = rebuild_co_purchases()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt co-purchases: {pairs} product pair(s)."))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+from collections import Counter
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# frozen copy of catalog.facets as of this migration; later bucket changes
+# must come with their own migration
+PRICE_BOUNDS = [Decimal("500"), Decimal("1000"), Decimal("2500"), Decimal("5000")]
+
+
+def facet_cell(category_id, price, is_active, rating_avg, rating_count):
+    if not is_active:
+        return None
+    price = price or Decimal("0")
+    bucket = sum(1 for bound in PRICE_BOUNDS if price >= bound)
+    band = max(1, min(int(rating_avg or 0), 4)) if rating_count else 0
+    return (category_id or 0, bucket, band)
+
+
+def backfill_facets(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    ProductFacet = apps.get_model("catalog", "ProductFacet")
+
+    counts = Counter()
+    rows = Product.objects.values_list("category_id", "price", "is_active", "rating_avg", "rating_count")
+    for row in rows.iterator():
+        cell = facet_cell(*row)
+        if cell is not None:
+            counts[cell] += 1
+
+    ProductFacet.objects.bulk_create(
+        [
+            ProductFacet(category_key=c, price_bucket=p, rating_band=r, product_count=n)
+            for (c, p, r), n in counts.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_key', models.PositiveBigIntegerField(default=0)),
+                ('price_bucket', models.PositiveSmallIntegerField()),
+                ('rating_band', models.PositiveSmallIntegerField()),
+                ('product_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('category_key', 'price_bucket', 'rating_band'), name='unique_product_facet_cell')],
+            },
+        ),
+        migrations.RunPython(backfill_facets, migrations.RunPython.noop),
+    ]
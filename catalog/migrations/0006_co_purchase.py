@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:43
+
+from collections import Counter
+from itertools import groupby, permutations
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# frozen copy of catalog.recommendations.MAX_BASKET as of this migration
+MAX_BASKET = 40
+
+
+def backfill_co_purchases(apps, schema_editor):
+    OrderItem = apps.get_model("orders", "OrderItem")
+    ProductCoPurchase = apps.get_model("catalog", "ProductCoPurchase")
+
+    counts = Counter()
+    rows = (
+        OrderItem.objects.filter(order__status="PAID")
+        .order_by("order_id")
+        .values_list("order_id", "product_id")
+        .distinct()
+    )
+    for _, items in groupby(rows.iterator(chunk_size=2000), key=lambda r: r[0]):
+        basket = sorted({product_id for _, product_id in items})
+        if 1 < len(basket) <= MAX_BASKET:
+            counts.update(permutations(basket, 2))
+
+    ProductCoPurchase.objects.bulk_create(
+        [ProductCoPurchase(product_id=a, other_id=b, order_count=n) for (a, b), n in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artisans', '0003_image_renditions'),
+        ('catalog', '0005_product_import_job'),
+        ('orders', '0003_order_razorpay_order_id_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCoPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['artisan', '-created_at'], name='catalog_product_artisan_idx'),
+        ),
+        migrations.AddField(
+            model_name='productcopurchase',
+            name='other',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.product'),
+        ),
+        migrations.AddField(
+            model_name='productcopurchase',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='co_purchases', to='catalog.product'),
+        ),
+        migrations.AddIndex(
+            model_name='productcopurchase',
+            index=models.Index(fields=['product', '-order_count', 'other'], name='catalog_copurchase_top_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='productcopurchase',
+            constraint=models.UniqueConstraint(fields=('product', 'other'), name='unique_co_purchase_pair'),
+        ),
+        migrations.RunPython(backfill_co_purchases, migrations.RunPython.noop),
+    ]
@@ -29,6 +29,7 @@ class Product(models.Model):
     production_time_days = models.PositiveIntegerField(default=7)  # ETA for made-to-order
 
     main_image = models.ImageField(upload_to="products/main/", blank=True, null=True)
+    main_image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
 
     is_active = models.BooleanField(default=True)
 
@@ -37,7 +38,10 @@ class Product(models.Model):
 
     rating_avg = models.FloatField(default=0.0)
     rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)  # running total, see reviews.services
 
+    class Meta:
+        indexes = [models.Index(fields=["artisan", "-created_at"], name="catalog_product_artisan_idx")]
 
     def __str__(self) -> str:
         return self.title
@@ -46,8 +50,88 @@ class Product(models.Model):
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="products/extra/")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
     caption = models.CharField(max_length=180, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
         return f"ProductImage({self.product_id})"
+
+
+class ProductFacet(models.Model):
+    """
+    Pre-aggregated count of active products per (category, price bucket, rating band).
+    Maintained incrementally by catalog.signals; see catalog/facets.py.
+    """
+    # plain id instead of a FK: 0 = uncategorized, so the unique cell key never contains NULL
+    category_key = models.PositiveBigIntegerField(default=0)
+    price_bucket = models.PositiveSmallIntegerField()
+    rating_band = models.PositiveSmallIntegerField()  # 0 = unrated, 1..4 (4 covers 4.0-5.0)
+    product_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category_key", "price_bucket", "rating_band"],
+                name="unique_product_facet_cell",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Facet({self.category_key}, {self.price_bucket}, {self.rating_band}) = {self.product_count}"
+
+
+class ProductCoPurchase(models.Model):
+    """
+    Number of paid orders containing both `product` and `other`. Stored in both
+    directions so "customers also bought" is one index range scan on
+    (product, -order_count). Maintained by catalog.recommendations.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="co_purchases")
+    other = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["product", "other"], name="unique_co_purchase_pair")]
+        indexes = [models.Index(fields=["product", "-order_count", "other"], name="catalog_copurchase_top_idx")]
+
+    def __str__(self) -> str:
+        return f"CoPurchase({self.product_id}, {self.other_id}) = {self.order_count}"
+
+
+class ProductImportJob(models.Model):
+    """
+    A CSV (or ZIP of CSV + images) catalog upload by an artisan. Rows are
+    imported in batches by `manage.py process_catalog_imports`; see
+    catalog/importer.py. Each batch commits together with `last_line`, so a job
+    interrupted mid-file resumes after it.
+    """
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Queued"
+        RUNNING = "RUNNING", "Importing"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    artisan = models.ForeignKey(ArtisanProfile, on_delete=models.CASCADE, related_name="import_jobs")
+    upload = models.FileField(upload_to="imports/catalog/")
+    original_name = models.CharField(max_length=255, blank=True)
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    last_line = models.PositiveIntegerField(default=0)  # resume point: last CSV line committed
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # [{"line": n, "error": "..."}], capped
+    last_error = models.TextField(blank=True)  # job-level failure (unreadable file, crash)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # new value on every claim; a worker whose token was replaced has lost the job
+    claim_token = models.CharField(max_length=32, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "id"], name="catalog_import_queue_idx")]
+
+    def __str__(self) -> str:
+        return f"ProductImportJob({self.pk}) {self.status}"
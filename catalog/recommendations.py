@@ -0,0 +1,90 @@
+"""
+"Customers also bought" / "More from this artisan" for product pages.
+
+ProductCoPurchase holds, for every ordered pair of products, how many paid
+orders contained both. orders.services.mark_order_paid() calls
+record_paid_orders() after commit, which adds one order's pairs with two
+statements (insert missing pairs at 0, then +1 on all of them), so concurrent
+payments never lose an increment. The product page then reads the top rows
+for one product from the (product, -order_count) index instead of self-joining
+OrderItem. `manage.py rebuild_recommendations` recomputes everything from
+order history.
+"""
+from collections import Counter
+from itertools import groupby, permutations
+from typing import Iterable, List
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Product, ProductCoPurchase
+
+# baskets bigger than this are wholesale/test orders and say little about
+# what goes together; they are left out (also keeps one order to <= N*(N-1) rows)
+MAX_BASKET = 40
+ALSO_BOUGHT_LIMIT = 6
+SAME_ARTISAN_LIMIT = 6
+
+
+def _paid_baskets(order_ids=None) -> Iterable[List[int]]:
+    from orders.models import Order, OrderItem
+
+    qs = OrderItem.objects.filter(order__status=Order.Status.PAID)
+    if order_ids is not None:
+        qs = qs.filter(order_id__in=order_ids)
+    rows = qs.order_by("order_id").values_list("order_id", "product_id").distinct()
+    for _, items in groupby(rows.iterator(chunk_size=2000), key=lambda r: r[0]):
+        basket = sorted({product_id for _, product_id in items})
+        if 1 < len(basket) <= MAX_BASKET:
+            yield basket
+
+
+def record_paid_orders(order_ids) -> int:
+    """Adds the product pairs of newly paid orders. Returns pairs touched."""
+    touched = 0
+    for basket in _paid_baskets(order_ids):
+        with transaction.atomic():
+            ProductCoPurchase.objects.bulk_create(
+                [ProductCoPurchase(product_id=a, other_id=b, order_count=0) for a, b in permutations(basket, 2)],
+                ignore_conflicts=True,
+            )
+            touched += (
+                ProductCoPurchase.objects.filter(product_id__in=basket, other_id__in=basket)
+                .exclude(product_id=F("other_id"))
+                .update(order_count=F("order_count") + 1)
+            )
+    return touched
+
+
+def rebuild_co_purchases() -> int:
+    """Full recount from paid orders (reconciliation job). Returns the number of pairs."""
+    counts = Counter()
+    for basket in _paid_baskets():
+        counts.update(permutations(basket, 2))
+
+    with transaction.atomic():
+        ProductCoPurchase.objects.all().delete()
+        ProductCoPurchase.objects.bulk_create(
+            [ProductCoPurchase(product_id=a, other_id=b, order_count=n) for (a, b), n in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+# ---------- product page ----------
+
+def also_bought(product: Product, limit: int = ALSO_BOUGHT_LIMIT) -> List[Product]:
+    rows = (
+        ProductCoPurchase.objects.filter(product_id=product.pk, other__is_active=True)
+        .select_related("other__artisan__user")
+        .order_by("-order_count", "other_id")[:limit]
+    )
+    return [row.other for row in rows]
+
+
+def more_from_artisan(product: Product, exclude=(), limit: int = SAME_ARTISAN_LIMIT) -> List[Product]:
+    return list(
+        Product.objects.filter(artisan_id=product.artisan_id, is_active=True)
+        .exclude(pk__in=[product.pk, *exclude])
+        .order_by("-created_at")[:limit]
+    )
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .facets import (
+    facet_cell,
+    invalidate_categories,
+    merge_category_into_uncategorized,
+    move_product,
+    product_cell,
+)
+from .models import Category, Product
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_cell(sender, instance: Product, **kwargs):
+    instance._old_facet_cell = None
+    if instance.pk:
+        row = (
+            Product.objects.filter(pk=instance.pk)
+            .values_list("category_id", "price", "is_active", "rating_avg", "rating_count")
+            .first()
+        )
+        if row:
+            instance._old_facet_cell = facet_cell(*row)
+
+
+@receiver(post_save, sender=Product)
+def on_product_save(sender, instance: Product, **kwargs):
+    move_product(getattr(instance, "_old_facet_cell", None), product_cell(instance))
+
+
+@receiver(post_delete, sender=Product)
+def on_product_delete(sender, instance: Product, **kwargs):
+    move_product(product_cell(instance), None)
+
+
+@receiver(post_save, sender=Category)
+def on_category_save(sender, instance: Category, **kwargs):
+    invalidate_categories()
+
+
+@receiver(post_delete, sender=Category)
+def on_category_delete(sender, instance: Category, **kwargs):
+    merge_category_into_uncategorized(instance.pk)
+    invalidate_categories()
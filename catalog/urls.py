@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import product_list, product_detail, my_products, product_create, product_edit, product_image_add
+from .views import product_import, product_import_detail
 
 app_name = "catalog"
 
@@ -10,4 +11,6 @@ urlpatterns = [
     path("my/products/new/", product_create, name="product_create"),
     path("my/products/<int:pk>/edit/", product_edit, name="product_edit"),
     path("my/products/<int:pk>/images/add/", product_image_add, name="product_image_add"),
+    path("my/products/import/", product_import, name="product_import"),
+    path("my/products/import/<int:pk>/", product_import_detail, name="product_import_detail"),
 ]
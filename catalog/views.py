@@ -4,8 +4,10 @@ from django.shortcuts import get_object_or_404, redirect, render
 
 from accounts.models import User
 from artisans.models import ArtisanProfile
-from .forms import ProductForm, ProductImageForm
-from .models import Category, Product
+from .facets import apply_price_rating, cached_categories, facet_counts, parse_price, parse_rating
+from .forms import ProductForm, ProductImageForm, ProductImportForm
+from .models import Category, Product, ProductImportJob
+from .recommendations import also_bought, more_from_artisan
 
 
 def home(request):
@@ -28,13 +30,38 @@ def product_list(request):
     q = (request.GET.get("q") or "").strip()
     if q:
         qs = qs.filter(title__icontains=q)
+    search_qs = qs if q else None
 
+    categories = cached_categories()
     cat = request.GET.get("category")
+    selected_category = None
     if cat:
-        qs = qs.filter(category__slug=cat)
-
-    categories = Category.objects.order_by("name")
-    return render(request, "mart/catalog/product_list.html", {"products": qs, "categories": categories, "q": q, "cat": cat})
+        selected_category = next((c for c in categories if c.slug == cat), None)
+        qs = qs.filter(category_id=selected_category.id) if selected_category else qs.none()
+
+    price = parse_price(request.GET.get("price"))
+    rating = parse_rating(request.GET.get("rating"))
+    qs = apply_price_rating(qs, price, rating)
+
+    facets = facet_counts(
+        selected_category.id if selected_category else None,
+        price,
+        rating,
+        search_qs=search_qs,
+    )
+    return render(
+        request,
+        "mart/catalog/product_list.html",
+        {
+            "products": qs,
+            "categories": categories,
+            "q": q,
+            "cat": cat,
+            "price": price,
+            "rating": rating,
+            "facets": facets,
+        },
+    )
 
 
 def product_detail(request, pk: int):
@@ -45,8 +72,6 @@ def product_detail(request, pk: int):
     )
     from reviews.models import Review
     from orders.models import Order
-    from accounts.models import User
-    # return render(request, "catalog/product_detail.html", {"product": product})
     reviews = Review.objects.filter(product=product).select_related("user").order_by("-created_at")
 
     can_review = False
@@ -57,8 +82,14 @@ def product_detail(request, pk: int):
             items__product=product,
         ).exists()
 
-        return render(request,"mart/catalog/product_detail.html",{"product": product, "reviews": reviews, "can_review": can_review},
-        )
+    also = also_bought(product)
+    more = more_from_artisan(product, exclude=[p.pk for p in also if p.artisan_id == product.artisan_id])
+    return render(
+        request,
+        "mart/catalog/product_detail.html",
+        {"product": product, "reviews": reviews, "can_review": can_review, "also_bought": also, "more_from_artisan": more},
+    )
+
 
 def _require_artisan(request):
     if not (request.user.is_authenticated and request.user.role == User.Role.ARTISAN):
@@ -127,3 +158,29 @@ def product_image_add(request, pk: int):
             img.save()
 
     return redirect("catalog:product_edit", pk=product.pk)
+
+
+@login_required
+def product_import(request):
+    _require_artisan(request)
+    profile = get_object_or_404(ArtisanProfile, user=request.user)
+
+    if request.method == "POST":
+        form = ProductImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data["upload"]
+            job = ProductImportJob.objects.create(artisan=profile, upload=upload, original_name=upload.name[:255])
+            return redirect("catalog:product_import_detail", pk=job.pk)
+    else:
+        form = ProductImportForm()
+
+    jobs = profile.import_jobs.order_by("-created_at")[:20]
+    return render(request, "mart/catalog/product_import.html", {"form": form, "jobs": jobs})
+
+
+@login_required
+def product_import_detail(request, pk: int):
+    _require_artisan(request)
+    profile = get_object_or_404(ArtisanProfile, user=request.user)
+    job = get_object_or_404(ProductImportJob, pk=pk, artisan=profile)
+    return render(request, "mart/catalog/product_import_detail.html", {"job": job})
@@ -156,6 +156,16 @@ AUTH_USER_MODEL = "accounts.User"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    # uploads are stored once per unique content (core/storage.py)
+    "default": {"BACKEND": "core.storage.DedupStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# thumbnail/medium/WebP renditions of uploads (core/images.py)
+IMAGE_RENDITIONS_ASYNC = True  # False: resize inline during the request
+IMAGE_RENDITION_WORKERS = 2
+
 LOGIN_URL = "login"
 # LOGIN_REDIRECT_URL = "home"
 # LOGOUT_REDIRECT_URL = "home"
@@ -170,6 +180,11 @@ FLAT_SHIPPING_FEE = 60  # INR
 
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
+RAZORPAY_WEBHOOK_SECRET = os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
+RAZORPAY_BASE_URL = os.getenv("RAZORPAY_BASE_URL", "https://api.razorpay.com")  # e.g. http://127.0.0.1:8765 for `manage.py razorpay_stub`
+RAZORPAY_HTTP_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+RAZORPAY_HTTP_RETRIES = 2
+RAZORPAY_HTTP_POOL_SIZE = 10
 
 
 CACHES = {
@@ -178,3 +193,13 @@ CACHES = {
     }
 }
 
+# Token buckets shared by all workers on this host (see core/ratelimit.py)
+RATELIMIT_DB_PATH = BASE_DIR / "ratelimit.sqlite3"
+RATELIMITS = {  # scope: (burst, seconds per token)
+    "post": (1, 30),
+    "comment": (1, 10),
+    "report": (5, 120),
+    "cart": (30, 2),
+    "login": (5, 60),
+}
+
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import MediaBlob
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "ref_count", "created_at")
+    search_fields = ("name", "digest")
+    readonly_fields = ("name", "digest", "size", "ref_count", "created_at")
@@ -0,0 +1,30 @@
+"""
+Helpers shared by the SQLite FTS5 searches (feed.search, opportunities.search).
+
+build_match() turns user text into a safe MATCH expression; snippets are
+requested with HL_OPEN / HL_CLOSE as markers and turned into <mark> tags by
+highlight() after escaping.
+"""
+import re
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# control chars survive escape(), so user text can't forge <mark> tags
+HL_OPEN, HL_CLOSE = "\x02", "\x03"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match(q: str) -> str:
+    """
+    Turns free text into a safe FTS5 expression: every word quoted and
+    prefix-matched, implicitly ANDed ("clay pot" -> "clay"* "pot"*).
+    """
+    tokens = _TOKEN_RE.findall(q.lower())[:12]
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def highlight(snippet: str) -> str:
+    """An FTS5 snippet() marked with HL_OPEN / HL_CLOSE, as safe HTML with <mark> tags."""
+    return mark_safe(escape(snippet).replace(HL_OPEN, "<mark>").replace(HL_CLOSE, "</mark>"))
@@ -0,0 +1,213 @@
+"""
+Image renditions (thumbnail / medium, JPEG + WebP) for every uploaded ImageField.
+
+Each registered field `<name>` has a sibling JSONField `<name>_renditions`:
+
+    {"src": "<original name>", "width": 3000, "height": 2000,
+     "variants": {"thumb": {"name": ..., "width": 320, "height": 213}, ...}}
+
+After a model with a new/changed image is committed, the resize runs in a
+process pool (core.imaging, Pillow only) and the result is written back with a
+queryset UPDATE, so no save signals re-fire. Templates read the JSON through
+the `images` template tags; an image without renditions yet falls back to the
+original URL. `manage.py build_image_renditions` backfills existing media.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from posixpath import splitext
+from typing import Dict, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+
+from .imaging import render_variants
+
+logger = logging.getLogger(__name__)
+
+# "app_label.Model": [image field names]; each needs a `<field>_renditions` JSONField
+IMAGE_FIELDS = {
+    "feed.PostImage": ["image"],
+    "catalog.Product": ["main_image"],
+    "catalog.ProductImage": ["image"],
+    "artisans.ArtisanProfile": ["profile_photo", "cover_photo"],
+    "artisans.ArtisanGalleryImage": ["image"],
+}
+
+RENDITIONS_DIR = "renditions"
+
+
+def renditions_attr(field_name: str) -> str:
+    return f"{field_name}_renditions"
+
+
+def rendition_name(src: str, variant: str, ext: str) -> str:
+    # "posts/a.jpg" + ("thumb_webp", "webp") -> "renditions/posts/a.thumb.webp"
+    stem, _ = splitext(src)
+    size = variant.split("_", 1)[0]
+    return f"{RENDITIONS_DIR}/{stem}.{size}.{ext}"
+
+
+# ---------- worker pool ----------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: the web process is multi-threaded and holds DB connections
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.IMAGE_RENDITION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+# ---------- storing results ----------
+
+def _delete_files(meta: Optional[dict]) -> None:
+    for variant in (meta or {}).get("variants", {}).values():
+        try:
+            default_storage.delete(variant["name"])
+        except OSError:
+            pass
+
+
+def _store_variants(src: str, result: Dict) -> dict:
+    variants = {}
+    for name, (data, ext, width, height) in result["variants"].items():
+        saved = default_storage.save(rendition_name(src, name, ext), ContentFile(data))
+        variants[name] = {"name": saved, "width": width, "height": height}
+    return {"src": src, "width": result["width"], "height": result["height"], "variants": variants}
+
+
+def save_renditions(label: str, pk, field_name: str, src: str, result: Optional[Dict], error: str = "") -> bool:
+    """
+    Writes rendition files + metadata for (label, pk, field_name). Only applied
+    if the row still points at `src`; otherwise a newer upload won and the
+    files just written are removed again. The row's previous rendition files
+    are released. Returns True if the row was updated.
+    """
+    model = apps.get_model(label)
+    meta = {"src": src, "error": error} if result is None else _store_variants(src, result)
+    attr = renditions_attr(field_name)
+
+    qs = model._base_manager.filter(pk=pk, **{field_name: src})
+    old = qs.values_list(attr, flat=True).first()
+    updated = qs.update(**{attr: meta})
+    if not updated:
+        _delete_files(meta)
+        return False
+    # release the previous set only now; with DedupStorage an identical rebuild
+    # got the same names back, so this nets the reference counts out
+    _delete_files(old)
+    return True
+
+
+def _finish(label: str, pk, field_name: str, src: str, future) -> None:
+    # runs on the executor's result thread: it gets its own DB connection
+    try:
+        try:
+            result, error = future.result(), ""
+        except Exception as exc:  # corrupt upload, decompression bomb, dead worker...
+            logger.warning("Rendition failed for %s %s.%s (%s): %s", label, pk, field_name, src, exc)
+            result, error = None, str(exc)[:200]
+        save_renditions(label, pk, field_name, src, result, error)
+    except Exception:
+        logger.exception("Could not store renditions for %s %s.%s", label, pk, field_name)
+    finally:
+        close_old_connections()
+
+
+def build_now(label: str, pk, field_name: str, src: str) -> bool:
+    """Synchronous version (used when IMAGE_RENDITIONS_ASYNC is off)."""
+    try:
+        with default_storage.open(src, "rb") as fh:
+            result, error = render_variants(fh.read()), ""
+    except Exception as exc:
+        result, error = None, str(exc)[:200]
+    return save_renditions(label, pk, field_name, src, result, error)
+
+
+def schedule(label: str, pk, field_name: str, src: str) -> None:
+    if not settings.IMAGE_RENDITIONS_ASYNC:
+        build_now(label, pk, field_name, src)
+        return
+    try:
+        with default_storage.open(src, "rb") as fh:
+            data = fh.read()
+    except OSError as exc:
+        logger.warning("Cannot read %s for renditions: %s", src, exc)
+        return
+    future = get_pool().submit(render_variants, data)
+    future.add_done_callback(partial(_finish, label, pk, field_name, src))
+
+
+# ---------- signals ----------
+
+def _on_image_model_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field_name in IMAGE_FIELDS[sender._meta.label]:
+        file = getattr(instance, field_name)
+        meta = getattr(instance, renditions_attr(field_name)) or {}
+        src = file.name or ""
+        if src == meta.get("src", ""):
+            continue
+        if not src:
+            # image cleared
+            sender._base_manager.filter(pk=instance.pk).update(**{renditions_attr(field_name): {}})
+            transaction.on_commit(partial(_delete_files, meta))
+            continue
+        transaction.on_commit(partial(schedule, sender._meta.label, instance.pk, field_name, src))
+
+
+def _on_image_model_deleted(sender, instance, **kwargs):
+    for field_name in IMAGE_FIELDS[sender._meta.label]:
+        transaction.on_commit(partial(_delete_files, getattr(instance, renditions_attr(field_name))))
+
+
+def connect_signals() -> None:
+    for label in IMAGE_FIELDS:
+        model = apps.get_model(label)
+        post_save.connect(_on_image_model_saved, sender=model, dispatch_uid=f"core.images.save.{label}")
+        post_delete.connect(_on_image_model_deleted, sender=model, dispatch_uid=f"core.images.delete.{label}")
+
+
+# ---------- template helpers ----------
+
+def renditions(fieldfile) -> dict:
+    """Rendition metadata for a FieldFile, or {} if none (yet / stale)."""
+    if not fieldfile:
+        return {}
+    meta = getattr(fieldfile.instance, renditions_attr(fieldfile.field.name), None) or {}
+    if meta.get("src") != fieldfile.name or not meta.get("variants"):
+        return {}
+    return meta
+
+
+def srcset(fieldfile, webp: bool = False) -> str:
+    meta = renditions(fieldfile)
+    if not meta:
+        return ""
+    suffix = "_webp" if webp else ""
+    candidates = []
+    for size in ("thumb", "medium"):
+        v = meta["variants"].get(size + suffix)
+        # small originals give thumb == medium; list each width once
+        if v and all(w != v["width"] for _, w in candidates):
+            candidates.append((default_storage.url(v["name"]), v["width"]))
+    # JPEG set also offers the original when it is larger than every variant
+    if not webp and meta["width"] > max((w for _, w in candidates), default=0):
+        candidates.append((fieldfile.url, meta["width"]))
+    return ", ".join(f"{url} {width}w" for url, width in candidates)
@@ -0,0 +1,60 @@
+"""
+Pillow-only image resizing, run inside worker processes (see core/images.py).
+
+Deliberately free of Django imports so spawned pool workers start fast and
+never touch the database: bytes in, bytes out.
+"""
+from io import BytesIO
+from typing import Dict, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+# name, max width, format, extension, quality
+VARIANTS: Sequence[Tuple[str, int, str, str, int]] = (
+    ("thumb", 320, "JPEG", "jpg", 78),
+    ("thumb_webp", 320, "WEBP", "webp", 75),
+    ("medium", 960, "JPEG", "jpg", 80),
+    ("medium_webp", 960, "WEBP", "webp", 78),
+)
+
+
+def _flatten(im: Image.Image) -> Image.Image:
+    """JPEG has no alpha: composite transparent images onto white."""
+    if im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+        rgba = im.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return im.convert("RGB")
+
+
+def render_variants(data: bytes, variants=VARIANTS) -> Dict:
+    """
+    Returns {"width", "height", "variants": {name: (bytes, ext, width, height)}}
+    for an encoded image. Never upscales: a variant wider than the original is
+    encoded at the original size. Raises on unreadable or oversized images.
+    """
+    with Image.open(BytesIO(data)) as src:
+        im = ImageOps.exif_transpose(src)
+        im.load()
+    width, height = im.size
+
+    out = {}
+    resized = {}
+    for name, max_width, fmt, ext, quality in variants:
+        target_w = min(max_width, width)
+        target_h = max(1, round(height * target_w / width))
+        if target_w not in resized:
+            resized[target_w] = im if target_w == width else im.resize((target_w, target_h), Image.LANCZOS)
+        frame = resized[target_w]
+
+        buf = BytesIO()
+        if fmt == "JPEG":
+            _flatten(frame).save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+        else:
+            if frame.mode not in ("RGB", "RGBA"):
+                frame = frame.convert("RGBA" if "A" in frame.getbands() or "transparency" in frame.info else "RGB")
+            frame.save(buf, fmt, quality=quality, method=4)
+        out[name] = (buf.getvalue(), ext, target_w, target_h)
+
+    return {"width": width, "height": height, "variants": out}
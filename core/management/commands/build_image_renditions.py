@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imaging import render_variants
+from core.images import IMAGE_FIELDS, renditions_attr, save_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail/medium/WebP renditions for existing uploads, in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--model", action="append", help="Limit to e.g. catalog.Product (repeatable).")
+        parser.add_argument("--force", action="store_true", help="Rebuild even if renditions are up to date.")
+        parser.add_argument("--retry-failed", action="store_true", help="Retry images whose last attempt failed.")
+
+    def _pending(self, labels, force, retry_failed):
+        for label in labels:
+            model = apps.get_model(label)
+            for field_name in IMAGE_FIELDS[label]:
+                attr = renditions_attr(field_name)
+                rows = model._base_manager.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+                for pk, src, meta in rows.values_list("pk", field_name, attr).iterator(chunk_size=500):
+                    meta = meta or {}
+                    up_to_date = meta.get("src") == src and (meta.get("variants") or not retry_failed)
+                    if force or not up_to_date:
+                        yield label, pk, field_name, src
+
+    def handle(self, *args, **options):
+        labels = options["model"] or list(IMAGE_FIELDS)
+        unknown = set(labels) - set(IMAGE_FIELDS)
+        if unknown:
+            raise CommandError(f"Not an image model: {', '.join(sorted(unknown))}")
+
+        done = failed = missing = 0
+        window = options["workers"] * 2  # bound memory: only this many images in flight
+        in_flight = {}
+
+        def collect(futures):
+            nonlocal done, failed
+            for future in futures:
+                label, pk, field_name, src = in_flight.pop(future)
+                try:
+                    result, error = future.result(), ""
+                except Exception as exc:
+                    result, error = None, str(exc)[:200]
+                    failed += 1
+                    self.stderr.write(f"{label} {pk}.{field_name} ({src}): {exc}")
+                save_renditions(label, pk, field_name, src, result, error)
+                done += result is not None
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            for job in self._pending(labels, options["force"], options["retry_failed"]):
+                try:
+                    with default_storage.open(job[3], "rb") as fh:
+                        data = fh.read()
+                except OSError:
+                    missing += 1
+                    continue
+                in_flight[pool.submit(render_variants, data)] = job
+                if len(in_flight) >= window:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+        self.stdout.write(self.style.SUCCESS(f"Renditions built: {done}, failed: {failed}, missing files: {missing}"))
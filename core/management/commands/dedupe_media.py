@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.media import dedupe_legacy_files, reconcile_media_refs
+
+
+class Command(BaseCommand):
+    help = "Fold files uploaded before DedupStorage into content-addressed blobs and rewrite their rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report how much dedup would save.")
+        parser.add_argument("--keep-originals", action="store_true", help="Leave the legacy files on disk.")
+
+    def handle(self, *args, **options):
+        stats = dedupe_legacy_files(
+            dry_run=options["dry_run"],
+            keep_originals=options["keep_originals"],
+            log=self.stderr.write,
+        )
+        if options["dry_run"]:
+            saved = stats.get("bytes", 0) - stats.get("unique_bytes", 0)
+            self.stdout.write(
+                f"{stats.get('files', 0)} legacy file reference(s), {stats.get('unique_files', 0)} unique; "
+                f"dedup would free {saved / 1048576:.1f} MiB. Missing: {stats.get('missing', 0)}"
+            )
+            return
+
+        repaired, removed, registered = reconcile_media_refs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Adopted {stats.get('adopted', 0)} file(s) ({stats.get('files', 0)} references), "
+                f"missing {stats.get('missing', 0)}; ref counts repaired {repaired}, "
+                f"unreferenced blobs removed {removed}, registered {registered}."
+            )
+        )
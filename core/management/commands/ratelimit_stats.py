@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.ratelimit import get_store
+
+
+class Command(BaseCommand):
+    help = "Show allowed/rejected counts per rate-limit scope; optionally reset them or prune idle buckets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing them.")
+        parser.add_argument("--prune", action="store_true", help="Delete buckets idle for longer than a day.")
+
+    def handle(self, *args, **options):
+        store = get_store()
+        rows = store.stats()
+        if not rows:
+            self.stdout.write("No rate-limited requests recorded.")
+        for scope, allowed, rejected, last_rejected in rows:
+            burst, per = settings.RATELIMITS.get(scope, ("?", "?"))
+            total = allowed + rejected
+            pct = 100.0 * rejected / total if total else 0.0
+            last = datetime.fromtimestamp(last_rejected).isoformat(timespec="seconds") if last_rejected else "-"
+            self.stdout.write(
+                f"{scope:<10} burst={burst} every={per}s  allowed={allowed} rejected={rejected} ({pct:.1f}%)  last_rejected={last}"
+            )
+
+        if options["prune"]:
+            self.stdout.write(f"Pruned {store.prune(older_than=86400)} idle bucket(s).")
+        if options["reset"]:
+            store.reset_stats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,25 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.media import reconcile_media_refs, stray_blob_files
+
+
+class Command(BaseCommand):
+    help = "Recount MediaBlob references from the database and remove unreferenced blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--stray", action="store_true", help="Also delete blob files that have no MediaBlob row.")
+
+    def handle(self, *args, **options):
+        repaired, removed, registered = reconcile_media_refs(dry_run=options["dry_run"])
+        verb = "Would repair" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            f"{verb} {repaired} ref count(s); unreferenced blobs: {removed}; unregistered referenced blobs: {registered}."
+        )
+        if options["stray"]:
+            stray = stray_blob_files()
+            if not options["dry_run"]:
+                for name in stray:
+                    default_storage.delete_blob_file(name)
+            self.stdout.write(f"Stray blob files: {len(stray)}")
@@ -0,0 +1,242 @@
+"""
+Reference bookkeeping for core.storage.DedupStorage.
+
+Storage.save() adds a reference and storage.delete() drops one; these signal
+handlers make model rows do the latter when a file is replaced or its row is
+deleted (after commit, so a rollback never loses a file). Code that copies an
+existing name onto another row without saving bytes must call
+core.storage.retain(name) itself.
+
+reconcile_media_refs() recounts every blob from the database (file fields and
+rendition metadata) and removes unreferenced blobs; dedupe_legacy_files() is
+the one-off migration of files uploaded before DedupStorage.
+"""
+import hashlib
+import os
+from collections import Counter, defaultdict
+from functools import partial
+from typing import Dict, List, Tuple
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .images import IMAGE_FIELDS, renditions_attr
+from .storage import BLOB_DIR, DedupStorage, is_blob
+
+
+def dedup_file_fields() -> Dict[type, List[str]]:
+    """{model: [file field names]} for every concrete FileField on DedupStorage."""
+    found = defaultdict(list)
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and isinstance(field.storage, DedupStorage):
+                found[model].append(field.name)
+    return dict(found)
+
+
+def _release(storage, name: str) -> None:
+    if is_blob(name):
+        storage.delete(name)
+
+
+# ---------- signals ----------
+
+def _remember_files(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._stored_file_names = {}
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    fields = _FIELDS.get(sender, [])
+    if update_fields is not None:
+        fields = [f for f in fields if f in update_fields]
+    if not fields:
+        return
+    row = sender._base_manager.filter(pk=instance.pk).values(*fields).first()
+    instance._stored_file_names = row or {}
+
+
+def _release_replaced(sender, instance, raw=False, **kwargs):
+    old_names = getattr(instance, "_stored_file_names", None) or {}
+    for field_name in _FIELDS.get(sender, []):
+        old = old_names.get(field_name)
+        new = getattr(instance, field_name).name or ""
+        if old and old != new:
+            storage = sender._meta.get_field(field_name).storage
+            transaction.on_commit(partial(_release, storage, old))
+
+
+def _release_deleted(sender, instance, **kwargs):
+    for field_name in _FIELDS.get(sender, []):
+        name = getattr(instance, field_name).name
+        if name:
+            storage = sender._meta.get_field(field_name).storage
+            transaction.on_commit(partial(_release, storage, name))
+
+
+_FIELDS: Dict[type, List[str]] = {}
+
+
+def connect_signals() -> None:
+    _FIELDS.clear()
+    _FIELDS.update(dedup_file_fields())
+    for model in _FIELDS:
+        uid = f"core.media.{model._meta.label}"
+        pre_save.connect(_remember_files, sender=model, dispatch_uid=f"{uid}.pre_save")
+        post_save.connect(_release_replaced, sender=model, dispatch_uid=f"{uid}.post_save")
+        post_delete.connect(_release_deleted, sender=model, dispatch_uid=f"{uid}.post_delete")
+
+
+# ---------- reconciliation ----------
+
+def referenced_names() -> Counter:
+    """How many times each stored name is referenced by rows (files + renditions)."""
+    refs = Counter()
+    for model, fields in dedup_file_fields().items():
+        for name in model._base_manager.values_list(*fields).iterator(chunk_size=2000):
+            refs.update(n for n in name if n)
+
+    for label, fields in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        attrs = [renditions_attr(f) for f in fields]
+        for metas in model._base_manager.values_list(*attrs).iterator(chunk_size=2000):
+            for meta in metas:
+                for variant in (meta or {}).get("variants", {}).values():
+                    refs[variant["name"]] += 1
+    return refs
+
+
+def reconcile_media_refs(dry_run: bool = False) -> Tuple[int, int, int]:
+    """
+    Sets every MediaBlob.ref_count from real references, deletes blobs nobody
+    references and registers referenced blob files that have no row.
+    Returns (repaired, removed, registered).
+    """
+    from .models import MediaBlob
+
+    refs = {name: n for name, n in referenced_names().items() if is_blob(name)}
+    repaired = removed = registered = 0
+
+    drifted = []
+    orphans = []
+    for blob in MediaBlob.objects.iterator(chunk_size=2000):
+        actual = refs.pop(blob.name, 0)
+        if actual == 0:
+            orphans.append(blob)
+        elif actual != blob.ref_count:
+            blob.ref_count = actual
+            drifted.append(blob)
+    repaired = len(drifted)
+    removed = len(orphans)
+
+    missing_rows = [(name, n) for name, n in refs.items() if default_storage.exists(name)]
+    registered = len(missing_rows)
+    if dry_run:
+        return repaired, removed, registered
+
+    MediaBlob.objects.bulk_update(drifted, ["ref_count"], batch_size=500)
+    for blob in orphans:
+        with transaction.atomic():
+            if MediaBlob.objects.filter(pk=blob.pk, ref_count=blob.ref_count).delete()[0]:
+                default_storage.delete_blob_file(blob.name)
+    for name, n in missing_rows:
+        digest = os.path.splitext(os.path.basename(name))[0]
+        MediaBlob.objects.get_or_create(
+            name=name, defaults={"digest": digest, "size": default_storage.size(name), "ref_count": n}
+        )
+    return repaired, removed, registered
+
+
+def stray_blob_files() -> List[str]:
+    """Files under blobs/ with no MediaBlob row (e.g. left by a rolled-back save)."""
+    from .models import MediaBlob
+
+    known = set(MediaBlob.objects.values_list("name", flat=True))
+    root = default_storage.path(BLOB_DIR)
+    stray = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            name = os.path.relpath(os.path.join(dirpath, filename), default_storage.location).replace(os.sep, "/")
+            if name not in known:
+                stray.append(name)
+    return stray
+
+
+# ---------- one-off migration ----------
+
+def dedupe_legacy_files(dry_run: bool = False, keep_originals: bool = False, log=print) -> dict:
+    """
+    Moves every pre-DedupStorage file (and its renditions) into blob storage,
+    rewriting the row's names with queryset UPDATEs. Legacy files are deleted
+    at the end unless `keep_originals`. With `dry_run` only reports what
+    dedup would save.
+    """
+    storage = default_storage
+    stats = Counter()
+    seen_digests = {}
+    legacy = set()
+
+    def adopt(name: str, adopted: dict) -> str:
+        stats["files"] += 1
+        stats["bytes"] += storage.size(name)
+        if dry_run:
+            with storage.open(name, "rb") as fh:
+                digest = hashlib.sha256()
+                for chunk in fh.chunks():
+                    digest.update(chunk)
+            key = (digest.hexdigest(), os.path.splitext(name)[1].lower())
+            if key not in seen_digests:
+                seen_digests[key] = storage.size(name)
+            return name
+        new = storage.adopt(name)
+        adopted[name] = new
+        return new
+
+    for model, fields in dedup_file_fields().items():
+        label = model._meta.label
+        rendition_fields = IMAGE_FIELDS.get(label, [])
+        for field_name in fields:
+            attr = renditions_attr(field_name) if field_name in rendition_fields else None
+            columns = ["pk", field_name] + ([attr] if attr else [])
+            rows = model._base_manager.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            for row in rows.values_list(*columns).iterator(chunk_size=500):
+                pk, name = row[0], row[1]
+                meta = row[2] if attr else None
+                if is_blob(name):
+                    continue
+                if not storage.exists(name):
+                    stats["missing"] += 1
+                    log(f"missing: {label} {pk}.{field_name} -> {name}")
+                    continue
+
+                adopted = {}  # legacy name -> blob name, for this row
+                updates = {field_name: adopt(name, adopted)}
+                if meta and meta.get("src") == name:
+                    meta = dict(meta, src=updates[field_name])
+                    for variant in meta.get("variants", {}).values():
+                        if not is_blob(variant["name"]) and storage.exists(variant["name"]):
+                            variant["name"] = adopt(variant["name"], adopted)
+                    updates[attr] = meta
+                if dry_run:
+                    continue
+                if model._base_manager.filter(pk=pk, **{field_name: name}).update(**updates):
+                    legacy.update(adopted)
+                else:
+                    # the row changed meanwhile: drop the blob references taken for it
+                    # and leave its legacy files alone
+                    for new in adopted.values():
+                        storage.delete(new)
+                    stats["changed"] += 1
+                    log(f"changed meanwhile, skipped: {label} {pk}.{field_name}")
+
+    if dry_run:
+        stats["unique_files"] = len(seen_digests)
+        stats["unique_bytes"] = sum(seen_digests.values())
+        return dict(stats)
+
+    if not keep_originals:
+        for name in legacy:
+            storage.delete(name)  # non-blob names: plain file delete
+    stats["adopted"] = len(legacy)
+    return dict(stats)
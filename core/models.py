@@ -1,3 +1,17 @@
 from django.db import models
 
-# Create your models here.
+
+class MediaBlob(models.Model):
+    """
+    One stored file of core.storage.DedupStorage, named by its SHA-256.
+    ref_count = number of references (saves minus deletes); the file is removed
+    when it drops to zero. Repaired by `manage.py reconcile_media_refs`.
+    """
+    name = models.CharField(max_length=255, unique=True)  # blobs/ab/cd/<sha256><ext>
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} (refs={self.ref_count})"
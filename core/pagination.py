@@ -0,0 +1,145 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is addressed by the ordering key of its first/last row instead of an
+OFFSET, so page 500 costs the same index range scan as page 1 and rows
+inserted while someone is paging do not shift what they see.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+def _split(ordering: Sequence[str]) -> List[Tuple[str, bool]]:
+    """["-created_at", "-id"] -> [("created_at", True), ("id", True)]"""
+    return [(o.lstrip("-"), o.startswith("-")) for o in ordering]
+
+
+def _flip(ordering: Sequence[str]) -> List[str]:
+    return [o[1:] if o.startswith("-") else f"-{o}" for o in ordering]
+
+
+def _row_value(row, name: str):
+    if isinstance(row, dict):
+        return row[name]
+    return getattr(row, name)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if hasattr(v, "isoformat") else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_values(token: str, length: int) -> Optional[list]:
+    """Raw JSON values stored in `token`, or None if it is malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def decode_cursor(model, keys: List[Tuple[str, bool]], token: str) -> Optional[list]:
+    """
+    Returns the key values stored in `token`, converted with each model field's
+    to_python(). Anything malformed or tampered with decodes to None (first page).
+    """
+    values = decode_values(token, len(keys))
+    if values is None:
+        return None
+    try:
+        return [model._meta.get_field(name).to_python(v) for (name, _), v in zip(keys, values)]
+    except (FieldDoesNotExist, ValidationError):
+        return None
+
+
+def _seek(keys: List[Tuple[str, bool]], values: list, forward: bool) -> Q:
+    """
+    Row-value comparison "rows after `values` in this ordering", spelled out
+    for SQLite:  a < va OR (a = va AND (b < vb OR ...)).
+    The leading a <= va bound lets the planner use an index range scan.
+    """
+    q = None
+    for (name, desc), value in reversed(list(zip(keys, values))):
+        op = "lt" if desc == forward else "gt"
+        strict = Q(**{f"{name}__{op}": value})
+        q = strict if q is None else strict | (Q(**{name: value}) & q)
+
+    name, desc = keys[0]
+    bound = Q(**{f"{name}__{'lte' if desc == forward else 'gte'}": values[0]})
+    return bound & q
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+
+def paginate_keyset(qs, ordering: Sequence[str], after: str = "", before: str = "", per_page: int = 20) -> KeysetPage:
+    """
+    Slice `qs` by keyset. `ordering` must end in a unique column (usually "id"
+    / "-id") so every cursor points at exactly one row.
+
+    `after` returns the page following that cursor, `before` the page preceding
+    it; with neither (or an invalid cursor) the first page is returned.
+    """
+    keys = _split(ordering)
+    model = qs.model
+
+    def cursor(row) -> str:
+        return encode_cursor([_row_value(row, name) for name, _ in keys])
+
+    before_values = decode_cursor(model, keys, before)
+    if before_values is not None:
+        rows = list(qs.filter(_seek(keys, before_values, forward=False)).order_by(*_flip(ordering))[: per_page + 1])
+        more_before = len(rows) > per_page
+        rows = rows[:per_page]
+        rows.reverse()
+        if rows:
+            return KeysetPage(
+                object_list=rows,
+                next_cursor=cursor(rows[-1]),
+                prev_cursor=cursor(rows[0]) if more_before else None,
+            )
+        # nothing before that cursor any more: fall through to the first page
+
+    after_values = decode_cursor(model, keys, after) if before_values is None else None
+    if after_values is not None:
+        qs = qs.filter(_seek(keys, after_values, forward=True))
+
+    rows = list(qs.order_by(*ordering)[: per_page + 1])
+    more_after = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=cursor(rows[-1]) if more_after else None,
+        prev_cursor=cursor(rows[0]) if (after_values is not None and rows) else None,
+    )
@@ -0,0 +1,218 @@
+"""
+Token-bucket rate limiting shared by every worker process on the host.
+
+Buckets live in a small standalone SQLite file (settings.RATELIMIT_DB_PATH),
+not in the per-process LocMemCache, so N gunicorn workers enforce one limit
+between them. Each take() is a single BEGIN IMMEDIATE transaction, which makes
+the read-refill-write of a bucket atomic across processes.
+
+Scopes are configured in settings.RATELIMITS as
+    scope: (burst, seconds_per_token)
+e.g. ("post": (1, 30)) allows one post, then one more every 30 seconds.
+
+Allowed/rejected totals per scope are kept in the same file; see
+`manage.py ratelimit_stats`.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    scope TEXT PRIMARY KEY,
+    allowed INTEGER NOT NULL DEFAULT 0,
+    rejected INTEGER NOT NULL DEFAULT 0,
+    last_rejected REAL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    retry_after: float = 0.0  # seconds until one token is available
+
+
+class BucketStore:
+    """Thread-safe handle on the SQLite bucket file (one connection per thread)."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid != os.getpid():
+            conn = None  # inherited across fork (e.g. preloaded gunicorn); never share it
+        if conn is None:
+            # autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, scope: str, key: str, burst: int, seconds_per_token: float, cost: float = 1.0) -> Decision:
+        conn = self._conn()
+        now = time.time()
+        rate = 1.0 / seconds_per_token
+        bucket_key = f"{scope}:{key}"
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (bucket_key,)).fetchone()
+            tokens = float(burst) if row is None else min(float(burst), row[0] + max(0.0, now - row[1]) * rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT INTO bucket (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (bucket_key, tokens, now),
+            )
+            conn.execute(
+                "INSERT INTO stats (scope, allowed, rejected, last_rejected) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET allowed = allowed + excluded.allowed, "
+                "rejected = rejected + excluded.rejected, "
+                "last_rejected = COALESCE(excluded.last_rejected, last_rejected)",
+                (scope, int(allowed), int(not allowed), None if allowed else now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return Decision(allowed=allowed, retry_after=0.0 if allowed else (cost - tokens) / rate)
+
+    def stats(self) -> list:
+        rows = self._conn().execute("SELECT scope, allowed, rejected, last_rejected FROM stats ORDER BY scope")
+        return rows.fetchall()
+
+    def reset_stats(self) -> None:
+        self._conn().execute("DELETE FROM stats")
+
+    def prune(self, older_than: float) -> int:
+        """Drops buckets idle for `older_than` seconds (they would be full again anyway)."""
+        cur = self._conn().execute("DELETE FROM bucket WHERE updated < ?", (time.time() - older_than,))
+        return cur.rowcount
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> BucketStore:
+    global _store
+    path = str(settings.RATELIMIT_DB_PATH)
+    if _store is None or _store.path != path:
+        with _store_lock:
+            if _store is None or _store.path != path:
+                _store = BucketStore(path)
+    return _store
+
+
+def take(scope: str, key: str, cost: float = 1.0) -> Decision:
+    """
+    Consumes `cost` tokens from the (scope, key) bucket. If the store is
+    unavailable the request is allowed: a broken limiter must not take the
+    site down with it.
+    """
+    burst, seconds_per_token = settings.RATELIMITS[scope]
+    try:
+        decision = get_store().take(scope, key, burst, seconds_per_token, cost)
+    except sqlite3.Error:
+        logger.exception("Rate limit store unavailable; allowing %s for %s", scope, key)
+        return Decision(allowed=True)
+    if not decision.allowed:
+        logger.info("Rate limited %s for %s (retry in %.1fs)", scope, key, decision.retry_after)
+    return decision
+
+
+# ---------- keys ----------
+
+def client_ip(request) -> str:
+    return request.META.get("REMOTE_ADDR", "") or "unknown"
+
+
+def user_or_ip(request) -> str:
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{client_ip(request)}"
+
+
+def login_key(request) -> str:
+    # per address and username: slows guessing on one account without locking
+    # out everyone else behind the same NAT
+    username = (request.POST.get("username") or "").strip().lower()
+    return f"ip:{client_ip(request)}:{username}"
+
+
+# ---------- decorator ----------
+
+def ratelimit(
+    scope: str,
+    key: Callable = user_or_ip,
+    methods=("POST",),
+    message: str = "Slow down — please wait a bit and try again.",
+    redirect_to: Optional[str] = None,
+    authenticated_only: bool = False,
+):
+    """
+    View decorator. Requests with a method in `methods` take one token from
+    the `scope` bucket of `key(request)`; when it is empty the view is skipped
+    and the user is sent back (to `redirect_to`, or the same URL) with
+    `message`, plus a Retry-After header. With authenticated_only, anonymous
+    requests pass through without a token (for views that send them to login
+    anyway, so they cannot drain a shared per-IP bucket).
+    """
+    if scope not in settings.RATELIMITS:
+        raise KeyError(f"No rate configured for scope {scope!r} in settings.RATELIMITS")
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method in methods and (request.user.is_authenticated or not authenticated_only):
+                decision = take(scope, key(request))
+                if not decision.allowed:
+                    messages.error(request, message)
+                    response = redirect(redirect_to or request.path)
+                    response["Retry-After"] = str(int(decision.retry_after) + 1)
+                    return response
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
+
+
+post_ratelimit = ratelimit("post", message="Slow down — please wait a bit before creating another post.")
+comment_ratelimit = ratelimit(
+    "comment", message="Please wait a few seconds before commenting again.", authenticated_only=True
+)
+report_ratelimit = ratelimit("report", message="You are sending reports too quickly. Please wait a moment.")
+cart_ratelimit = ratelimit("cart", message="Too many cart updates. Please wait a moment.", redirect_to="cart:detail")
+login_ratelimit = ratelimit("login", key=login_key, message="Too many login attempts. Please wait a minute and try again.")
@@ -0,0 +1,111 @@
+"""
+Content-addressed media storage.
+
+Every upload is hashed while it streams to a temp file and stored once as
+blobs/<aa>/<bb>/<sha256><ext>; saving identical bytes again (the same photo
+on a product, a gallery and a post) just returns the existing name and bumps
+MediaBlob.ref_count. delete() drops one reference and removes the file with
+the last one. Names written before the switch (products/main/x.jpg, ...) keep
+working as plain files until `manage.py dedupe_media` folds them in.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+BLOB_DIR = "blobs"
+INCOMING_DIR = ".incoming"
+
+
+def blob_name(digest: str, ext: str) -> str:
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}"
+
+
+def is_blob(name: str) -> bool:
+    return bool(name) and name.startswith(f"{BLOB_DIR}/")
+
+
+def retain(name: str, digest: str = "", size: int = 0, count: int = 1) -> None:
+    """Adds `count` references to a blob row, creating it if needed."""
+    from .models import MediaBlob
+
+    if MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + count):
+        return
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(name=name, digest=digest, size=size, ref_count=count)
+    except IntegrityError:
+        MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + count)
+
+
+class DedupStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        # the final name is the digest, chosen in _save(); never suffix it
+        return name
+
+    def _hash_to_temp(self, content):
+        incoming = os.path.join(self.location, INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            for chunk in content.chunks():
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        return tmp_path, digest.hexdigest(), size
+
+    def _place(self, tmp_path: str, name: str) -> None:
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            return
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        os.replace(tmp_path, full_path)  # atomic: same filesystem as .incoming
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+    def _store(self, tmp_path: str, digest: str, size: int, ext: str) -> str:
+        try:
+            name = blob_name(digest, ext)
+            # reference first, file second: a concurrent delete() of the last
+            # reference holds the same row lock, so it can't unlink in between
+            with transaction.atomic():
+                retain(name, digest, size)
+                self._place(tmp_path, name)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return name
+
+    def _save(self, name, content):
+        tmp_path, digest, size = self._hash_to_temp(content)
+        return self._store(tmp_path, digest, size, os.path.splitext(name)[1])
+
+    def adopt(self, legacy_name: str) -> str:
+        """
+        Folds an existing non-blob file into blob storage (one new reference)
+        and returns its blob name. The legacy file itself is left in place.
+        """
+        with self.open(legacy_name, "rb") as fh:
+            tmp_path, digest, size = self._hash_to_temp(fh)
+        return self._store(tmp_path, digest, size, os.path.splitext(legacy_name)[1])
+
+    def delete(self, name):
+        if not is_blob(name):
+            return super().delete(name)
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            MediaBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+            if MediaBlob.objects.filter(name=name, ref_count=0).delete()[0]:
+                super().delete(name)
+
+    def delete_blob_file(self, name: str) -> None:
+        """Removes a blob file regardless of references (reconciliation only)."""
+        super().delete(name)
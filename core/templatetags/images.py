@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core import images
+
+register = template.Library()
+
+
+@register.filter(name="srcset")
+def srcset(fieldfile):
+    """{{ img.image|srcset }} -> "…thumb.jpg 320w, …medium.jpg 960w, …orig.jpg 2400w" (or "")."""
+    return images.srcset(fieldfile)
+
+
+@register.filter(name="webp_srcset")
+def webp_srcset(fieldfile):
+    return images.srcset(fieldfile, webp=True)
+
+
+@register.simple_tag
+def picture(fieldfile, alt="", css_class="", sizes="100vw", loading="lazy", width=None, height=None, style=""):
+    """
+    <picture> with a WebP source and a JPEG srcset, plus intrinsic width/height
+    so the layout doesn't jump. Falls back to a plain <img> of the original
+    until renditions exist. Usage:
+        {% picture p.main_image alt=p.title css_class="card-img-top" sizes="(max-width: 768px) 100vw, 33vw" %}
+    """
+    if not fieldfile:
+        return ""
+    meta = images.renditions(fieldfile)
+    attrs = {"alt": alt, "class": css_class, "style": style, "loading": loading, "decoding": "async"}
+    if meta:
+        attrs.update(
+            src=images.default_storage.url(meta["variants"]["medium"]["name"]),
+            srcset=images.srcset(fieldfile),
+            sizes=sizes,
+            width=width or meta["width"],
+            height=height or meta["height"],
+        )
+    else:
+        attrs.update(src=fieldfile.url, width=width, height=height)
+
+    img = format_html(
+        "<img{}>",
+        format_html_join("", ' {}="{}"', ((k, v) for k, v in attrs.items() if v not in (None, ""))),
+    )
+    if not meta:
+        return img
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">{}</picture>',
+        images.srcset(fieldfile, webp=True),
+        sizes,
+        img,
+    )
@@ -1,6 +1,33 @@
 from django import forms
 from .models import BasePost, Comment, Report
 
+MAX_TAGS = 5
+
+
+def parse_tags(raw) -> list:
+    """
+    "Festival, folklore,festival" -> ["festival", "folklore"]. Also accepts a
+    list (archive imports). Raises ValidationError past MAX_TAGS or 40 chars.
+    """
+    if isinstance(raw, (list, tuple)):
+        parts = [str(p).strip().lower() for p in raw if str(p).strip()]
+    else:
+        raw = (raw or "").strip()
+        if not raw:
+            return []
+        parts = [p.strip().lower() for p in raw.split(",") if p.strip()]
+    # unique, max 5
+    uniq = []
+    for p in parts:
+        if p not in uniq:
+            uniq.append(p)
+    if len(uniq) > MAX_TAGS:
+        raise forms.ValidationError("Maximum 5 tags allowed.")
+    for t in uniq:
+        if len(t) > 40:
+            raise forms.ValidationError("A tag is too long (max 40 chars).")
+    return uniq
+
 
 class BasePostForm(forms.ModelForm):
     tags = forms.CharField(
@@ -14,21 +41,7 @@ class BasePostForm(forms.ModelForm):
         widgets = {"body": forms.Textarea(attrs={"rows": 6})}
 
     def clean_tags(self):
-        raw = (self.cleaned_data.get("tags") or "").strip()
-        if not raw:
-            return []
-        parts = [p.strip().lower() for p in raw.split(",") if p.strip()]
-        # unique, max 5
-        uniq = []
-        for p in parts:
-            if p not in uniq:
-                uniq.append(p)
-        if len(uniq) > 5:
-            raise forms.ValidationError("Maximum 5 tags allowed.")
-        for t in uniq:
-            if len(t) > 40:
-                raise forms.ValidationError("A tag is too long (max 40 chars).")
-        return uniq
+        return parse_tags(self.cleaned_data.get("tags"))
 
 
 class CommentForm(forms.ModelForm):
@@ -0,0 +1,62 @@
+import io
+import os
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from feed.importer import FeedImporter, ImportRecordError, iter_records
+
+
+class Command(BaseCommand):
+    help = "Stream a JSONL or CSV archive of posts into the feed in bulk batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archive file, or - for stdin.")
+        parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension.")
+        parser.add_argument("--author", help="Username for records without a known author.")
+        parser.add_argument("--media-dir", help="Directory that relative image paths are resolved against.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--strict", action="store_true", help="Abort on the first invalid record.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or os.path.splitext(path)[1].lstrip(".").lower()
+        if fmt not in ("jsonl", "csv"):
+            raise CommandError("Cannot tell the format; pass --format jsonl|csv.")
+
+        default_author = None
+        if options["author"]:
+            try:
+                default_author = get_user_model().objects.get(username=options["author"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user named {options['author']!r}.")
+
+        media_dir = options["media_dir"] or (os.path.dirname(os.path.abspath(path)) if path != "-" else None)
+        importer = FeedImporter(
+            default_author=default_author,
+            media_dir=media_dir,
+            batch_size=options["batch_size"],
+            strict=options["strict"],
+            log=self.stdout.write,
+        )
+
+        if path == "-":
+            fh = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        else:
+            fh = open(path, encoding="utf-8-sig", newline="")
+        try:
+            with fh:
+                stats = importer.run(iter_records(fh, fmt))
+        except ImportRecordError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {stats.created} of {stats.read} record(s) in {stats.elapsed:.1f}s "
+                f"({stats.rate:.0f} posts/s); skipped {stats.skipped}, images {stats.images}, "
+                f"new tags {stats.tags_created}."
+            )
+        )
+        if stats.images:
+            self.stdout.write("Run `manage.py build_image_renditions` to generate thumbnails for the imported images.")
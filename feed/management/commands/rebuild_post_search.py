@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feed.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FTS5 search index for feed posts from scratch."
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write(self.style.WARNING("FTS5 index not available on this database; nothing to do."))
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} post(s)."))
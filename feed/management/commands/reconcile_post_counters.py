@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from feed.services import reconcile_post_counters
+
+
+class Command(BaseCommand):
+    help = "Recount likes, visible comments and images per post and repair drifted counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drifted posts.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        repaired = reconcile_post_counters(dry_run=options["dry_run"], batch_size=options["batch_size"])
+        verb = "would be repaired" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{repaired} post(s) {verb}."))
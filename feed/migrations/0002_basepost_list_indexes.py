@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='basepost',
+            index=models.Index(fields=['is_hidden', 'post_type', 'created_at', 'id'], name='feed_post_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='basepost',
+            index=models.Index(fields=['is_hidden', 'created_at', 'id'], name='feed_post_created_idx'),
+        ),
+    ]
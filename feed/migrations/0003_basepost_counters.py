@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:17
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    BasePost = apps.get_model("feed", "BasePost")
+    PostLike = apps.get_model("feed", "PostLike")
+    Comment = apps.get_model("feed", "Comment")
+    PostImage = apps.get_model("feed", "PostImage")
+
+    def count_of(model, **filters):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(post=OuterRef("pk"), **filters)
+                .order_by()
+                .values("post")
+                .annotate(c=Count("id"))
+                .values("c"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    BasePost.objects.update(
+        like_count=count_of(PostLike),
+        comment_count=count_of(Comment, is_hidden=False),
+        image_count=count_of(PostImage),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0002_basepost_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basepost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='basepost',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='basepost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+from django.db import OperationalError, migrations
+
+
+def create_fts(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends keep using the icontains fallback.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS feed_post_fts "
+            "USING fts5(title, body, tags, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite compiled without FTS5
+        return
+    schema_editor.execute(
+        """
+        INSERT INTO feed_post_fts (rowid, title, body, tags)
+        SELECT p.id, p.title, p.body,
+               COALESCE((SELECT group_concat(t.name, ' ')
+                         FROM feed_basepost_tags bt JOIN feed_tag t ON t.id = bt.tag_id
+                         WHERE bt.basepost_id = p.id), '')
+        FROM feed_basepost p
+        """
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS feed_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0003_basepost_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
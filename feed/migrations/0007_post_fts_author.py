@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:30
+
+from django.db import OperationalError, migrations
+
+
+def _rebuild_fts(apps, schema_editor, with_author: bool):
+    # FTS5 is SQLite-only; other backends keep using the icontains fallback.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    columns = "title, body, tags, author" if with_author else "title, body, tags"
+    schema_editor.execute("DROP TABLE IF EXISTS feed_post_fts")
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE feed_post_fts "
+            f"USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite compiled without FTS5
+        return
+    user_table = apps.get_model("accounts", "User")._meta.db_table
+    schema_editor.execute(
+        f"""
+        INSERT INTO feed_post_fts (rowid, {columns})
+        SELECT p.id, p.title, p.body,
+               COALESCE((SELECT group_concat(t.name, ' ')
+                         FROM feed_basepost_tags bt JOIN feed_tag t ON t.id = bt.tag_id
+                         WHERE bt.basepost_id = p.id), '')
+               {", u.username" if with_author else ""}
+        FROM feed_basepost p JOIN {user_table} u ON u.id = p.author_id
+        """
+    )
+
+
+def add_author_column(apps, schema_editor):
+    _rebuild_fts(apps, schema_editor, with_author=True)
+
+
+def drop_author_column(apps, schema_editor):
+    _rebuild_fts(apps, schema_editor, with_author=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('feed', '0006_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_author_column, drop_author_column),
+    ]
@@ -36,6 +36,18 @@ class BasePost(models.Model):
     # Likes
     liked_by = models.ManyToManyField(settings.AUTH_USER_MODEL, through="PostLike", related_name="liked_posts", blank=True)
 
+    # Denormalized counters (kept in sync by feed.signals, repaired by `manage.py reconcile_post_counters`)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)  # visible (not hidden) comments only
+    image_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # feed list: WHERE is_hidden [AND post_type] ORDER BY created_at DESC, id DESC (keyset)
+            models.Index(fields=["is_hidden", "post_type", "created_at", "id"], name="feed_post_type_created_idx"),
+            models.Index(fields=["is_hidden", "created_at", "id"], name="feed_post_created_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.post_type} | {self.title}"
 
@@ -108,9 +120,19 @@ class AnnouncementPost(models.Model):
         return f"Announcement({self.post_id})"
 
 
+TYPE_MODEL_MAP = {
+    BasePost.PostType.FOLKTALE: FolktalePost,
+    BasePost.PostType.FESTIVAL: FestivalPost,
+    BasePost.PostType.EDUCATION: EducationPost,
+    BasePost.PostType.ORAL: OralHighlightPost,
+    BasePost.PostType.ANNOUNCEMENT: AnnouncementPost,
+}
+
+
 class PostImage(models.Model):
     post = models.ForeignKey(BasePost, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="posts/%Y/%m/%d/")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
     caption = models.CharField(max_length=150, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
@@ -171,5 +193,11 @@ class Report(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # moderation queue: WHERE status = 'OPEN' GROUP BY content_type, object_id
+            models.Index(fields=["status", "content_type", "object_id"], name="feed_report_queue_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"Report({self.id}) {self.reason} {self.status}"
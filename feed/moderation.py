@@ -0,0 +1,135 @@
+"""
+Moderation queue helpers.
+
+Open reports are shown grouped per target (content_type, object_id) with a
+report count, and every target on a page is loaded with one query per content
+type instead of one GenericForeignKey lookup per report.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import Comment, Report
+from .services import deferred_maintenance
+
+
+REPORT_GROUPS_PER_PAGE = 25
+
+BULK_REPORT_ACTIONS = ("hide", "unhide", "delete", "resolve", "ignore")
+BULK_MAX_SELECTION = 500
+
+
+def open_report_groups(page_number=1, per_page: int = REPORT_GROUPS_PER_PAGE):
+    """
+    Returns a Paginator page whose object_list is a list of dicts:
+    content_type, object_id, target (None if deleted), report_count,
+    reasons [(label, n)], latest (most recent Report, reporter loaded).
+    """
+    groups = (
+        Report.objects.filter(status="OPEN")
+        .values("content_type_id", "object_id")
+        .annotate(report_count=Count("id"), latest_id=Max("id"))
+        .order_by("-latest_id")
+    )
+    page = Paginator(groups, per_page).get_page(page_number)
+    rows = list(page.object_list)
+    if not rows:
+        page.object_list = []
+        return page
+
+    # latest report per group
+    latest = Report.objects.select_related("reporter").in_bulk([r["latest_id"] for r in rows])
+
+    # reason breakdown for the groups on this page
+    ids_by_ct = defaultdict(set)
+    for r in rows:
+        ids_by_ct[r["content_type_id"]].add(r["object_id"])
+    reasons = defaultdict(list)
+    reason_labels = dict(Report.Reason.choices)
+    all_object_ids = {i for ids in ids_by_ct.values() for i in ids}
+    reason_rows = (
+        Report.objects.filter(status="OPEN", content_type_id__in=ids_by_ct.keys(), object_id__in=all_object_ids)
+        .values("content_type_id", "object_id", "reason")
+        .annotate(n=Count("id"))
+        .order_by("-n")
+    )
+    for rr in reason_rows:
+        # the IN lists cross content types; drop combinations not on this page
+        if rr["object_id"] in ids_by_ct.get(rr["content_type_id"], ()):
+            reasons[(rr["content_type_id"], rr["object_id"])].append((reason_labels.get(rr["reason"], rr["reason"]), rr["n"]))
+
+    # targets: one query per content type
+    targets = {}
+    for ct_id, object_ids in ids_by_ct.items():
+        ct = ContentType.objects.get_for_id(ct_id)
+        model = ct.model_class()
+        if model is None:
+            continue
+        for obj in model._base_manager.filter(pk__in=object_ids):
+            targets[(ct_id, obj.pk)] = obj
+
+    page.object_list = [
+        {
+            "content_type": ContentType.objects.get_for_id(r["content_type_id"]),
+            "object_id": r["object_id"],
+            "target": targets.get((r["content_type_id"], r["object_id"])),
+            "report_count": r["report_count"],
+            "reasons": reasons.get((r["content_type_id"], r["object_id"]), []),
+            "latest": latest.get(r["latest_id"]),
+        }
+        for r in rows
+    ]
+    return page
+
+
+def bulk_report_action(report_ids, action: str) -> dict:
+    """
+    Applies `action` to the targets of the selected reports with set-based
+    statements in one transaction. Every open report on an affected target is
+    closed: hide/delete/resolve mark them RESOLVED, ignore marks them IGNORED
+    (unhide leaves them open). Returns counts: targets, changed, reports.
+    """
+    if action not in BULK_REPORT_ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action}")
+
+    pairs = set(
+        Report.objects.filter(id__in=list(report_ids)[:BULK_MAX_SELECTION]).values_list("content_type_id", "object_id")
+    )
+    result = {"targets": len(pairs), "changed": 0, "reports": 0}
+    if not pairs:
+        return result
+
+    ids_by_ct = defaultdict(set)
+    for ct_id, object_id in pairs:
+        ids_by_ct[ct_id].add(object_id)
+
+    with transaction.atomic(), deferred_maintenance() as pending:
+        if action in ("hide", "unhide", "delete"):
+            for ct_id, object_ids in ids_by_ct.items():
+                model = ContentType.objects.get_for_id(ct_id).model_class()
+                if model is None:
+                    continue
+                targets = model._base_manager.filter(pk__in=object_ids)
+                if action == "delete":
+                    # cascades fire per-row signals; deferred_maintenance batches their counter/FTS work
+                    result["changed"] += targets.delete()[1].get(model._meta.label, 0)
+                    continue
+                if not any(f.name == "is_hidden" for f in model._meta.get_fields()):
+                    continue
+                hidden = action == "hide"
+                targets = targets.exclude(is_hidden=hidden)
+                if model is Comment:
+                    # .update() skips the comment signals, so recount their posts
+                    pending.counter_posts.update(targets.values_list("post_id", flat=True))
+                result["changed"] += targets.update(is_hidden=hidden)
+
+        if action != "unhide":
+            status = "IGNORED" if action == "ignore" else "RESOLVED"
+            for ct_id, object_ids in ids_by_ct.items():
+                result["reports"] += Report.objects.filter(
+                    status="OPEN", content_type_id=ct_id, object_id__in=object_ids
+                ).update(status=status)
+    return result
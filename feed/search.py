@@ -0,0 +1,187 @@
+"""
+Full-text search over feed posts.
+
+On SQLite builds with FTS5 the `feed_post_fts` virtual table (created by
+migration 0004, author column added by 0007) mirrors title, body, tag names
+and the author's username of every BasePost, keyed by rowid = post id, and is
+kept in sync by feed.signals. Other backends (or SQLite
+without FTS5) fall back to the old icontains filter in post_list_view.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from core.fts import HL_CLOSE, HL_OPEN, build_match, highlight
+from core.pagination import KeysetPage, decode_values, encode_cursor
+
+FTS_TABLE = "feed_post_fts"
+
+# bm25 column weights: title, body, tags, author
+BM25 = f"bm25({FTS_TABLE}, 10.0, 1.0, 5.0, 5.0)"
+
+_available = {}
+
+
+def fts_enabled(using: str = "default") -> bool:
+    if using not in _available:
+        conn = connections[using]
+        _available[using] = conn.vendor == "sqlite" and FTS_TABLE in conn.introspection.table_names()
+    return _available[using]
+
+
+# ---------- index maintenance ----------
+
+def index_post(post) -> None:
+    if not fts_enabled():
+        return
+    tags = " ".join(post.tags.values_list("name", flat=True)) if post.pk else ""
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+        cur.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, body, tags, author) VALUES (%s, %s, %s, %s, %s)",
+            [post.pk, post.title, post.body, tags, post.author.username],
+        )
+
+
+def index_posts(rows) -> None:
+    """Bulk insert for new posts: rows of (id, title, body, space-separated tag names, author username)."""
+    rows = list(rows)
+    if not rows or not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        cur.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, body, tags, author) VALUES (%s, %s, %s, %s, %s)", rows
+        )
+
+
+def reindex_author(user_id: int, username: str) -> None:
+    """A user was renamed: rewrite the author column of their posts in one statement."""
+    if not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        cur.execute(
+            f"UPDATE {FTS_TABLE} SET author = %s WHERE rowid IN (SELECT id FROM feed_basepost WHERE author_id = %s)",
+            [username, user_id],
+        )
+
+
+def unindex_post(post_id: int) -> None:
+    if not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+
+def unindex_posts(post_ids) -> None:
+    post_ids = list(post_ids)
+    if not post_ids or not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        for start in range(0, len(post_ids), 500):
+            chunk = post_ids[start:start + 500]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+
+
+def rebuild_index() -> int:
+    """Clears and refills every FTS row from feed_basepost. Returns the row count."""
+    if not fts_enabled():
+        return 0
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE}")
+        cur.execute(
+            f"""
+            INSERT INTO {FTS_TABLE} (rowid, title, body, tags, author)
+            SELECT p.id, p.title, p.body,
+                   COALESCE((SELECT group_concat(t.name, ' ')
+                             FROM feed_basepost_tags bt JOIN feed_tag t ON t.id = bt.tag_id
+                             WHERE bt.basepost_id = p.id), ''),
+                   u.username
+            FROM feed_basepost p JOIN {get_user_model()._meta.db_table} u ON u.id = p.author_id
+            """
+        )
+        cur.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cur.fetchone()[0]
+
+
+# ---------- querying ----------
+
+def search_posts(qs, q: str, after: str = "", before: str = "", per_page: int = 20) -> KeysetPage:
+    """
+    BM25-ranked search restricted to the posts in `qs` (type/tag/visibility
+    filters are applied by the caller). Pages by keyset on (score, id); each
+    returned post carries `search_rank` and a highlighted `search_snippet`.
+    """
+    match = build_match(q)
+    if not match:
+        return KeysetPage(object_list=[])
+
+    ids_sql, ids_params = qs.order_by().values("id").query.sql_with_params()
+
+    cursor_values = None
+    forward = True
+    for token, is_forward in ((before, False), (after, True)):
+        values = decode_values(token, 2)
+        if values and isinstance(values[0], (int, float)) and isinstance(values[1], int):
+            cursor_values, forward = values, is_forward
+            break
+
+    seek = ""
+    seek_params = []
+    if cursor_values is not None:
+        op = ">" if forward else "<"
+        seek = f"WHERE (score {op} %s OR (score = %s AND id {op} %s))"
+        seek_params = [cursor_values[0], cursor_values[0], cursor_values[1]]
+    direction = "ASC" if forward else "DESC"
+
+    sql = f"""
+        SELECT id, score FROM (
+            SELECT rowid AS id, {BM25} AS score
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s AND rowid IN ({ids_sql})
+        )
+        {seek}
+        ORDER BY score {direction}, id {direction}
+        LIMIT %s
+    """
+    with connections["default"].cursor() as cur:
+        cur.execute(sql, [match, *ids_params, *seek_params, per_page + 1])
+        hits = cur.fetchall()
+
+    more = len(hits) > per_page
+    hits = hits[:per_page]
+    if not forward:
+        hits.reverse()
+    if not hits:
+        if not forward:
+            return search_posts(qs, q, per_page=per_page)
+        return KeysetPage(object_list=[])
+
+    ids = [h[0] for h in hits]
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connections["default"].cursor() as cur:
+        cur.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, %s, 24) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})",
+            [HL_OPEN, HL_CLOSE, "…", match, *ids],
+        )
+        snippets = dict(cur.fetchall())
+
+    by_id = qs.filter(id__in=ids).in_bulk()
+    posts = []
+    for pid, score in hits:
+        post = by_id.get(pid)
+        if post is None:
+            continue
+        post.search_rank = score
+        post.search_snippet = highlight(snippets.get(pid, ""))
+        posts.append(post)
+
+    first = encode_cursor([hits[0][1], hits[0][0]])
+    last = encode_cursor([hits[-1][1], hits[-1][0]])
+    if forward:
+        next_cursor = last if more else None
+        prev_cursor = first if cursor_values is not None else None
+    else:
+        next_cursor = last
+        prev_cursor = first if more else None
+    return KeysetPage(object_list=posts, next_cursor=next_cursor, prev_cursor=prev_cursor)
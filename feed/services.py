@@ -0,0 +1,127 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import BasePost, Comment, PostImage, PostLike
+from .search import unindex_posts
+
+
+COUNTER_FIELDS = ("like_count", "comment_count", "image_count")
+
+_local = threading.local()
+
+
+class PendingMaintenance:
+    """Post ids whose counters / FTS rows are fixed up once at the end of a bulk block."""
+
+    def __init__(self):
+        self.counter_posts = set()
+        self.unindexed_posts = set()
+
+
+def pending_maintenance():
+    """The active PendingMaintenance, or None outside a deferred_maintenance() block."""
+    return getattr(_local, "pending", None)
+
+
+@contextmanager
+def deferred_maintenance():
+    """
+    For set-based bulk writes: inside the block, counter bumps and FTS deletes
+    fired by signals are only recorded, then applied as one recount UPDATE and
+    one FTS DELETE on exit. Nested blocks share the outer one.
+    """
+    if pending_maintenance() is not None:
+        yield pending_maintenance()
+        return
+    pending = _local.pending = PendingMaintenance()
+    try:
+        yield pending
+    finally:
+        _local.pending = None
+    recount_post_counters(pending.counter_posts)
+    unindex_posts(pending.unindexed_posts)
+
+
+def bump_post_counter(post_id: int, field: str, delta: int) -> None:
+    """
+    Atomic UPDATE ... SET field = field + delta; runs inside the caller's transaction.
+    Decrements never go below zero (a drifted counter is left for reconciliation).
+    """
+    if field not in COUNTER_FIELDS or not delta:
+        return
+    pending = pending_maintenance()
+    if pending is not None:
+        pending.counter_posts.add(post_id)
+        return
+    qs = BasePost.objects.filter(id=post_id)
+    if delta < 0:
+        qs = qs.filter(**{f"{field}__gte": -delta})
+    qs.update(**{field: F(field) + delta})
+
+
+def _count_subquery(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(post=OuterRef("pk"), **filters)
+            .order_by()
+            .values("post")
+            .annotate(c=Count("id"))
+            .values("c"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def actual_post_counters(qs=None):
+    """
+    Annotates true counts next to the stored ones: like_actual, comment_actual, image_actual.
+    """
+    qs = BasePost.objects.all() if qs is None else qs
+    return qs.annotate(
+        like_actual=_count_subquery(PostLike),
+        comment_actual=_count_subquery(Comment, is_hidden=False),
+        image_actual=_count_subquery(PostImage),
+    )
+
+
+def recount_post_counters(post_ids) -> int:
+    """Sets the counters of the given posts from real counts in one UPDATE."""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return 0
+    return BasePost.objects.filter(id__in=post_ids).update(
+        like_count=_count_subquery(PostLike),
+        comment_count=_count_subquery(Comment, is_hidden=False),
+        image_count=_count_subquery(PostImage),
+    )
+
+
+def reconcile_post_counters(dry_run: bool = False, batch_size: int = 500) -> int:
+    """
+    Compares stored counters with real counts and rewrites the drifted rows.
+    Returns the number of posts that were (or would be) repaired.
+    """
+    rows = actual_post_counters().values_list(
+        "id", "like_count", "comment_count", "image_count", "like_actual", "comment_actual", "image_actual"
+    )
+
+    drifted = []
+    repaired = 0
+    for pid, likes, comments, images, likes_a, comments_a, images_a in rows.iterator(chunk_size=batch_size):
+        if (likes, comments, images) == (likes_a, comments_a, images_a):
+            continue
+        repaired += 1
+        if dry_run:
+            continue
+        drifted.append(BasePost(id=pid, like_count=likes_a, comment_count=comments_a, image_count=images_a))
+        if len(drifted) >= batch_size:
+            BasePost.objects.bulk_update(drifted, COUNTER_FIELDS)
+            drifted = []
+
+    if drifted:
+        BasePost.objects.bulk_update(drifted, COUNTER_FIELDS)
+    return repaired
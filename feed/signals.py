@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import BasePost, Comment, PostImage, PostLike
+from .search import index_post, reindex_author, unindex_post
+from .services import bump_post_counter, pending_maintenance
+
+
+# ---------- full-text index ----------
+
+@receiver(post_save, sender=BasePost)
+def on_post_save(sender, instance: BasePost, update_fields=None, **kwargs):
+    # type-table saves only touch post_type; nothing searchable changed
+    if update_fields is not None and not {"title", "body"} & set(update_fields):
+        return
+    index_post(instance)
+
+
+@receiver(post_delete, sender=BasePost)
+def on_post_delete(sender, instance: BasePost, **kwargs):
+    pending = pending_maintenance()
+    if pending is not None:
+        pending.unindexed_posts.add(instance.pk)
+        return
+    unindex_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=BasePost.tags.through)
+def on_post_tags_changed(sender, instance, action: str, reverse: bool, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # tag.posts.add(...) etc.
+        for post in BasePost.objects.filter(pk__in=kwargs.get("pk_set") or []):
+            index_post(post)
+    else:
+        index_post(instance)
+
+
+@receiver(pre_save, sender=get_user_model())
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    instance._old_username = None
+    if update_fields is not None and "username" not in update_fields:
+        return  # e.g. update_last_login on every login
+    if instance.pk:
+        instance._old_username = sender.objects.filter(pk=instance.pk).values_list("username", flat=True).first()
+
+
+@receiver(post_save, sender=get_user_model())
+def on_user_save(sender, instance, created: bool, **kwargs):
+    old = getattr(instance, "_old_username", None)
+    if not created and old is not None and old != instance.username:
+        reindex_author(instance.pk, instance.username)
+
+
+# ---------- counters ----------
+
+
+@receiver(post_save, sender=PostLike)
+def on_like_save(sender, instance: PostLike, created: bool, **kwargs):
+    if created:
+        bump_post_counter(instance.post_id, "like_count", 1)
+
+
+@receiver(post_delete, sender=PostLike)
+def on_like_delete(sender, instance: PostLike, **kwargs):
+    bump_post_counter(instance.post_id, "like_count", -1)
+
+
+@receiver(post_save, sender=PostImage)
+def on_image_save(sender, instance: PostImage, created: bool, **kwargs):
+    if created:
+        bump_post_counter(instance.post_id, "image_count", 1)
+
+
+@receiver(post_delete, sender=PostImage)
+def on_image_delete(sender, instance: PostImage, **kwargs):
+    bump_post_counter(instance.post_id, "image_count", -1)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_visibility(sender, instance: Comment, **kwargs):
+    # only edits need the old value (hide/unhide from moderation)
+    instance._was_hidden = None
+    if instance.pk:
+        instance._was_hidden = (
+            Comment.objects.filter(pk=instance.pk).values_list("is_hidden", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def on_comment_save(sender, instance: Comment, created: bool, **kwargs):
+    if created:
+        if not instance.is_hidden:
+            bump_post_counter(instance.post_id, "comment_count", 1)
+        return
+
+    was_hidden = getattr(instance, "_was_hidden", None)
+    if was_hidden is None or was_hidden == instance.is_hidden:
+        return
+    bump_post_counter(instance.post_id, "comment_count", 1 if was_hidden else -1)
+
+
+@receiver(post_delete, sender=Comment)
+def on_comment_delete(sender, instance: Comment, **kwargs):
+    if not instance.is_hidden:
+        bump_post_counter(instance.post_id, "comment_count", -1)
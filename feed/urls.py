@@ -3,7 +3,7 @@ from .views import (
     post_list_view, post_create_view, post_detail_view, post_like_toggle_view,
     post_edit_view, post_delete_view, comment_delete_view,
     report_post_view, report_comment_view,
-    mod_reports_view, mod_report_action_view,
+    mod_reports_view, mod_report_action_view, mod_reports_bulk_view, mod_reports_export_view,
 )
 
 app_name = "feed"
@@ -25,5 +25,7 @@ urlpatterns = [
 
     # moderation
     path("mod/reports/", mod_reports_view, name="mod_reports"),
+    path("mod/reports/bulk/", mod_reports_bulk_view, name="mod_reports_bulk"),
+    path("mod/reports/export.csv", mod_reports_export_view, name="mod_reports_export"),
     path("mod/reports/<int:report_id>/action/", mod_report_action_view, name="mod_report_action"),
 ]
@@ -1,41 +1,36 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.contenttypes.models import ContentType
-from django.core.cache import cache
 from django.db import transaction
 from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.views.decorators.http import require_POST
 
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from .models import Tag
 
 
 from accounts.utils import is_moderator
 from accounts.decorators import moderator_required
+from core.exports import date_filters, stream_csv, values_rows
+from core.pagination import paginate_keyset
+from core.ratelimit import comment_ratelimit, post_ratelimit, report_ratelimit
 
 from .forms import BasePostForm, CommentForm, ReportForm
+from .moderation import BULK_REPORT_ACTIONS, bulk_report_action, open_report_groups
+from .search import fts_enabled, search_posts
 from .models import (
-    AnnouncementPost,
+    TYPE_MODEL_MAP,
     BasePost,
     Comment,
-    EducationPost,
-    FestivalPost,
-    FolktalePost,
-    OralHighlightPost,
     PostImage,
     PostLike,
     Report,
 )
 
 
-TYPE_MODEL_MAP = {
-    BasePost.PostType.FOLKTALE: FolktalePost,
-    BasePost.PostType.FESTIVAL: FestivalPost,
-    BasePost.PostType.EDUCATION: EducationPost,
-    BasePost.PostType.ORAL: OralHighlightPost,
-    BasePost.PostType.ANNOUNCEMENT: AnnouncementPost,
-}
+FEED_PAGE_SIZE = 20
 
 
 def _owner_or_mod_required(user, owner_id: int) -> bool:
@@ -43,7 +38,7 @@ def _owner_or_mod_required(user, owner_id: int) -> bool:
 
 
 def post_list_view(request):
-    qs = BasePost.objects.filter(is_hidden=False).order_by("-created_at")
+    qs = BasePost.objects.filter(is_hidden=False).select_related("author")
 
     # type filter
     selected_type = request.GET.get("type", "")
@@ -53,21 +48,35 @@ def post_list_view(request):
     else:
         selected_type = ""
 
-    # tag filter
+    # tag filter (EXISTS instead of a join, so no .distinct() is needed)
     selected_tag = (request.GET.get("tag") or "").strip().lower()
     if selected_tag:
-        qs = qs.filter(tags__name__iexact=selected_tag)
-
-    # keyword search
-    q = (request.GET.get("q") or "").strip()
-    if q:
         qs = qs.filter(
-            Q(title__icontains=q) |
-            Q(body__icontains=q) |
-            Q(author__username__icontains=q)
+            Exists(
+                BasePost.tags.through.objects.filter(
+                    basepost_id=OuterRef("pk"),
+                    tag__name__iexact=selected_tag,
+                )
+            )
         )
 
-    qs = qs.distinct()
+    after = request.GET.get("after", "")
+    before = request.GET.get("before", "")
+
+    # keyword search: BM25-ranked FTS5 when available, icontains otherwise
+    q = (request.GET.get("q") or "").strip()
+    if q and fts_enabled():
+        page = search_posts(qs, q, after=after, before=before, per_page=FEED_PAGE_SIZE)
+    else:
+        if q:
+            qs = qs.filter(
+                Q(title__icontains=q) |
+                Q(body__icontains=q) |
+                Q(author__username__icontains=q)
+            )
+
+        # keyset pagination on (created_at, id), see BasePost.Meta.indexes
+        page = paginate_keyset(qs, ("-created_at", "-id"), after=after, before=before, per_page=FEED_PAGE_SIZE)
 
     # show top tags (simple)
     top_tags = Tag.objects.order_by("name")[:50]
@@ -76,7 +85,8 @@ def post_list_view(request):
         request,
         "community/feed/post_list.html",
         {
-            "posts": qs,
+            "posts": page.object_list,
+            "page": page,
             "post_types": BasePost.PostType.choices,
             "selected_type": selected_type,
             "selected_tag": selected_tag,
@@ -88,15 +98,9 @@ def post_list_view(request):
 
 
 @login_required
+@post_ratelimit
 def post_create_view(request):
     if request.method == "POST":
-        # anti-spam cooldown: 1 post per 30s
-        key = f"cooldown_post_{request.user.id}"
-        if cache.get(key):
-            messages.error(request, "Slow down — please wait a bit before creating another post.")
-            return redirect("feed:post_create")
-        cache.set(key, True, 30)
-
         form = BasePostForm(request.POST)
         images = request.FILES.getlist("images")
 
@@ -137,13 +141,14 @@ def post_create_view(request):
     return render(request, "community/feed/post_create.html", {"form": form})
 
 
+@comment_ratelimit
 def post_detail_view(request, post_id: int):
     post = get_object_or_404(BasePost, id=post_id)
     if post.is_hidden and not is_moderator(request.user):
         return redirect("feed:post_list")
 
     images = post.images.all().order_by("id")
-    comments = post.comments.filter(is_hidden=False).order_by("created_at")
+    comments = post.comments.filter(is_hidden=False).select_related("author").order_by("created_at")
 
     liked = False
     if request.user.is_authenticated:
@@ -155,20 +160,14 @@ def post_detail_view(request, post_id: int):
         if not request.user.is_authenticated:
             return redirect("/login/")
 
-        # anti-spam cooldown: 1 comment per 10s
-        key = f"cooldown_comment_{request.user.id}"
-        if cache.get(key):
-            messages.error(request, "Please wait a few seconds before commenting again.")
-            return redirect("feed:post_detail", post_id=post.id)
-        cache.set(key, True, 10)
-
         comment_form = CommentForm(request.POST)
         if comment_form.is_valid():
-            Comment.objects.create(
-                post=post,
-                author=request.user,
-                text=comment_form.cleaned_data["text"],
-            )
+            with transaction.atomic():
+                Comment.objects.create(
+                    post=post,
+                    author=request.user,
+                    text=comment_form.cleaned_data["text"],
+                )
             return redirect("feed:post_detail", post_id=post.id)
 
     context = {
@@ -177,8 +176,8 @@ def post_detail_view(request, post_id: int):
         "comments": comments,
         "comment_form": comment_form,
         "liked": liked,
-        "like_count": PostLike.objects.filter(post=post).count(),
-        "comment_count": comments.count(),
+        "like_count": post.like_count,
+        "comment_count": post.comment_count,
         "can_manage_post": _owner_or_mod_required(request.user, post.author_id),
         "is_moderator": is_moderator(request.user),
     }
@@ -190,9 +189,10 @@ def post_detail_view(request, post_id: int):
 def post_like_toggle_view(request, post_id: int):
     post = get_object_or_404(BasePost, id=post_id, is_hidden=False)
 
-    like, created = PostLike.objects.get_or_create(post=post, user=request.user)
-    if not created:
-        like.delete()
+    with transaction.atomic():
+        like, created = PostLike.objects.get_or_create(post=post, user=request.user)
+        if not created:
+            like.delete()
 
     next_url = request.POST.get("next") or request.META.get("HTTP_REFERER") or "/feed/"
     return redirect(next_url)
@@ -253,7 +253,8 @@ def comment_delete_view(request, comment_id: int):
     if not _owner_or_mod_required(request.user, c.author_id):
         return HttpResponseForbidden("Not allowed.")
     post_id = c.post_id
-    c.delete()
+    with transaction.atomic():
+        c.delete()
     messages.success(request, "Comment deleted.")
     return redirect("feed:post_detail", post_id=post_id)
 
@@ -261,6 +262,7 @@ def comment_delete_view(request, comment_id: int):
 # ---------- Reporting (User) ----------
 
 @login_required
+@report_ratelimit
 def report_post_view(request, post_id: int):
     post = get_object_or_404(BasePost, id=post_id)
     if request.method == "POST":
@@ -280,6 +282,7 @@ def report_post_view(request, post_id: int):
 
 
 @login_required
+@report_ratelimit
 def report_comment_view(request, comment_id: int):
     c = get_object_or_404(Comment, id=comment_id)
     if request.method == "POST":
@@ -302,8 +305,37 @@ def report_comment_view(request, comment_id: int):
 
 @moderator_required
 def mod_reports_view(request):
-    open_reports = Report.objects.filter(status="OPEN").order_by("-created_at")
-    return render(request, "community/feed/mod_reports.html", {"reports": open_reports})
+    page = open_report_groups(request.GET.get("page"))
+    return render(request, "community/feed/mod_reports.html", {"groups": page.object_list, "page": page})
+
+
+REPORT_STATUSES = ("OPEN", "RESOLVED", "IGNORED")
+
+
+@moderator_required
+def mod_reports_export_view(request):
+    """
+    Report history as CSV, oldest first. ?status=OPEN|RESOLVED|IGNORED,
+    ?reason=, ?from= / ?to= (YYYY-MM-DD, on created_at); all reports by default.
+    """
+    qs = Report.objects.filter(**date_filters(request.GET, "created_at"))
+    status = request.GET.get("status", "")
+    if status in REPORT_STATUSES:
+        qs = qs.filter(status=status)
+    reason = request.GET.get("reason", "")
+    if reason in Report.Reason.values:
+        qs = qs.filter(reason=reason)
+
+    fields = ("id", "created_at", "status", "reason", "reporter__username", "content_type_id", "object_id", "note")
+
+    def rows():
+        for row in values_rows(qs.order_by("id"), fields):
+            ct = ContentType.objects.get_for_id(row[5])  # cached per type
+            yield row[:5] + (f"{ct.app_label}.{ct.model}",) + row[6:]
+
+    header = ("Report", "Created at", "Status", "Reason", "Reporter", "Target type", "Target id", "Note")
+    filename = f"reports-{status.lower() or 'all'}-{timezone.localdate():%Y%m%d}.csv"
+    return stream_csv(filename, header, rows())
 
 
 @moderator_required
@@ -316,28 +348,51 @@ def mod_report_action_view(request, report_id: int):
     if action in ("hide", "unhide") and target is not None:
         if hasattr(target, "is_hidden"):
             target.is_hidden = (action == "hide")
-            target.save(update_fields=["is_hidden"])
+            with transaction.atomic():
+                target.save(update_fields=["is_hidden"])
             messages.success(request, f"Target {action}d.")
         else:
             messages.error(request, "Target cannot be hidden.")
         return redirect("feed:mod_reports")
 
     if action == "delete" and target is not None:
-        target.delete()
+        with transaction.atomic():
+            target.delete()
         messages.success(request, "Target deleted.")
         return redirect("feed:mod_reports")
 
+    # the queue is grouped per target, so resolve/ignore closes every open report on it
+    same_target = Report.objects.filter(
+        status="OPEN", content_type_id=report.content_type_id, object_id=report.object_id
+    )
+
     if action == "resolve":
-        report.status = "RESOLVED"
-        report.save(update_fields=["status"])
-        messages.success(request, "Report resolved.")
+        n = same_target.update(status="RESOLVED")
+        messages.success(request, f"{n} report(s) resolved.")
         return redirect("feed:mod_reports")
 
     if action == "ignore":
-        report.status = "IGNORED"
-        report.save(update_fields=["status"])
-        messages.success(request, "Report ignored.")
+        n = same_target.update(status="IGNORED")
+        messages.success(request, f"{n} report(s) ignored.")
         return redirect("feed:mod_reports")
 
     messages.error(request, "Invalid action.")
     return redirect("feed:mod_reports")
+
+
+@moderator_required
+@require_POST
+def mod_reports_bulk_view(request):
+    action = request.POST.get("action", "")
+    report_ids = [int(v) for v in request.POST.getlist("report_ids") if v.isdigit()]
+    if action not in BULK_REPORT_ACTIONS or not report_ids:
+        messages.error(request, "Select at least one report and a valid action.")
+        return redirect("feed:mod_reports")
+
+    result = bulk_report_action(report_ids, action)
+    messages.success(
+        request,
+        f"{action.capitalize()}: {result['targets']} target(s), "
+        f"{result['changed']} changed, {result['reports']} report(s) closed.",
+    )
+    return redirect("feed:mod_reports")
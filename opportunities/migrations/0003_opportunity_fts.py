@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:50
+
+from django.db import OperationalError, migrations
+
+
+def create_fts(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends keep using the icontains fallback.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS opportunity_fts "
+            "USING fts5(title, description, opportunity_type, location, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite compiled without FTS5
+        return
+    schema_editor.execute(
+        """
+        INSERT INTO opportunity_fts (rowid, title, description, opportunity_type, location)
+        SELECT id, title, description, opportunity_type, location FROM opportunities_opportunity
+        """
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS opportunity_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opportunities', '0002_board_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -32,5 +32,14 @@ class Opportunity(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # board, "closing soon" and archive: WHERE status = ... AND deadline >= / < today
+            # ORDER BY deadline, created_at (id rides along as the rowid)
+            models.Index(fields=["status", "deadline", "created_at"], name="opp_status_deadline_idx"),
+            # board, "newest": WHERE status = ... ORDER BY created_at DESC
+            models.Index(fields=["status", "created_at"], name="opp_status_created_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.title} [{self.status}]"
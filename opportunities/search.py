@@ -0,0 +1,185 @@
+"""
+Ranked search for the opportunity board.
+
+On SQLite builds with FTS5 the `opportunity_fts` virtual table (created by
+migration 0003) mirrors title, description, type and location of every
+Opportunity, keyed by rowid = opportunity id, and is kept in sync by
+opportunities.signals. Other backends fall back to the icontains filter in
+_listed_opportunities().
+
+Results are ranked by BM25 scaled up for deadlines that are close: an item
+closing today scores twice its text relevance, one closing in a week 1.5x,
+open-ended or closed ones 1x. Which rows are eligible (approved, not
+expired, type filter) is decided by the caller's queryset.
+"""
+from typing import List
+
+from django.db import connections
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from core.fts import HL_CLOSE, HL_OPEN, build_match, highlight
+from core.pagination import KeysetPage, decode_values, encode_cursor
+
+FTS_TABLE = "opportunity_fts"
+
+# bm25 column weights: title, description, opportunity_type, location
+BM25 = f"bm25({FTS_TABLE}, 10.0, 1.0, 4.0, 2.0)"
+
+# deadline boost: 1 + 1 / (1 + days_left / DEADLINE_BOOST_DAYS)
+DEADLINE_BOOST_DAYS = 7.0
+
+FACET_LIMIT = 12
+
+_available = {}
+
+
+def fts_enabled(using: str = "default") -> bool:
+    if using not in _available:
+        conn = connections[using]
+        _available[using] = conn.vendor == "sqlite" and FTS_TABLE in conn.introspection.table_names()
+    return _available[using]
+
+
+# ---------- index maintenance ----------
+
+def index_opportunity(opp) -> None:
+    if not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [opp.pk])
+        cur.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, opportunity_type, location) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            [opp.pk, opp.title, opp.description, opp.opportunity_type, opp.location],
+        )
+
+
+def unindex_opportunity(opp_id: int) -> None:
+    if not fts_enabled():
+        return
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [opp_id])
+
+
+def rebuild_index() -> int:
+    """Clears and refills every FTS row from opportunities_opportunity. Returns the row count."""
+    if not fts_enabled():
+        return 0
+    with connections["default"].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE}")
+        cur.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, opportunity_type, location) "
+            f"SELECT id, title, description, opportunity_type, location FROM opportunities_opportunity"
+        )
+        cur.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cur.fetchone()[0]
+
+
+# ---------- querying ----------
+
+def matching(qs, q: str):
+    """`qs` narrowed to FTS matches for `q` (no ranking); empty for a query with no words."""
+    match = build_match(q)
+    if not match:
+        return qs.none()
+    return qs.filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+
+
+def type_facets(qs, limit: int = FACET_LIMIT) -> List[dict]:
+    """[{"opportunity_type": ..., "n": ...}] for the rows of `qs`, most common first."""
+    return list(
+        qs.exclude(opportunity_type="")
+        .order_by()
+        .values("opportunity_type")
+        .annotate(n=Count("id"))
+        .order_by("-n", "opportunity_type")[:limit]
+    )
+
+
+def search_opportunities(qs, q: str, after: str = "", before: str = "", per_page: int = 20) -> KeysetPage:
+    """
+    Deadline-boosted BM25 search restricted to the opportunities in `qs`.
+    Pages by keyset on (score, id); each returned opportunity carries
+    `search_rank` and a highlighted `search_snippet`.
+    """
+    match = build_match(q)
+    if not match:
+        return KeysetPage(object_list=[])
+
+    ids_sql, ids_params = qs.order_by().values("id").query.sql_with_params()
+
+    cursor_values = None
+    forward = True
+    for token, is_forward in ((before, False), (after, True)):
+        values = decode_values(token, 2)
+        if values and isinstance(values[0], (int, float)) and isinstance(values[1], int):
+            cursor_values, forward = values, is_forward
+            break
+
+    seek = ""
+    seek_params = []
+    if cursor_values is not None:
+        op = ">" if forward else "<"
+        seek = f"WHERE (score {op} %s OR (score = %s AND id {op} %s))"
+        seek_params = [cursor_values[0], cursor_values[0], cursor_values[1]]
+    direction = "ASC" if forward else "DESC"
+
+    # bm25() is negative (lower = better), so the boost multiplies it
+    sql = f"""
+        SELECT id, score FROM (
+            SELECT f.rowid AS id,
+                   {BM25} * (CASE WHEN o.deadline IS NULL OR o.deadline < %s THEN 1.0
+                             ELSE 1.0 + 1.0 / (1.0 + (julianday(o.deadline) - julianday(%s)) / %s)
+                             END) AS score
+            FROM {FTS_TABLE} f JOIN opportunities_opportunity o ON o.id = f.rowid
+            WHERE {FTS_TABLE} MATCH %s AND f.rowid IN ({ids_sql})
+        )
+        {seek}
+        ORDER BY score {direction}, id {direction}
+        LIMIT %s
+    """
+    today = timezone.localdate().isoformat()
+    with connections["default"].cursor() as cur:
+        cur.execute(sql, [today, today, DEADLINE_BOOST_DAYS, match, *ids_params, *seek_params, per_page + 1])
+        hits = cur.fetchall()
+
+    more = len(hits) > per_page
+    hits = hits[:per_page]
+    if not forward:
+        hits.reverse()
+    if not hits:
+        if not forward:
+            return search_opportunities(qs, q, per_page=per_page)
+        return KeysetPage(object_list=[])
+
+    ids = [h[0] for h in hits]
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connections["default"].cursor() as cur:
+        cur.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, 1, %s, %s, %s, 24) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})",
+            [HL_OPEN, HL_CLOSE, "…", match, *ids],
+        )
+        snippets = dict(cur.fetchall())
+
+    by_id = qs.filter(id__in=ids).in_bulk()
+    opps = []
+    for oid, score in hits:
+        opp = by_id.get(oid)
+        if opp is None:
+            continue
+        opp.search_rank = score
+        opp.search_snippet = highlight(snippets.get(oid, ""))
+        opps.append(opp)
+
+    first = encode_cursor([hits[0][1], hits[0][0]])
+    last = encode_cursor([hits[-1][1], hits[-1][0]])
+    if forward:
+        next_cursor = last if more else None
+        prev_cursor = first if cursor_values is not None else None
+    else:
+        next_cursor = last
+        prev_cursor = first if more else None
+    return KeysetPage(object_list=opps, next_cursor=next_cursor, prev_cursor=prev_cursor)
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Opportunity
+from .search import index_opportunity, unindex_opportunity
+
+_SEARCHABLE = {"title", "description", "opportunity_type", "location"}
+
+
+@receiver(post_save, sender=Opportunity)
+def on_opportunity_save(sender, instance: Opportunity, update_fields=None, **kwargs):
+    # moderation saves only touch status/reviewer; nothing searchable changed
+    if update_fields is not None and not _SEARCHABLE & set(update_fields):
+        return
+    index_opportunity(instance)
+
+
+@receiver(post_delete, sender=Opportunity)
+def on_opportunity_delete(sender, instance: Opportunity, **kwargs):
+    unindex_opportunity(instance.pk)
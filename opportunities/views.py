@@ -1,19 +1,38 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 
 from accounts.decorators import moderator_required
+from accounts.utils import is_moderator
+from core.exports import stream_csv, values_rows
+from core.pagination import paginate_keyset
 from .forms import OpportunitySubmitForm
 from .models import Opportunity
-        
+from .search import fts_enabled, matching, search_opportunities, type_facets
+
 from django.db.models import Q
 
-def opportunity_list_view(request):
+BOARD_PAGE_SIZE = 20
+
+
+def _listed_opportunities(request, archive: bool = False, with_type: bool = True):
+    """
+    Approved opportunities filtered/sorted by the board's ?q=, ?type=, ?sort=
+    and ?expired=1. The board shows what is still open (no deadline, or not
+    passed yet) unless ?expired=1; the archive shows the rest, most recently
+    closed first. with_type=False leaves out the type filter (for its facets).
+    Returns (qs, ordering, q, typ, sort); `ordering` ends in id for keyset paging.
+    """
+    today = timezone.localdate()
     qs = Opportunity.objects.filter(status=Opportunity.Status.APPROVED)
 
     q = (request.GET.get("q") or "").strip()
-    if q:
+    if q and fts_enabled():
+        qs = matching(qs, q)
+    elif q:
         qs = qs.filter(
             Q(title__icontains=q) |
             Q(description__icontains=q) |
@@ -22,19 +41,68 @@ def opportunity_list_view(request):
         )
 
     typ = (request.GET.get("type") or "").strip()
-    if typ:
+    if typ and with_type:
         qs = qs.filter(opportunity_type__icontains=typ)
 
-    sort = request.GET.get("sort", "new")
-    if sort == "deadline":
-        qs = qs.order_by("deadline", "-created_at")
+    include_expired = not archive and request.GET.get("expired") == "1"
+    sort = request.GET.get("sort") or ("relevance" if q else "new")
+    if sort == "relevance" and not q:
+        sort = "new"
+    if archive:
+        qs = qs.filter(deadline__lt=today)
+        ordering = ("-deadline", "-created_at", "-id")
+        sort = "relevance" if q else "closed"
+    elif sort == "deadline":
+        # closing soon: only what has a deadline; open-ended ones are under "new"
+        qs = qs.filter(deadline__isnull=False) if include_expired else qs.filter(deadline__gte=today)
+        ordering = ("deadline", "created_at", "id")
     else:
-        qs = qs.order_by("-created_at")
-
-    context = {"opps": qs, "q": q, "typ": typ, "sort": sort}
+        if sort != "relevance":
+            sort = "new"
+        if not include_expired:
+            qs = qs.filter(Q(deadline__isnull=True) | Q(deadline__gte=today))
+        ordering = ("-created_at", "-id")
+    return qs.order_by(*ordering), ordering, q, typ, sort
+
+
+def _board(request, archive: bool):
+    qs, ordering, q, typ, sort = _listed_opportunities(request, archive=archive)
+    after = request.GET.get("after", "")
+    before = request.GET.get("before", "")
+    if sort == "relevance" and fts_enabled():
+        # BM25 boosted by deadline proximity, see opportunities/search.py
+        page = search_opportunities(qs, q, after=after, before=before, per_page=BOARD_PAGE_SIZE)
+    else:
+        page = paginate_keyset(qs, ordering, after=after, before=before, per_page=BOARD_PAGE_SIZE)
+
+    facet_qs, _, _, _, _ = _listed_opportunities(request, archive=archive, with_type=False)
+    context = {
+        "page": page,
+        "archive": archive,
+        "q": q,
+        "typ": typ,
+        "sort": sort,
+        "include_expired": request.GET.get("expired") == "1",
+        "type_facets": type_facets(facet_qs),
+    }
     return render(request, "community/opportunities/list.html", context)
 
 
+def opportunity_list_view(request):
+    return _board(request, archive=False)
+
+
+def opportunity_archive_view(request):
+    return _board(request, archive=True)
+
+
+def opportunity_export_view(request):
+    """The board (or with ?archive=1 the archive), with the same filters, as CSV."""
+    qs, _, _, _, _ = _listed_opportunities(request, archive=request.GET.get("archive") == "1")
+    fields = ("id", "title", "opportunity_type", "location", "deadline", "source_link", "created_at", "description")
+    header = ("Id", "Title", "Type", "Location", "Deadline", "Link", "Posted at", "Description")
+    return stream_csv(f"opportunities-{timezone.localdate():%Y%m%d}.csv", header, values_rows(qs, fields))
+
 
 def opportunity_detail_view(request, opp_id: int):
     opp = get_object_or_404(Opportunity, id=opp_id)
@@ -43,8 +111,7 @@ def opportunity_detail_view(request, opp_id: int):
         if not request.user.is_authenticated:
             return redirect("/login/")
         is_owner = opp.created_by_id == request.user.id
-        is_mod = request.user.is_staff or request.user.is_superuser or request.user.groups.filter(name="Moderator").exists()
-        if not (is_owner or is_mod):
+        if not (is_owner or is_moderator(request.user)):
             return redirect("opportunities:list")
 
     return render(request, "community/opportunities/detail.html", {"opp": opp})
@@ -95,3 +162,28 @@ def moderation_action_view(request, opp_id: int, action: str):
     opp.save(update_fields=["status", "reviewed_by", "reviewed_at"])
 
     return redirect("opportunities:mod_queue")
+
+
+@moderator_required
+@require_POST
+def moderation_bulk_action_view(request):
+    action = request.POST.get("action", "")
+    opp_ids = [int(v) for v in request.POST.getlist("opp_ids") if v.isdigit()][:500]
+    if action not in ("approve", "reject") or not opp_ids:
+        messages.error(request, "Select at least one opportunity and a valid action.")
+        return redirect("opportunities:mod_queue")
+
+    status = Opportunity.Status.APPROVED if action == "approve" else Opportunity.Status.REJECTED
+    with transaction.atomic():
+        changed = (
+            Opportunity.objects.filter(id__in=opp_ids)
+            .exclude(status=status)
+            .update(status=status, reviewed_by=request.user, reviewed_at=timezone.now())
+        )
+
+    skipped = len(set(opp_ids)) - changed
+    msg = f"{changed} opportunit{'y' if changed == 1 else 'ies'} {action}d."
+    if skipped:
+        msg += f" {skipped} skipped (already {status.label.lower()} or missing)."
+    messages.success(request, msg)
+    return redirect("opportunities:mod_queue")
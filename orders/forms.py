@@ -9,8 +9,10 @@ class CheckoutForm(forms.Form):
     city = forms.CharField(max_length=80)
     state = forms.CharField(max_length=80)
     pincode = forms.CharField(max_length=10)
+    checkout_token = forms.CharField(max_length=64, widget=forms.HiddenInput)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        for f in self.fields.values():
-            f.widget.attrs.update({"class": "form-control"})
+        for name, f in self.fields.items():
+            if name != "checkout_token":
+                f.widget.attrs.update({"class": "form-control"})
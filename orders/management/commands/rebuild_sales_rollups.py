@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from orders.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the daily artisan/product sales rollups from paid OrderItem rows."
+
+    def handle(self, *args, **options):
+        artisan_rows, product_rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {artisan_rows} artisan-day and {product_rows} product-day row(s)."))
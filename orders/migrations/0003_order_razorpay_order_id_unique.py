@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+def blank_to_null(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    Order.objects.filter(razorpay_order_id="").update(razorpay_order_id=None)
+
+
+def null_to_blank(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    Order.objects.filter(razorpay_order_id__isnull=True).update(razorpay_order_id="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_checkout_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, max_length=80, null=True),
+        ),
+        migrations.RunPython(blank_to_null, null_to_blank),
+        migrations.AlterField(
+            model_name='order',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, max_length=80, null=True, unique=True),
+        ),
+    ]
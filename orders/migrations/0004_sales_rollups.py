@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:43
+
+import django.db.models.deletion
+from collections import Counter, defaultdict
+from decimal import Decimal
+from django.db import migrations, models
+from django.utils import timezone
+
+# frozen copy of orders.rollups.STATE_FIELDS as of this migration
+STATE_FIELDS = {
+    "PLACED": "placed",
+    "PROCESSING": "processing",
+    "SHIPPED": "shipped",
+    "DELIVERED": "delivered",
+    "CANCELLED": "cancelled",
+}
+
+
+def backfill_rollups(apps, schema_editor):
+    OrderItem = apps.get_model("orders", "OrderItem")
+    ArtisanDailySales = apps.get_model("orders", "ArtisanDailySales")
+    ProductDailySales = apps.get_model("orders", "ProductDailySales")
+
+    by_product = defaultdict(Counter)
+    by_artisan = defaultdict(Counter)
+    orders = defaultdict(set)
+    rows = OrderItem.objects.filter(order__status="PAID").values_list(
+        "order_id", "order__paid_at", "order__created_at", "product_id", "product__artisan_id",
+        "quantity", "line_total", "fulfillment_status",
+    )
+    for order_id, paid_at, created_at, product_id, artisan_id, quantity, line_total, status in rows.iterator(chunk_size=2000):
+        day = timezone.localdate(paid_at or created_at)
+        deltas = Counter(items=1, units=quantity, revenue=line_total)
+        deltas[STATE_FIELDS[status]] += 1
+        if status == "CANCELLED":
+            deltas["cancelled_revenue"] += line_total
+        by_product[(product_id, artisan_id, day)].update(deltas)
+        by_artisan[(artisan_id, day)].update(deltas)
+        orders[(artisan_id, day)].add(order_id)
+    for key, ids in orders.items():
+        by_artisan[key]["orders"] = len(ids)
+
+    ProductDailySales.objects.bulk_create(
+        [ProductDailySales(product_id=p, artisan_id=a, day=d, **totals) for (p, a, d), totals in by_product.items()],
+        batch_size=1000,
+    )
+    ArtisanDailySales.objects.bulk_create(
+        [ArtisanDailySales(artisan_id=a, day=d, **totals) for (a, d), totals in by_artisan.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artisans', '0003_image_renditions'),
+        ('catalog', '0006_co_purchase'),
+        ('orders', '0003_order_razorpay_order_id_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtisanDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('placed', models.PositiveIntegerField(default=0)),
+                ('processing', models.PositiveIntegerField(default=0)),
+                ('shipped', models.PositiveIntegerField(default=0)),
+                ('delivered', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('artisan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='artisans.artisanprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('artisan', 'day'), name='unique_artisan_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('placed', models.PositiveIntegerField(default=0)),
+                ('processing', models.PositiveIntegerField(default=0)),
+                ('shipped', models.PositiveIntegerField(default=0)),
+                ('delivered', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('artisan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='artisans.artisanprofile')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='catalog.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['artisan', 'day'], name='orders_product_sales_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'day'), name='unique_product_daily_sales')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_inbox_fields(apps, schema_editor):
+    OrderItem = apps.get_model("orders", "OrderItem")
+    Order = apps.get_model("orders", "Order")
+    Product = apps.get_model("catalog", "Product")
+
+    OrderItem.objects.update(
+        artisan_id=Subquery(Product.objects.filter(pk=OuterRef("product_id")).values("artisan_id")[:1])
+    )
+    paid = Order.objects.filter(pk=OuterRef("order_id"), status="PAID")
+    OrderItem.objects.filter(order__status="PAID").update(
+        paid_at=Subquery(paid.annotate(at=Coalesce("paid_at", "created_at")).values("at")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artisans', '0003_image_renditions'),
+        ('catalog', '0006_co_purchase'),
+        ('orders', '0004_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='artisan',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='order_items', to='artisans.artisanprofile'),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='paid_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_inbox_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['artisan', '-paid_at', '-id'], name='orders_item_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['artisan', 'fulfillment_status', '-paid_at', '-id'], name='orders_item_inbox_status_idx'),
+        ),
+    ]
@@ -34,12 +34,18 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     #payment
-    razorpay_order_id = models.CharField(max_length=80, blank=True)
+    razorpay_order_id = models.CharField(max_length=80, null=True, blank=True, unique=True)  # webhook lookup key
     razorpay_payment_id = models.CharField(max_length=80, blank=True)
     razorpay_signature = models.CharField(max_length=200, blank=True)
     paid_at = models.DateTimeField(null=True, blank=True)
 
+    # one-time token from the checkout form; a retried POST returns the order it already created
+    checkout_token = models.CharField(max_length=64, null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "checkout_token"], name="unique_checkout_token_per_user")
+        ]
 
     def __str__(self) -> str:
         return f"Order#{self.id} - {self.user.username} - {self.status}"
@@ -57,6 +63,11 @@ class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
 
+    # denormalized for the artisan inbox: product.artisan, and order.paid_at
+    # once the order is PAID (null before), see Meta.indexes
+    artisan = models.ForeignKey("artisans.ArtisanProfile", on_delete=models.PROTECT, null=True, related_name="order_items")
+    paid_at = models.DateTimeField(null=True, blank=True)
+
     title = models.CharField(max_length=160)  # snapshot
     price = models.DecimalField(max_digits=10, decimal_places=2)  # snapshot
     quantity = models.PositiveIntegerField(default=1)
@@ -73,3 +84,62 @@ class OrderItem(models.Model):
     delivered_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["artisan", "-paid_at", "-id"], name="orders_item_inbox_idx"),
+            models.Index(
+                fields=["artisan", "fulfillment_status", "-paid_at", "-id"], name="orders_item_inbox_status_idx"
+            ),
+        ]
+
+
+
+class SalesRollup(models.Model):
+    """
+    Per-day totals for items of PAID orders, bucketed by the day the order was
+    paid. Kept incrementally by orders.rollups; `manage.py rebuild_sales_rollups`
+    recounts them from OrderItem.
+    """
+    day = models.DateField()
+
+    items = models.PositiveIntegerField(default=0)  # order lines
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    cancelled_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    # order lines of that day currently in each fulfillment state
+    placed = models.PositiveIntegerField(default=0)
+    processing = models.PositiveIntegerField(default=0)
+    shipped = models.PositiveIntegerField(default=0)
+    delivered = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def net_revenue(self) -> Decimal:
+        return self.revenue - self.cancelled_revenue
+
+
+class ArtisanDailySales(SalesRollup):
+    artisan = models.ForeignKey("artisans.ArtisanProfile", on_delete=models.CASCADE, related_name="daily_sales")
+    orders = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["artisan", "day"], name="unique_artisan_daily_sales")]
+
+    def __str__(self) -> str:
+        return f"ArtisanDailySales({self.artisan_id}, {self.day})"
+
+
+class ProductDailySales(SalesRollup):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="daily_sales")
+    artisan = models.ForeignKey("artisans.ArtisanProfile", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["product", "day"], name="unique_product_daily_sales")]
+        indexes = [models.Index(fields=["artisan", "day"], name="orders_product_sales_idx")]
+
+    def __str__(self) -> str:
+        return f"ProductDailySales({self.product_id}, {self.day})"
@@ -0,0 +1,194 @@
+"""
+Daily sales rollups for artisan dashboards.
+
+ArtisanDailySales / ProductDailySales hold, per artisan (product) and day the
+order was paid, the number of order lines, units, revenue and how many of
+those lines sit in each fulfillment state. They change in two places, both in
+the same transaction as the change itself:
+
+  * mark_order_paid()   -> record_paid_orders(): the new order's lines are added
+  * set_item_status()   -> move_item_state(): one line moves between states
+  * set_items_status()  -> move_lines_state(): the inbox's bulk update
+
+so a dashboard reads one row per day instead of scanning OrderItem.
+Migration 0004 filled them from the orders paid before it;
+`manage.py rebuild_sales_rollups` recounts everything (reconciliation).
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ArtisanDailySales, Order, OrderItem, ProductDailySales
+
+STATE_FIELDS = {
+    OrderItem.FulfillmentStatus.PLACED: "placed",
+    OrderItem.FulfillmentStatus.PROCESSING: "processing",
+    OrderItem.FulfillmentStatus.SHIPPED: "shipped",
+    OrderItem.FulfillmentStatus.DELIVERED: "delivered",
+    OrderItem.FulfillmentStatus.CANCELLED: "cancelled",
+}
+TOTAL_FIELDS = ("items", "units", "revenue", "cancelled_revenue", *STATE_FIELDS.values())
+
+_ITEM_COLUMNS = (
+    "order_id", "order__paid_at", "order__created_at", "product_id", "product__artisan_id",
+    "quantity", "line_total", "fulfillment_status",
+)
+
+
+def paid_day(paid_at, created_at) -> date:
+    return timezone.localdate(paid_at or created_at)
+
+
+def _line_deltas(quantity: int, line_total: Decimal, status: str) -> Counter:
+    deltas = Counter(items=1, units=quantity, revenue=line_total)
+    deltas[STATE_FIELDS[status]] += 1
+    if status == OrderItem.FulfillmentStatus.CANCELLED:
+        deltas["cancelled_revenue"] += line_total
+    return deltas
+
+
+def _accumulate(rows: Iterable[tuple]) -> Tuple[Dict[tuple, Counter], Dict[tuple, Counter]]:
+    """OrderItem rows (_ITEM_COLUMNS) -> ({(product, artisan, day): totals}, {(artisan, day): totals})."""
+    by_product = defaultdict(Counter)
+    by_artisan = defaultdict(Counter)
+    orders = defaultdict(set)
+    for order_id, paid_at, created_at, product_id, artisan_id, quantity, line_total, status in rows:
+        day = paid_day(paid_at, created_at)
+        deltas = _line_deltas(quantity, line_total, status)
+        by_product[(product_id, artisan_id, day)].update(deltas)
+        by_artisan[(artisan_id, day)].update(deltas)
+        orders[(artisan_id, day)].add(order_id)
+    for key, ids in orders.items():
+        by_artisan[key]["orders"] = len(ids)
+    return by_product, by_artisan
+
+
+def _bump(model, key: dict, deltas: dict, **create_fields) -> None:
+    deltas = {f: d for f, d in deltas.items() if d}
+    if not deltas:
+        return
+    # decrements stop at 0: a drifted row must not fail the fulfillment update
+    # (PositiveIntegerField CHECK); the rebuild puts it right
+    changes = {
+        f: F(f) + d if d > 0 else Greatest(F(f) + d, 0, output_field=model._meta.get_field(f))
+        for f, d in deltas.items()
+    }
+    # a negative delta for a missing row means drift; leave it to the rebuild
+    if model.objects.filter(**key).update(**changes) or any(d < 0 for d in deltas.values()):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **create_fields, **deltas)
+    except IntegrityError:
+        # another writer created the row first
+        model.objects.filter(**key).update(**changes)
+
+
+# ---------- incremental ----------
+
+def record_paid_orders(order_ids) -> None:
+    """Adds the lines of orders that just became PAID (call inside that transaction)."""
+    rows = OrderItem.objects.filter(order_id__in=order_ids, order__status=Order.Status.PAID).values_list(*_ITEM_COLUMNS)
+    by_product, by_artisan = _accumulate(rows)
+    for (product_id, artisan_id, day), deltas in by_product.items():
+        _bump(ProductDailySales, {"product_id": product_id, "day": day}, deltas, artisan_id=artisan_id)
+    for (artisan_id, day), deltas in by_artisan.items():
+        _bump(ArtisanDailySales, {"artisan_id": artisan_id, "day": day}, deltas)
+
+
+def move_item_state(item: OrderItem, old_status: str, new_status: str) -> None:
+    """One line of a paid order changed fulfillment state (call inside that transaction)."""
+    move_lines_state(
+        [(item.product_id, item.product.artisan_id, item.order.paid_at or item.order.created_at, item.line_total, old_status)],
+        new_status,
+    )
+
+
+def move_lines_state(lines: Iterable[tuple], new_status: str) -> None:
+    """
+    Bulk version: `lines` are (product_id, artisan_id, paid_at, line_total,
+    old_status) of paid order lines that all moved to `new_status`. One
+    UPDATE per affected (product, day) and (artisan, day) row.
+    """
+    by_product = defaultdict(Counter)
+    by_artisan = defaultdict(Counter)
+    for product_id, artisan_id, paid_at, line_total, old_status in lines:
+        if old_status == new_status:
+            continue
+        deltas = Counter({STATE_FIELDS[new_status]: 1})
+        deltas[STATE_FIELDS[old_status]] -= 1
+        if new_status == OrderItem.FulfillmentStatus.CANCELLED:
+            deltas["cancelled_revenue"] += line_total
+        elif old_status == OrderItem.FulfillmentStatus.CANCELLED:
+            deltas["cancelled_revenue"] -= line_total
+        day = timezone.localdate(paid_at)
+        by_product[(product_id, artisan_id, day)].update(deltas)
+        by_artisan[(artisan_id, day)].update(deltas)
+
+    for (product_id, artisan_id, day), deltas in by_product.items():
+        _bump(ProductDailySales, {"product_id": product_id, "day": day}, deltas, artisan_id=artisan_id)
+    for (artisan_id, day), deltas in by_artisan.items():
+        _bump(ArtisanDailySales, {"artisan_id": artisan_id, "day": day}, deltas)
+
+
+# ---------- reconciliation ----------
+
+def rebuild_rollups() -> Tuple[int, int]:
+    """Full recount from paid orders. Returns (artisan rows, product rows)."""
+    rows = (
+        OrderItem.objects.filter(order__status=Order.Status.PAID)
+        .values_list(*_ITEM_COLUMNS)
+        .iterator(chunk_size=2000)
+    )
+    by_product, by_artisan = _accumulate(rows)
+    with transaction.atomic():
+        ProductDailySales.objects.all().delete()
+        ArtisanDailySales.objects.all().delete()
+        ProductDailySales.objects.bulk_create(
+            [
+                ProductDailySales(product_id=p, artisan_id=a, day=d, **totals)
+                for (p, a, d), totals in by_product.items()
+            ],
+            batch_size=1000,
+        )
+        ArtisanDailySales.objects.bulk_create(
+            [ArtisanDailySales(artisan_id=a, day=d, **totals) for (a, d), totals in by_artisan.items()],
+            batch_size=1000,
+        )
+    return len(by_artisan), len(by_product)
+
+
+# ---------- dashboard ----------
+
+def daily_series(artisan_id: int, start: date, end: date) -> List[dict]:
+    """One dict per day in [start, end], zero-filled; reads at most (end - start + 1) rows."""
+    rows = {
+        r["day"]: r
+        for r in ArtisanDailySales.objects.filter(artisan_id=artisan_id, day__range=(start, end)).values(
+            "day", "orders", *TOTAL_FIELDS
+        )
+    }
+    empty = {f: 0 for f in ("orders", *TOTAL_FIELDS)}
+    series = []
+    day = start
+    while day <= end:
+        row = rows.get(day) or dict(empty, day=day)
+        row["net_revenue"] = row["revenue"] - row["cancelled_revenue"]
+        series.append(row)
+        day += timedelta(days=1)
+    return series
+
+
+def top_products(artisan_id: int, start: date, end: date, limit: int = 10) -> List[dict]:
+    return list(
+        ProductDailySales.objects.filter(artisan_id=artisan_id, day__range=(start, end))
+        .values("product_id", "product__title")
+        .annotate(units=Sum("units"), revenue=Sum("revenue"), cancelled_revenue=Sum("cancelled_revenue"))
+        .order_by("-revenue", "product_id")[:limit]
+    )
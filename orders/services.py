@@ -0,0 +1,177 @@
+import logging
+from decimal import Decimal
+from functools import partial
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Order, OrderItem
+from .rollups import move_item_state, move_lines_state, record_paid_orders
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_FIELDS = ("full_name", "phone", "address_line1", "address_line2", "city", "state", "pincode")
+
+
+def flat_shipping_fee() -> Decimal:
+    return Decimal(str(getattr(settings, "FLAT_SHIPPING_FEE", 0)))
+
+
+def order_for_token(user, checkout_token: str) -> Optional[Order]:
+    if not checkout_token:
+        return None
+    return Order.objects.filter(user=user, checkout_token=checkout_token).first()
+
+
+def place_order(user, cart_items, address: dict, checkout_token: str) -> Tuple[Order, bool]:
+    """
+    Creates the order and all of its items in one transaction (one INSERT for
+    the order, one bulk INSERT for the items). `cart_items` is the
+    [(product, qty, line_total)] list from cart.summary().
+
+    Idempotent per (user, checkout_token): a repeated submit returns the order
+    the first one created. Returns (order, created).
+    """
+    existing = order_for_token(user, checkout_token)
+    if existing is not None:
+        return existing, False
+
+    subtotal = sum((line_total for _, _, line_total in cart_items), Decimal("0.00"))
+    shipping_fee = flat_shipping_fee()
+
+    try:
+        with transaction.atomic():
+            order = Order.objects.create(
+                user=user,
+                status=Order.Status.PENDING,
+                subtotal=subtotal,
+                shipping_fee=shipping_fee,
+                total=subtotal + shipping_fee,
+                checkout_token=checkout_token,
+                **{f: address.get(f, "") for f in ADDRESS_FIELDS},
+            )
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(
+                        order=order,
+                        product=product,
+                        artisan_id=product.artisan_id,
+                        title=product.title,
+                        price=product.price,
+                        quantity=qty,
+                        line_total=line_total,
+                    )
+                    for product, qty, line_total in cart_items
+                ]
+            )
+    except IntegrityError:
+        # a concurrent submit with the same token won the race
+        existing = order_for_token(user, checkout_token)
+        if existing is None:
+            raise
+        return existing, False
+
+    return order, True
+
+
+def mark_order_paid(payment_id: str, signature: str = "", **lookup) -> bool:
+    """
+    PENDING -> PAID as one conditional UPDATE, e.g.
+    mark_order_paid(pid, sig, id=order.id) or mark_order_paid(pid, razorpay_order_id=rp_id).
+
+    Returns True only for the call that actually made the transition, so the
+    checkout callback and a (possibly repeated) webhook can both call it safely.
+    Follow-up work for a newly paid order is queued on commit from here.
+    """
+    fields = {
+        "status": Order.Status.PAID,
+        "razorpay_payment_id": payment_id,
+        "paid_at": timezone.now(),
+    }
+    if signature:
+        fields["razorpay_signature"] = signature
+
+    with transaction.atomic():
+        updated = Order.objects.filter(status=Order.Status.PENDING, **lookup).update(**fields)
+        if updated:
+            paid_ids = list(Order.objects.filter(**lookup).values_list("pk", flat=True))
+            OrderItem.objects.filter(order_id__in=paid_ids).update(paid_at=fields["paid_at"])
+            record_paid_orders(paid_ids)
+            transaction.on_commit(partial(_on_orders_paid, paid_ids))
+    return bool(updated)
+
+
+def _on_orders_paid(order_ids) -> None:
+    from catalog.recommendations import record_paid_orders
+
+    try:
+        record_paid_orders(order_ids)
+    except Exception:  # the payment is committed; a rebuild repairs the index
+        logger.exception("Could not update co-purchases for orders %s", order_ids)
+
+
+def set_item_status(item: OrderItem, new_status: str) -> bool:
+    """
+    Moves one line of a paid order to `new_status` (stamping shipped_at /
+    delivered_at the first time) and shifts the sales rollups with it. The
+    UPDATE is conditional on the status the caller saw, so two concurrent
+    changes cannot both count. Returns True if the line changed.
+    """
+    old_status = item.fulfillment_status
+    if new_status == old_status:
+        return False
+
+    now = timezone.now()
+    if new_status == OrderItem.FulfillmentStatus.SHIPPED and item.shipped_at is None:
+        item.shipped_at = now
+    if new_status == OrderItem.FulfillmentStatus.DELIVERED and item.delivered_at is None:
+        item.delivered_at = now
+
+    with transaction.atomic():
+        changed = OrderItem.objects.filter(pk=item.pk, fulfillment_status=old_status).update(
+            fulfillment_status=new_status,
+            shipped_at=item.shipped_at,
+            delivered_at=item.delivered_at,
+            updated_at=now,
+        )
+        if changed:
+            move_item_state(item, old_status, new_status)
+    if changed:
+        item.fulfillment_status = new_status
+        item.updated_at = now
+    return bool(changed)
+
+
+def _stamps(new_status: str, now) -> dict:
+    if new_status == OrderItem.FulfillmentStatus.SHIPPED:
+        return {"shipped_at": Coalesce("shipped_at", now)}
+    if new_status == OrderItem.FulfillmentStatus.DELIVERED:
+        return {"delivered_at": Coalesce("delivered_at", now)}
+    return {}
+
+
+def set_items_status(artisan_id: int, item_ids, new_status: str) -> int:
+    """
+    Bulk version of set_item_status() for the artisan inbox: every paid line
+    of `artisan_id` among `item_ids` moves to `new_status` in one UPDATE.
+    The lines are locked and read first so the rollups move with them.
+    Returns how many lines changed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = (
+            OrderItem.objects.select_for_update()
+            .filter(pk__in=item_ids, artisan_id=artisan_id, paid_at__isnull=False)
+            .exclude(fulfillment_status=new_status)
+        )
+        lines = list(qs.values_list("pk", "product_id", "artisan_id", "paid_at", "line_total", "fulfillment_status"))
+        if not lines:
+            return 0
+        changed = OrderItem.objects.filter(pk__in=[line[0] for line in lines]).update(
+            fulfillment_status=new_status, updated_at=now, **_stamps(new_status, now)
+        )
+        move_lines_state([line[1:] for line in lines], new_status)
+    return changed
@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import checkout, success, my_orders, order_detail
-from .views import artisan_orders, artisan_order_detail, artisan_item_update_status
+from .views import artisan_orders, artisan_order_detail, artisan_item_update_status, artisan_sales
+from .views import artisan_items_bulk_status, artisan_orders_export, admin_ledger_export
 
 
 app_name = "orders"
@@ -13,5 +14,9 @@ urlpatterns = [
     path("artisan/", artisan_orders, name="artisan_orders"),
     path("artisan/<int:order_id>/", artisan_order_detail, name="artisan_order_detail"),
     path("artisan/item/<int:item_id>/status/", artisan_item_update_status, name="artisan_item_update_status"),
+    path("artisan/sales/", artisan_sales, name="artisan_sales"),
+    path("artisan/items/bulk-status/", artisan_items_bulk_status, name="artisan_items_bulk_status"),
+    path("artisan/export.csv", artisan_orders_export, name="artisan_orders_export"),
+    path("ledger/export.csv", admin_ledger_export, name="admin_ledger_export"),
 
 ]
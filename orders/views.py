@@ -1,15 +1,23 @@
-from decimal import Decimal
+import uuid
+from datetime import timedelta
 
-from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.decorators.http import require_http_methods
 
+from accounts.decorators import admin_required
 from accounts.models import User
-from cart.cart import clear, items, totals
+from cart.cart import clear, summary
+from core.exports import date_filters, stream_csv, values_rows
+from core.pagination import paginate_keyset
 from .forms import CheckoutForm
 from .models import Order, OrderItem
+from .rollups import daily_series, top_products
+from .services import flat_shipping_fee, order_for_token, place_order, set_item_status, set_items_status
 
 from django.views.decorators.http import require_POST
 from artisans.models import ArtisanProfile
@@ -28,46 +36,29 @@ def _require_customer(user):
 def checkout(request):
     _require_customer(request.user)
 
-    cart_items = items(request.session)
-    subtotal, total_qty = totals(request.session)
+    # a retried/double-submitted POST finds the order its first submit created
+    checkout_token = (request.POST.get("checkout_token") or "").strip()
+    if request.method == "POST":
+        existing = order_for_token(request.user, checkout_token)
+        if existing is not None:
+            return redirect("orders:success", order_id=existing.id)
+
+    cart_items, subtotal, total_qty = summary(request.session)
 
     if total_qty == 0:
         return redirect("cart:detail")
 
-    shipping_fee = Decimal(str(getattr(settings, "FLAT_SHIPPING_FEE", 0)))
+    shipping_fee = flat_shipping_fee()
     total = subtotal + shipping_fee
 
     if request.method == "POST":
         form = CheckoutForm(request.POST)
         if form.is_valid():
-            order = Order.objects.create(
-                user=request.user,
-                status=Order.Status.PENDING,
-                full_name=form.cleaned_data["full_name"],
-                phone=form.cleaned_data["phone"],
-                address_line1=form.cleaned_data["address_line1"],
-                address_line2=form.cleaned_data["address_line2"],
-                city=form.cleaned_data["city"],
-                state=form.cleaned_data["state"],
-                pincode=form.cleaned_data["pincode"],
-                subtotal=subtotal,
-                shipping_fee=shipping_fee,
-                total=total,
-            )
-
-            for product, qty, _ in cart_items:
-                OrderItem.objects.create(
-                    order=order,
-                    product=product,
-                    title=product.title,
-                    price=product.price,
-                    quantity=qty,
-                )
-
+            order, _ = place_order(request.user, cart_items, form.cleaned_data, form.cleaned_data["checkout_token"])
             clear(request.session)
             return redirect("orders:success", order_id=order.id)
     else:
-        form = CheckoutForm()
+        form = CheckoutForm(initial={"checkout_token": uuid.uuid4().hex})
 
     return render(
         request,
@@ -109,19 +100,96 @@ def _require_artisan(user):
         raise Http404("Not found")
 
 
+INBOX_PAGE_SIZE = 25
+INBOX_MAX_SELECTION = 500
+
+
+def _inbox_status(request) -> str:
+    status = request.GET.get("status", "")
+    return status if status in OrderItem.FulfillmentStatus.values else ""
+
+
+def _inbox_items(profile, status: str):
+    # one range scan on (artisan, [fulfillment_status,] -paid_at, -id), see OrderItem.Meta.indexes
+    qs = OrderItem.objects.filter(artisan=profile, paid_at__isnull=False)
+    if status:
+        qs = qs.filter(fulfillment_status=status)
+    return qs
+
+
+def _inbox_counts(profile) -> dict:
+    """{fulfillment status: paid lines}, one GROUP BY over the same (artisan, fulfillment_status, ...) index."""
+    rows = _inbox_items(profile, "").order_by().values("fulfillment_status").annotate(n=Count("id"))
+    counts = {value: 0 for value in OrderItem.FulfillmentStatus.values}
+    counts.update({r["fulfillment_status"]: r["n"] for r in rows})
+    return counts
+
+
 @login_required
 def artisan_orders(request):
     _require_artisan(request.user)
     profile = get_object_or_404(ArtisanProfile, user=request.user)
 
-    # show only PAID orders for now (you can include PENDING later if you want)
-    items_qs = (
-        OrderItem.objects
-        .select_related("order", "order__user", "product")
-        .filter(order__status=Order.Status.PAID, product__artisan=profile)
-        .order_by("-order__created_at")
+    status = _inbox_status(request)
+    qs = _inbox_items(profile, status).select_related("order", "order__user")
+    page = paginate_keyset(
+        qs,
+        ("-paid_at", "-id"),
+        after=request.GET.get("after", ""),
+        before=request.GET.get("before", ""),
+        per_page=INBOX_PAGE_SIZE,
+    )
+
+    counts = _inbox_counts(profile)
+    tabs = [("", "All", sum(counts.values()))] + [
+        (value, label, counts[value]) for value, label in OrderItem.FulfillmentStatus.choices
+    ]
+    return render(
+        request,
+        "mart/orders/artisan_orders.html",
+        {
+            "items": page.object_list,
+            "page": page,
+            "tabs": tabs,
+            "status": status,
+            "statuses": OrderItem.FulfillmentStatus.choices,
+        },
     )
-    return render(request, "mart/orders/artisan_orders.html", {"items": items_qs})
+
+
+ARTISAN_EXPORT_COLUMNS = (
+    ("order_id", "Order"),
+    ("paid_at", "Paid at"),
+    ("order__user__username", "Customer"),
+    ("order__full_name", "Ship to"),
+    ("order__phone", "Phone"),
+    ("order__address_line1", "Address line 1"),
+    ("order__address_line2", "Address line 2"),
+    ("order__city", "City"),
+    ("order__state", "State"),
+    ("order__pincode", "Pincode"),
+    ("product_id", "Product"),
+    ("title", "Item"),
+    ("quantity", "Qty"),
+    ("price", "Unit price"),
+    ("line_total", "Line total"),
+    ("fulfillment_status", "Status"),
+    ("shipped_at", "Shipped at"),
+    ("delivered_at", "Delivered at"),
+)
+
+
+@login_required
+def artisan_orders_export(request):
+    """The inbox (same ?status= tab) as CSV, newest first."""
+    _require_artisan(request.user)
+    profile = get_object_or_404(ArtisanProfile, user=request.user)
+
+    status = _inbox_status(request)
+    qs = _inbox_items(profile, status).order_by("-paid_at", "-id")
+    fields, header = zip(*ARTISAN_EXPORT_COLUMNS)
+    filename = f"orders-{status.lower() or 'all'}-{timezone.localdate():%Y%m%d}.csv"
+    return stream_csv(filename, header, values_rows(qs, fields))
 
 
 @login_required
@@ -129,20 +197,32 @@ def artisan_order_detail(request, order_id: int):
     _require_artisan(request.user)
     profile = get_object_or_404(ArtisanProfile, user=request.user)
 
-    # ensure this artisan has at least one item in this order
-    if not OrderItem.objects.filter(order_id=order_id, product__artisan=profile).exists():
+    order = get_object_or_404(Order.objects.select_related("user"), id=order_id, status=Order.Status.PAID)
+    items = list(OrderItem.objects.filter(order=order, artisan=profile).order_by("id"))
+    # only artisans with a line in this order may see it
+    if not items:
         raise Http404("Not found")
 
-    order = get_object_or_404(Order.objects.select_related("user"), id=order_id, status=Order.Status.PAID)
+    return render(request, "mart/orders/artisan_order_detail.html", {"order": order, "items": items})
 
-    items_qs = (
-        OrderItem.objects
-        .select_related("product")
-        .filter(order=order, product__artisan=profile)
-        .order_by("id")
-    )
 
-    return render(request, "mart/orders/artisan_order_detail.html", {"order": order, "items": items_qs})
+@login_required
+@require_POST
+def artisan_items_bulk_status(request):
+    _require_artisan(request.user)
+    profile = get_object_or_404(ArtisanProfile, user=request.user)
+
+    new_status = (request.POST.get("status") or "").strip()
+    ids = [int(v) for v in request.POST.getlist("items") if v.isdigit()][:INBOX_MAX_SELECTION]
+    if new_status in OrderItem.FulfillmentStatus.values and ids:
+        changed = set_items_status(profile.id, ids, new_status)
+        messages.success(request, f"{changed} item(s) marked {OrderItem.FulfillmentStatus(new_status).label}.")
+
+    next_url = request.POST.get("next", "")
+    if url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect("orders:artisan_orders")
+
 
 @login_required
 @require_POST
@@ -153,8 +233,8 @@ def artisan_item_update_status(request, item_id: int):
     item = get_object_or_404(
         OrderItem.objects.select_related("order", "product"),
         id=item_id,
-        product__artisan=profile,
-        order__status=Order.Status.PAID,
+        artisan=profile,
+        paid_at__isnull=False,
     )
 
     new_status = (request.POST.get("status") or "").strip()
@@ -162,13 +242,77 @@ def artisan_item_update_status(request, item_id: int):
     if new_status not in allowed:
         return redirect("orders:artisan_order_detail", order_id=item.order_id)
 
-    item.fulfillment_status = new_status
+    set_item_status(item, new_status)
+    return redirect("orders:artisan_order_detail", order_id=item.order_id)
 
-    # timestamps (simple MVP behavior)
-    if new_status == OrderItem.FulfillmentStatus.SHIPPED and item.shipped_at is None:
-        item.shipped_at = timezone.now()
-    if new_status == OrderItem.FulfillmentStatus.DELIVERED and item.delivered_at is None:
-        item.delivered_at = timezone.now()
 
-    item.save(update_fields=["fulfillment_status", "shipped_at", "delivered_at", "updated_at"])
-    return redirect("orders:artisan_order_detail", order_id=item.order_id)
+SALES_RANGES = (7, 30, 90, 365)
+
+
+@login_required
+def artisan_sales(request):
+    _require_artisan(request.user)
+    profile = get_object_or_404(ArtisanProfile, user=request.user)
+
+    try:
+        days = int(request.GET.get("days", 30))
+    except ValueError:
+        days = 30
+    if days not in SALES_RANGES:
+        days = 30
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+
+    series = daily_series(profile.id, start, end)
+    totals = {f: sum(row[f] for row in series) for f in ("orders", "units", "revenue", "cancelled_revenue", "net_revenue")}
+    peak = max((row["net_revenue"] for row in series), default=0) or 1
+    for row in series:
+        row["bar"] = int(100 * row["net_revenue"] / peak)
+
+    return render(
+        request,
+        "mart/orders/artisan_sales.html",
+        {
+            "series": series,
+            "totals": totals,
+            "products": top_products(profile.id, start, end),
+            "days": days,
+            "ranges": SALES_RANGES,
+            "start": start,
+            "end": end,
+        },
+    )
+
+
+LEDGER_EXPORT_COLUMNS = (
+    ("id", "Order"),
+    ("created_at", "Created at"),
+    ("paid_at", "Paid at"),
+    ("status", "Status"),
+    ("user__username", "Customer"),
+    ("user__email", "Email"),
+    ("full_name", "Ship to"),
+    ("city", "City"),
+    ("state", "State"),
+    ("pincode", "Pincode"),
+    ("subtotal", "Subtotal"),
+    ("shipping_fee", "Shipping"),
+    ("total", "Total"),
+    ("razorpay_order_id", "Razorpay order"),
+    ("razorpay_payment_id", "Razorpay payment"),
+)
+
+
+@admin_required
+def admin_ledger_export(request):
+    """
+    Every order as CSV, oldest first. ?status= (Order.Status, as in the admin
+    list filter), ?from= / ?to= (YYYY-MM-DD, on created_at).
+    """
+    qs = Order.objects.filter(**date_filters(request.GET, "created_at"))
+    status = request.GET.get("status", "")
+    if status in Order.Status.values:
+        qs = qs.filter(status=status)
+    fields, header = zip(*LEDGER_EXPORT_COLUMNS)
+    filename = f"order-ledger-{status.lower() or 'all'}-{timezone.localdate():%Y%m%d}.csv"
+    return stream_csv(filename, header, values_rows(qs.order_by("id"), fields))
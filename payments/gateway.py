@@ -0,0 +1,87 @@
+"""
+Process-wide Razorpay client.
+
+One razorpay.Client per process, sharing a keep-alive requests.Session with a
+bounded connection pool, default (connect, read) timeouts and jittered retries.
+Only connect failures (request never reached the gateway) are retried for
+POSTs; read errors and 429/5xx responses are retried for idempotent methods.
+"""
+import threading
+
+import razorpay
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class GatewayConfigError(RuntimeError):
+    pass
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every call."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session() -> requests.Session:
+    retries = Retry(
+        total=settings.RAZORPAY_HTTP_RETRIES,
+        connect=settings.RAZORPAY_HTTP_RETRIES,
+        read=settings.RAZORPAY_HTTP_RETRIES,
+        status=settings.RAZORPAY_HTTP_RETRIES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        status_forcelist=(429, 500, 502, 503, 504),
+        backoff_factor=0.2,
+        backoff_jitter=0.3,
+        backoff_max=2.0,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final error response to razorpay's own error mapping
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.RAZORPAY_HTTP_POOL_SIZE,
+        max_retries=retries,
+    )
+    session = TimeoutSession(timeout=tuple(settings.RAZORPAY_HTTP_TIMEOUT))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)  # local stub gateway
+    return session
+
+
+_lock = threading.Lock()
+_client = None
+_client_key = None
+
+
+def get_client() -> razorpay.Client:
+    """
+    Shared client for the current settings; rebuilt only if keys or base URL change.
+    """
+    global _client, _client_key
+
+    if not settings.RAZORPAY_KEY_ID or not settings.RAZORPAY_KEY_SECRET:
+        raise GatewayConfigError("Razorpay keys missing. Set RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET.")
+
+    key = (settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET, settings.RAZORPAY_BASE_URL)
+    if _client is not None and _client_key == key:
+        return _client
+
+    with _lock:
+        if _client is None or _client_key != key:
+            if _client is not None:
+                _client.session.close()
+            _client = razorpay.Client(
+                session=build_session(),
+                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                base_url=settings.RAZORPAY_BASE_URL,
+            )
+            _client_key = key
+    return _client
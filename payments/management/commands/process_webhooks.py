@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.webhooks import process_pending
+
+
+class Command(BaseCommand):
+    help = "Drain the WebhookEvent inbox in batches (run once, or keep polling with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when the inbox is empty.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        totals = {}
+        while True:
+            counts = process_pending(batch_size=options["batch_size"], max_attempts=options["max_attempts"])
+            for k, v in counts.items():
+                totals[k] = totals.get(k, 0) + v
+            if counts["batch"]:
+                self.stdout.write(f"batch of {counts['batch']}: " + ", ".join(f"{k.lower()}={v}" for k, v in counts.items() if k != "batch" and v))
+            if counts["batch"] == options["batch_size"]:
+                continue  # probably more waiting
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {totals.get('batch', 0)} event(s) handled."))
@@ -0,0 +1,55 @@
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.gateway import get_client
+
+
+class Command(BaseCommand):
+    help = "Fire concurrent order create/fetch calls through the shared gateway client and report latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--op", choices=["create", "fetch"], default="create")
+        parser.add_argument("--live", action="store_true", help="Allow running against the real Razorpay API.")
+
+    def handle(self, *args, **options):
+        if "api.razorpay.com" in settings.RAZORPAY_BASE_URL and not options["live"]:
+            raise CommandError("Refusing to benchmark the live gateway; set RAZORPAY_BASE_URL to the stub or pass --live.")
+
+        client = get_client()
+        seed_id = None
+        if options["op"] == "fetch":
+            seed_id = client.order.create({"amount": 10000, "currency": "INR", "receipt": "bench_seed"})["id"]
+
+        def call(i):
+            started = time.perf_counter()
+            try:
+                if seed_id:
+                    client.order.fetch(seed_id)
+                else:
+                    client.order.create({"amount": 10000, "currency": "INR", "receipt": f"bench_{i}"})
+                error = None
+            except Exception as exc:  # report every failure kind, don't stop the run
+                error = type(exc).__name__
+            return time.perf_counter() - started, error
+
+        wall = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(call, range(options["requests"])))
+        wall = time.perf_counter() - wall
+
+        latencies = sorted(t * 1000 for t, err in results if err is None)
+        errors = Counter(err for _, err in results if err)
+
+        self.stdout.write(f"{options['requests']} {options['op']} calls, concurrency {options['concurrency']}, {wall:.2f}s wall")
+        self.stdout.write(f"throughput: {len(results) / wall:.1f} req/s")
+        if latencies:
+            q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(f"latency ms: p50={q[49]:.1f} p95={q[94]:.1f} p99={q[98]:.1f} max={latencies[-1]:.1f}")
+        self.stdout.write(f"ok: {len(latencies)}  errors: {dict(errors) or 0}")
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payments.stub_gateway import StubState, make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local Razorpay stub gateway with injectable latency and failures. "
+        "Point the app at it with RAZORPAY_BASE_URL=http://127.0.0.1:<port>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency-ms", type=int, default=0, help="Fixed delay added to every request.")
+        parser.add_argument("--jitter-ms", type=int, default=0, help="Extra uniform random delay (0..N ms).")
+        parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+        parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of connections dropped without a response.")
+        parser.add_argument("--verbose", action="store_true", help="Log every request.")
+
+    def handle(self, *args, **options):
+        state = StubState(
+            key_secret=settings.RAZORPAY_KEY_SECRET or "stub_secret",
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            fail_rate=options["fail_rate"],
+            drop_rate=options["drop_rate"],
+        )
+        server = make_server(options["host"], options["port"], state, verbose=options["verbose"])
+        self.stdout.write(self.style.SUCCESS(f"Razorpay stub listening on http://{options['host']}:{options['port']}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
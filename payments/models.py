@@ -1,3 +1,33 @@
 from django.db import models
 
-# Create your models here.
+
+class WebhookEvent(models.Model):
+    """
+    Raw gateway webhook, stored on receipt and acknowledged straight away.
+    `manage.py process_webhooks` drains PENDING rows in batches.
+    """
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PROCESSED = "PROCESSED", "Processed"
+        SKIPPED = "SKIPPED", "Skipped"  # nothing to do (unknown event / order already paid)
+        FAILED = "FAILED", "Failed"
+
+    # X-Razorpay-Event-Id; redeliveries of one event reuse it, so the unique index drops duplicates
+    event_id = models.CharField(max_length=80, unique=True)
+    event = models.CharField(max_length=80, blank=True)
+    payload = models.TextField()  # raw, signature-verified body
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # after a failed attempt: not retried before this (exponential backoff); null = due now
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "id"], name="payments_webhook_queue_idx")]
+
+    def __str__(self) -> str:
+        return f"WebhookEvent({self.event_id}) {self.event} {self.status}"
@@ -0,0 +1,168 @@
+"""
+Local stand-in for the Razorpay orders/payments API, for offline latency and
+failure benchmarks (see `manage.py razorpay_stub` / `manage.py razorpay_bench`).
+
+Implements just what the shop calls:
+  POST /v1/orders            create order
+  GET  /v1/orders/<id>       fetch order
+  GET  /v1/payments/<id>     fetch payment
+  POST /v1/orders/<id>/pay   stub-only: capture the order and return the
+                             checkout callback fields (ids + valid signature)
+"""
+import hashlib
+import hmac
+import json
+import random
+import secrets
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    def __init__(self, key_secret: str, latency_ms: int = 0, jitter_ms: int = 0, fail_rate: float = 0.0, drop_rate: float = 0.0):
+        self.key_secret = key_secret
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.orders = {}
+        self.payments = {}
+        self.lock = threading.Lock()
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{secrets.token_hex(7)}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "RazorpayStub/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real gateway
+
+    @property
+    def state(self) -> StubState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---------- helpers ----------
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, code: str, description: str) -> None:
+        self._send(status, {"error": {"code": code, "description": description}})
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return {}
+
+    def _simulate_network(self) -> bool:
+        """Sleeps for the configured latency; returns False if the request should be dropped or failed."""
+        st = self.state
+        delay = st.latency_ms + random.uniform(0, st.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000.0)
+        if st.drop_rate and random.random() < st.drop_rate:
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return False
+        if st.fail_rate and random.random() < st.fail_rate:
+            self._error(503, "SERVER_ERROR", "Stub gateway injected failure")
+            return False
+        return True
+
+    # ---------- routes ----------
+
+    def do_GET(self):
+        if not self._simulate_network():
+            return
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[:2] == ["v1", "orders"]:
+            order = self.state.orders.get(parts[2])
+            return self._send(200, order) if order else self._error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        if len(parts) == 3 and parts[:2] == ["v1", "payments"]:
+            payment = self.state.payments.get(parts[2])
+            return self._send(200, payment) if payment else self._error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        self._error(404, "BAD_REQUEST_ERROR", "The requested URL was not found on the server.")
+
+    def do_POST(self):
+        data = self._read_json()
+        if not self._simulate_network():
+            return
+        parts = self.path.strip("/").split("/")
+
+        if parts == ["v1", "orders"]:
+            amount = data.get("amount")
+            if not isinstance(amount, int) or amount < 100:
+                return self._error(400, "BAD_REQUEST_ERROR", "The amount must be atleast INR 1.00")
+            order = {
+                "id": _new_id("order"),
+                "entity": "order",
+                "amount": amount,
+                "amount_paid": 0,
+                "amount_due": amount,
+                "currency": data.get("currency", "INR"),
+                "receipt": data.get("receipt"),
+                "status": "created",
+                "attempts": 0,
+                "notes": data.get("notes", {}),
+                "created_at": int(time.time()),
+            }
+            with self.state.lock:
+                self.state.orders[order["id"]] = order
+            return self._send(200, order)
+
+        if len(parts) == 4 and parts[:2] == ["v1", "orders"] and parts[3] == "pay":
+            with self.state.lock:
+                order = self.state.orders.get(parts[2])
+                if not order:
+                    return self._error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+                payment = {
+                    "id": _new_id("pay"),
+                    "entity": "payment",
+                    "amount": order["amount"],
+                    "currency": order["currency"],
+                    "status": "captured",
+                    "order_id": order["id"],
+                    "captured": True,
+                    "created_at": int(time.time()),
+                }
+                self.state.payments[payment["id"]] = payment
+                order.update(status="paid", amount_paid=order["amount"], amount_due=0, attempts=order["attempts"] + 1)
+            signature = hmac.new(
+                self.state.key_secret.encode("utf-8"),
+                f"{order['id']}|{payment['id']}".encode("utf-8"),
+                hashlib.sha256,
+            ).hexdigest()
+            return self._send(
+                200,
+                {
+                    "razorpay_order_id": order["id"],
+                    "razorpay_payment_id": payment["id"],
+                    "razorpay_signature": signature,
+                },
+            )
+
+        self._error(404, "BAD_REQUEST_ERROR", "The requested URL was not found on the server.")
+
+
+def make_server(host: str, port: int, state: StubState, verbose: bool = False) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.state = state
+    server.verbose = verbose
+    return server
@@ -1,20 +1,20 @@
 import hmac
-import json
 import hashlib
 from decimal import Decimal
 
-import razorpay
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
 from accounts.models import User
 from orders.models import Order
+from orders.services import mark_order_paid
+from .gateway import get_client
+from .webhooks import record_event
 
 
 def _require_customer(user):
@@ -22,12 +22,6 @@ def _require_customer(user):
         raise Http404("Not found")
 
 
-def _client() -> razorpay.Client:
-    if not settings.RAZORPAY_KEY_ID or not settings.RAZORPAY_KEY_SECRET:
-        raise RuntimeError("Razorpay keys missing. Set RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET.")
-    return razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-
-
 @login_required
 def pay_order(request, order_id: int):
     _require_customer(request.user)
@@ -42,7 +36,7 @@ def pay_order(request, order_id: int):
 
     # Create Razorpay order if missing
     if not order.razorpay_order_id:
-        client = _client()
+        client = get_client()
         rp_order = client.order.create(
             {
                 "amount": amount_paise,
@@ -79,7 +73,7 @@ def verify_payment(request, order_id: int):
         messages.error(request, "Payment verification failed: missing fields.")
         return redirect("orders:order_detail", order_id=order.id)
 
-    client = _client()
+    client = get_client()
     params = {
         "razorpay_order_id": order.razorpay_order_id,  # use stored value (don’t trust client)
         "razorpay_payment_id": payment_id,
@@ -92,12 +86,8 @@ def verify_payment(request, order_id: int):
         messages.error(request, "Payment signature verification failed.")
         return redirect("orders:order_detail", order_id=order.id)
 
-    # Mark paid
-    order.status = Order.Status.PAID
-    order.razorpay_payment_id = payment_id
-    order.razorpay_signature = signature
-    order.paid_at = timezone.now()
-    order.save(update_fields=["status", "razorpay_payment_id", "razorpay_signature", "paid_at"])
+    # Mark paid (no-op if the webhook worker got there first)
+    mark_order_paid(payment_id, signature, id=order.id)
 
     messages.success(request, "Payment successful! Order marked as PAID.")
     return redirect("orders:order_detail", order_id=order.id)
@@ -107,8 +97,9 @@ def verify_payment(request, order_id: int):
 @require_POST
 def webhook(request):
     """
-    Optional: validates webhook signature using HMAC SHA256 with webhook secret. :contentReference[oaicite:2]{index=2}
-    Then marks order as PAID when payment is captured.
+    Validates the webhook signature (HMAC SHA256 with the webhook secret), stores
+    the raw event in the WebhookEvent inbox and acknowledges immediately.
+    `manage.py process_webhooks` applies it (e.g. marks the order PAID on payment.captured).
     """
     secret = getattr(settings, "RAZORPAY_WEBHOOK_SECRET", "")
     if not secret:
@@ -121,23 +112,9 @@ def webhook(request):
     if not hmac.compare_digest(received_sig, expected_sig):
         return HttpResponse("Invalid signature", status=400)
 
-    payload = json.loads(body.decode("utf-8"))
-    event = payload.get("event")
-
-    if event == "payment.captured":
-        entity = payload.get("payload", {}).get("payment", {}).get("entity", {})
-        rp_order_id = entity.get("order_id")
-        rp_payment_id = entity.get("id")
-
-        if rp_order_id and rp_payment_id:
-            try:
-                order = Order.objects.get(razorpay_order_id=rp_order_id)
-                if order.status == Order.Status.PENDING:
-                    order.status = Order.Status.PAID
-                    order.razorpay_payment_id = rp_payment_id
-                    order.paid_at = timezone.now()
-                    order.save(update_fields=["status", "razorpay_payment_id", "paid_at"])
-            except Order.DoesNotExist:
-                pass
-
-    return JsonResponse({"ok": True})
+    try:
+        created = record_event(request.headers.get("X-Razorpay-Event-Id", ""), body)
+    except ValueError:
+        return HttpResponse("Invalid payload", status=400)
+
+    return JsonResponse({"ok": True, "duplicate": not created})
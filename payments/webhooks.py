@@ -0,0 +1,98 @@
+"""
+Webhook inbox: the view stores the verified body and returns 200 at once;
+process_pending() (run by `manage.py process_webhooks`) applies the events in
+batches, one write transaction per batch. An event that raises is retried
+after RETRY_BACKOFF, doubling per attempt, so a short outage (a locked
+database, a gateway hiccup) does not use up its attempts within seconds.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from typing import Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from orders.services import mark_order_paid
+from .models import WebhookEvent
+
+RETRY_BACKOFF = timedelta(minutes=1)  # wait after the first failure, doubled per attempt
+RETRY_BACKOFF_MAX = timedelta(hours=1)
+
+
+def record_event(event_id: str, body: bytes) -> bool:
+    """
+    Stores the delivery in the inbox. Returns False for a duplicate (same event
+    id already stored). Raises ValueError if the body is not JSON.
+    """
+    payload = json.loads(body.decode("utf-8"))
+    if not event_id:
+        # header missing: identical bodies are still the same delivery
+        event_id = "sha256:" + hashlib.sha256(body).hexdigest()[:64]
+    try:
+        with transaction.atomic():
+            WebhookEvent.objects.create(
+                event_id=event_id[:80],
+                event=str(payload.get("event", ""))[:80],
+                payload=body.decode("utf-8"),
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def _payment_entity(payload: dict) -> Tuple[str, str]:
+    entity = payload.get("payload", {}).get("payment", {}).get("entity", {})
+    return entity.get("order_id") or "", entity.get("id") or ""
+
+
+def _apply(event: WebhookEvent) -> str:
+    """Returns the status the event should end in."""
+    payload = json.loads(event.payload)
+    if event.event in ("payment.captured", "order.paid"):
+        rp_order_id, rp_payment_id = _payment_entity(payload)
+        if rp_order_id and rp_payment_id and mark_order_paid(rp_payment_id, razorpay_order_id=rp_order_id):
+            return WebhookEvent.Status.PROCESSED
+    return WebhookEvent.Status.SKIPPED
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after the `attempts`-th failed attempt: 1, 2, 4, ... minutes, at most an hour."""
+    return min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+
+
+def process_pending(batch_size: int = 100, max_attempts: int = 5) -> dict:
+    """
+    Drains one batch of due PENDING events (oldest first). Each event runs in
+    a savepoint so one bad payload only fails itself. Returns counts by status.
+    """
+    counts = {s: 0 for s in WebhookEvent.Status.values}
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(
+            WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING, attempts__lt=max_attempts)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by("id")[:batch_size]
+        )
+        for event in batch:
+            event.attempts += 1
+            try:
+                with transaction.atomic():
+                    event.status = _apply(event)
+                event.last_error = ""
+                event.processed_at = now
+                event.next_attempt_at = None
+            except Exception as exc:  # keep draining; the row records what went wrong
+                event.last_error = f"{type(exc).__name__}: {exc}"
+                event.status = (
+                    WebhookEvent.Status.FAILED if event.attempts >= max_attempts else WebhookEvent.Status.PENDING
+                )
+                event.next_attempt_at = (
+                    now + retry_delay(event.attempts) if event.status == WebhookEvent.Status.PENDING else None
+                )
+            counts[event.status] += 1
+
+        WebhookEvent.objects.bulk_update(batch, ["status", "attempts", "last_error", "processed_at", "next_attempt_at"])
+    counts["batch"] = len(batch)
+    return counts
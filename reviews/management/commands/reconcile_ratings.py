@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services import reconcile_ratings
+
+
+class Command(BaseCommand):
+    help = "Verify running rating totals on products and artisans against Review and repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drifted rows.")
+
+    def handle(self, *args, **options):
+        products, artisans = reconcile_ratings(dry_run=options["dry_run"])
+        verb = "would be repaired" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{products} product(s) and {artisans} artisan(s) {verb}."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:22
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_rating_sums(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    Product = apps.get_model("catalog", "Product")
+    ArtisanProfile = apps.get_model("artisans", "ArtisanProfile")
+
+    for row in Review.objects.values("product_id").annotate(s=Sum("rating"), c=Count("id")):
+        Product.objects.filter(pk=row["product_id"]).update(
+            rating_sum=row["s"], rating_count=row["c"], rating_avg=row["s"] / row["c"]
+        )
+    for row in Review.objects.values("product__artisan_id").annotate(s=Sum("rating"), c=Count("id")):
+        ArtisanProfile.objects.filter(pk=row["product__artisan_id"]).update(
+            rating_sum=row["s"], rating_count=row["c"], rating_avg=row["s"] / row["c"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        ('catalog', '0003_rating_sum'),
+        ('artisans', '0002_rating_sum'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rating_sums, migrations.RunPython.noop),
+    ]
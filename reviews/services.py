@@ -1,19 +1,87 @@
-from django.db.models import Avg, Count
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
 
 from artisans.models import ArtisanProfile
+from catalog.facets import facet_cell, move_product, rebuild_facets
+from catalog.models import Product
 from .models import Review
 
 
-def recompute_product_and_artisan(product):
-    # Product aggregates
-    p_agg = Review.objects.filter(product=product).aggregate(avg=Avg("rating"), count=Count("id"))
-    product.rating_avg = float(p_agg["avg"] or 0.0)
-    product.rating_count = int(p_agg["count"] or 0)
-    product.save(update_fields=["rating_avg", "rating_count"])
+_FACET_FIELDS = ("category_id", "price", "is_active", "rating_avg", "rating_count")
 
-    # Artisan aggregates (based on all reviews across all artisan products)
-    artisan: ArtisanProfile = product.artisan
-    a_agg = Review.objects.filter(product__artisan=artisan).aggregate(avg=Avg("rating"), count=Count("id"))
-    artisan.rating_avg = float(a_agg["avg"] or 0.0)
-    artisan.rating_count = int(a_agg["count"] or 0)
-    artisan.save(update_fields=["rating_avg", "rating_count"])
+
+def _rating_update(d_sum: int, d_count: int) -> dict:
+    """
+    SET rating_sum = rating_sum + d_sum, rating_count = rating_count + d_count,
+        rating_avg = (new sum) / (new count)
+    as one UPDATE; every F() on the right-hand side reads the pre-update row.
+    """
+    new_sum = F("rating_sum") + d_sum
+    new_count = F("rating_count") + d_count
+    return {
+        "rating_sum": new_sum,
+        "rating_count": new_count,
+        "rating_avg": Case(
+            When(rating_count__gt=-d_count, then=Cast(new_sum, FloatField()) / Cast(new_count, FloatField())),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def apply_rating_delta(product_id: int, d_sum: int, d_count: int) -> None:
+    """
+    O(1) replacement for re-aggregating reviews: shifts the running totals of
+    the product and its artisan by the change one review write made.
+    """
+    if not d_sum and not d_count:
+        return
+
+    with transaction.atomic():
+        row = Product.objects.filter(pk=product_id).values_list("artisan_id", *_FACET_FIELDS).first()
+        if row is None:
+            return
+        artisan_id, old = row[0], facet_cell(*row[1:])
+
+        Product.objects.filter(pk=product_id).update(**_rating_update(d_sum, d_count))
+        ArtisanProfile.objects.filter(pk=artisan_id).update(**_rating_update(d_sum, d_count))
+
+        # updates bypass Product signals, so keep the rating-band facet in step here
+        new = Product.objects.filter(pk=product_id).values_list(*_FACET_FIELDS).first()
+        move_product(old, facet_cell(*new))
+
+
+def reconcile_ratings(dry_run: bool = False) -> tuple:
+    """
+    Full recount from Review (periodic verification job). Rewrites products and
+    artisans whose running totals drifted; returns (products, artisans) repaired.
+    """
+    def avg(total, count):
+        return float(total) / count if count else 0.0
+
+    product_truth = {
+        r["product_id"]: (r["s"], r["c"])
+        for r in Review.objects.values("product_id").annotate(s=Sum("rating"), c=Count("id"))
+    }
+    artisan_truth = {
+        r["product__artisan_id"]: (r["s"], r["c"])
+        for r in Review.objects.values("product__artisan_id").annotate(s=Sum("rating"), c=Count("id"))
+    }
+
+    def repair(model, truth):
+        fixed = []
+        for pk, s, c, a in model.objects.values_list("pk", "rating_sum", "rating_count", "rating_avg").iterator():
+            ts, tc = truth.get(pk, (0, 0))
+            if (s, c) != (ts, tc) or abs(a - avg(ts, tc)) > 1e-9:
+                fixed.append(model(pk=pk, rating_sum=ts, rating_count=tc, rating_avg=avg(ts, tc)))
+        if fixed and not dry_run:
+            model.objects.bulk_update(fixed, ["rating_sum", "rating_count", "rating_avg"], batch_size=500)
+        return len(fixed)
+
+    with transaction.atomic():
+        products = repair(Product, product_truth)
+        artisans = repair(ArtisanProfile, artisan_truth)
+        if products and not dry_run:
+            rebuild_facets()
+    return products, artisans
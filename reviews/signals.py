@@ -1,15 +1,31 @@
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import Review
-from .services import recompute_product_and_artisan
+from .services import apply_rating_delta
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_rating(sender, instance: Review, **kwargs):
+    instance._old_rating = None
+    if instance.pk:
+        instance._old_rating = (
+            Review.objects.filter(pk=instance.pk).values_list("product_id", "rating").first()
+        )
 
 
 @receiver(post_save, sender=Review)
-def on_review_save(sender, instance: Review, **kwargs):
-    recompute_product_and_artisan(instance.product)
+def on_review_save(sender, instance: Review, created: bool, **kwargs):
+    old = getattr(instance, "_old_rating", None)
+    if created or old is None:
+        apply_rating_delta(instance.product_id, instance.rating, 1)
+    elif old[0] != instance.product_id:
+        apply_rating_delta(old[0], -old[1], -1)
+        apply_rating_delta(instance.product_id, instance.rating, 1)
+    else:
+        apply_rating_delta(instance.product_id, instance.rating - old[1], 0)
 
 
 @receiver(post_delete, sender=Review)
 def on_review_delete(sender, instance: Review, **kwargs):
-    recompute_product_and_artisan(instance.product)
+    apply_rating_delta(instance.product_id, -instance.rating, -1)